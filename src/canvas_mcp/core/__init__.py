@@ -1,13 +1,30 @@
 """Core utilities for Canvas MCP server."""
 
-from .cache import get_course_code, get_course_id, refresh_course_cache
+from .cache import (
+    async_ttl_cache,
+    clear_ttl_caches,
+    evict_ttl_cache,
+    get_course_code,
+    get_course_id,
+    get_course_students,
+    get_discussion_entries,
+    get_discussion_topics,
+    get_quiz,
+    refresh_course_cache,
+    resolve_course,
+    search_course_assignments,
+)
 from .client import (
+    CanvasAPIError,
     cleanup_http_client,
     fetch_all_paginated_results,
+    iter_paginated_pages,
+    iter_paginated_results,
     make_canvas_request,
     poll_canvas_progress,
 )
 from .config import API_BASE_URL, API_TOKEN, get_config, validate_config
+from .csv_output import LineBuffer
 from .dates import (
     format_date,
     format_date_smart,
@@ -15,6 +32,7 @@ from .dates import (
     parse_date,
     truncate_text,
 )
+from .grading import build_bulk_grade_form_data
 from .response_formatter import (
     Verbosity,
     format_assignment_item,
@@ -34,6 +52,7 @@ from .response_formatter import (
 )
 from .types import AnnouncementInfo, AssignmentInfo, CourseInfo, PageInfo
 from .validation import (
+    canvas_errors,
     format_error,
     is_error_response,
     validate_parameter,
@@ -43,12 +62,27 @@ from .validation import (
 __all__ = [
     "make_canvas_request",
     "fetch_all_paginated_results",
+    "iter_paginated_results",
+    "iter_paginated_pages",
+    "CanvasAPIError",
     "cleanup_http_client",
     "poll_canvas_progress",
     "get_course_id",
+    "get_course_students",
+    "get_discussion_entries",
+    "get_discussion_topics",
+    "get_quiz",
     "get_course_code",
     "refresh_course_cache",
+    "resolve_course",
+    "search_course_assignments",
+    "async_ttl_cache",
+    "clear_ttl_caches",
+    "evict_ttl_cache",
+    "build_bulk_grade_form_data",
+    "LineBuffer",
     "validate_params",
+    "canvas_errors",
     "validate_parameter",
     "format_error",
     "is_error_response",
@@ -1,9 +1,110 @@
 """Course caching system for Canvas API."""
 
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
 from .client import fetch_all_paginated_results, make_canvas_request
 from .logging import log_debug, log_error, log_info
 from .validation import validate_params
 
+# Every response cache created by async_ttl_cache, keyed by the wrapped
+# function, so they can be reset together or one at a time
+_ttl_caches: dict[Callable[..., Any], OrderedDict[Hashable, tuple[float, Any]]] = {}
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert request arguments (dicts, lists) into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list | tuple | set):
+        return tuple(_freeze(v) for v in value)
+    frozen: Hashable = value
+    return frozen
+
+
+def async_ttl_cache[**P, R](
+    ttl: int | None = None, maxsize: int = 256
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Memoize an async function's results for ``ttl`` seconds.
+
+    Concurrent calls with the same arguments share one in-flight call
+    (single-flight). Error responses (dicts with an "error" key) and
+    exceptions are never cached.
+
+    Args:
+        ttl: Seconds to keep results (default: CACHE_TTL config; 0 disables)
+        maxsize: Maximum number of cached results (least recently used evicted)
+    """
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        in_flight: dict[Hashable, asyncio.Future[R]] = {}
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            from .config import get_config
+
+            lifetime = get_config().cache_ttl if ttl is None else ttl
+            key = (_freeze(args), _freeze(kwargs))
+            now = time.monotonic()
+
+            cached = entries.get(key)
+            if cached is not None and cached[0] > now:
+                entries.move_to_end(key)
+                result: R = cached[1]
+                return result
+
+            if key in in_flight:
+                return await asyncio.shield(in_flight[key])
+
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            in_flight[key] = future
+            try:
+                result = await asyncio.shield(future)
+            finally:
+                in_flight.pop(key, None)
+
+            if lifetime > 0 and not (isinstance(result, dict) and "error" in result):
+                entries[key] = (now + lifetime, result)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return result
+
+        _ttl_caches[wrapper] = entries
+        return wrapper
+
+    return decorator
+
+
+def clear_ttl_caches(*funcs: Callable[..., Any]) -> None:
+    """Drop results cached by async_ttl_cache.
+
+    Args:
+        funcs: Cached functions to reset (default: every cache)
+    """
+    for func in funcs or tuple(_ttl_caches):
+        _ttl_caches[func].clear()
+
+
+def evict_ttl_cache(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """Drop the result async_ttl_cache holds for one call of ``func``.
+
+    Pass the arguments the way callers do; ``f(1)`` and ``f(x=1)`` are
+    cached separately.
+
+    Args:
+        func: Cached function whose entry to drop
+        args: Positional arguments of the call
+        kwargs: Keyword arguments of the call
+    """
+    _ttl_caches[func].pop((_freeze(args), _freeze(kwargs)), None)
+
+
 # Global cache for course codes to IDs
 course_code_to_id_cache: dict[str, str] = {}
 id_to_course_code_cache: dict[str, str] = {}
@@ -114,3 +215,127 @@ async def get_course_code(course_id: str | None) -> str | None:
 
     # Last resort, return the ID
     return course_id
+
+
+@async_ttl_cache()
+async def resolve_course(course_identifier: str | int) -> tuple[str | None, str]:
+    """Resolve a course identifier to its ID and display code in one call.
+
+    Results are memoized, so repeat calls for the same course skip both
+    lookups. A non-numeric identifier is already a display code, so the
+    code lookup is skipped for it.
+
+    Args:
+        course_identifier: A course code, numeric ID or SIS ID
+
+    Returns:
+        Tuple of (course_id, course_display), where course_display is the
+        course code when known and otherwise the identifier as given
+    """
+    course_id = await get_course_id(course_identifier)
+    course_str = str(course_identifier)
+    if not course_str.isdigit():
+        return course_id, course_str
+    course_display = await get_course_code(course_id) or course_str
+    return course_id, course_display
+
+
+@async_ttl_cache(ttl=300)
+async def get_course_students(
+    course_id: str | None, enrollment_type: str = "student"
+) -> Any:
+    """Fetch a course roster, cached for five minutes.
+
+    Call ``clear_ttl_caches(get_course_students)`` after changing
+    enrollments so the next lookup refetches.
+
+    Args:
+        course_id: The Canvas course ID
+        enrollment_type: Enrollment type to filter users by (default: student)
+
+    Returns:
+        List of users, or an error dict
+    """
+    return await fetch_all_paginated_results(
+        f"/courses/{course_id}/users",
+        {"enrollment_type[]": enrollment_type, "per_page": 100},
+    )
+
+
+@async_ttl_cache(ttl=60, maxsize=128)
+async def search_course_assignments(course_id: str | None, search_term: str) -> Any:
+    """Fetch the assignments Canvas matches to a search term, cached for one minute.
+
+    Lets an agent repeat a name search during a session without another
+    round trip. Assignment and quiz tools call
+    ``clear_ttl_caches(search_course_assignments)`` after creating,
+    updating, publishing or deleting one so the next search refetches.
+
+    Args:
+        course_id: The Canvas course ID
+        search_term: Text Canvas matches against assignment names (at least
+            two characters)
+
+    Returns:
+        List of matching assignments, or an error dict
+    """
+    return await fetch_all_paginated_results(
+        f"/courses/{course_id}/assignments",
+        {"per_page": 100, "search_term": search_term},
+    )
+
+
+@async_ttl_cache(ttl=30, maxsize=64)
+async def get_discussion_topics(course_id: str | None) -> Any:
+    """Fetch a course's discussion topics, cached for thirty seconds.
+
+    Lets a burst of title searches on one course share one paginated fetch.
+    Discussion tools call ``clear_ttl_caches(get_discussion_topics)`` after
+    creating or deleting a topic so the next lookup refetches.
+
+    Args:
+        course_id: The Canvas course ID
+
+    Returns:
+        List of topics, or an error dict
+    """
+    return await fetch_all_paginated_results(
+        f"/courses/{course_id}/discussion_topics", {"per_page": 100}
+    )
+
+
+@async_ttl_cache(ttl=30, maxsize=64)
+async def get_quiz(course_id: str | None, quiz_id: str | int) -> Any:
+    """Fetch a quiz, cached for thirty seconds.
+
+    Quiz tools call ``clear_ttl_caches(get_quiz)`` after changing a quiz or
+    its questions so the next lookup refetches.
+
+    Args:
+        course_id: The Canvas course ID
+        quiz_id: The Canvas quiz ID
+
+    Returns:
+        The quiz, or an error dict
+    """
+    return await make_canvas_request("get", f"/courses/{course_id}/quizzes/{quiz_id}")
+
+
+@async_ttl_cache(ttl=60, maxsize=64)
+async def get_discussion_entries(course_id: str | None, topic_id: str | int) -> Any:
+    """Fetch a discussion topic's entries, cached for one minute.
+
+    Lets tools called back to back on the same topic (e.g. a participation
+    summary followed by grading) share one paginated fetch.
+
+    Args:
+        course_id: The Canvas course ID
+        topic_id: The Canvas discussion topic ID
+
+    Returns:
+        List of entries, or an error dict
+    """
+    return await fetch_all_paginated_results(
+        f"/courses/{course_id}/discussion_topics/{topic_id}/entries",
+        {"per_page": 100},
+    )
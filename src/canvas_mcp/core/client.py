@@ -1,7 +1,19 @@
 """HTTP client and Canvas API utilities."""
 
 import asyncio
+import copy
+import importlib.util
+import json
 import re
+import weakref
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Hashable,
+)
+from contextlib import aclosing
 from typing import Any
 from urllib.parse import urlencode
 
@@ -10,6 +22,31 @@ import httpx
 from .anonymization import anonymize_response_data
 from .logging import log_debug, log_error, log_info
 
+# Response bodies are decoded, and JSON request bodies encoded, with orjson
+# when the optional "speedups" extra is installed; json handles the same
+# bytes otherwise.
+_json_loads: Callable[[bytes], Any]
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        # Non-string keys (e.g. user IDs) become strings, as with json.dumps
+        encoded: bytes = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return encoded
+
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+# The shared client multiplexes requests over HTTP/2 when the optional h2
+# package (also in the "speedups" extra) is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 # Rate limit retry configuration
 MAX_RETRIES = 3
 INITIAL_BACKOFF_SECONDS = 2
@@ -18,6 +55,83 @@ INITIAL_BACKOFF_SECONDS = 2
 http_client: httpx.AsyncClient | None = None
 
 
+class _Pending:
+    """A GET on the wire and the number of callers waiting on it."""
+
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: asyncio.Future[Any]) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+# GET requests currently on the wire, so identical concurrent calls share one
+_in_flight: dict[Hashable, _Pending] = {}
+
+# Last ETag and body per conditional GET, revalidated with If-None-Match
+_etag_cache: dict[Hashable, tuple[str, Any]] = {}
+_ETAG_CACHE_MAXSIZE = 256
+
+# Caps requests on the wire at MAX_CONCURRENT_REQUESTS so bursts queue here
+# instead of tripping Canvas rate limits; one limiter per event loop
+_request_slots: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, asyncio.Semaphore
+] = weakref.WeakKeyDictionary()
+
+
+def _request_slot(limit: int) -> asyncio.Semaphore:
+    """Return the running loop's request limiter, creating it on first use."""
+    loop = asyncio.get_running_loop()
+    slots = _request_slots.get(loop)
+    if slots is None:
+        slots = _request_slots[loop] = asyncio.Semaphore(max(1, limit))
+    return slots
+
+
+async def _coalesced(key: Hashable, request: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``request`` unless an identical one is already in flight.
+
+    Callers with the same ``key`` share one request. When more than one
+    caller waited, each gets its own deep copy of the result, so mutating
+    it cannot leak into another caller's data.
+    """
+    pending = _in_flight.get(key)
+    if pending is None:
+        pending = _in_flight[key] = _Pending(asyncio.ensure_future(request()))
+
+        def _forget(done: asyncio.Future[Any]) -> None:
+            entry = _in_flight.get(key)
+            if entry is not None and entry.future is done:
+                del _in_flight[key]
+
+        pending.future.add_done_callback(_forget)
+    pending.waiters += 1
+    result = await asyncio.shield(pending.future)
+    return copy.deepcopy(result) if pending.waiters > 1 else result
+
+
+def _request_key(
+    method: str, endpoint: str, params: dict[str, Any] | None, *flags: Hashable
+) -> Hashable:
+    """Build an in-flight key from a request's method, endpoint and params."""
+    return (
+        method,
+        endpoint,
+        json.dumps(params, sort_keys=True, default=str),
+        *flags,
+    )
+
+
+def _json_body(data: Any) -> dict[str, Any]:
+    """Build httpx request arguments sending ``data`` as a JSON body."""
+    if data is None:
+        return {}
+    return {
+        "content": _json_dumps(data),
+        "headers": {"Content-Type": "application/json"},
+    }
+
+
 def _determine_data_type(endpoint: str) -> str:
     """Determine the type of data based on the API endpoint."""
     endpoint_lower = endpoint.lower()
@@ -89,6 +203,8 @@ def _get_http_client() -> httpx.AsyncClient:
                 "User-Agent": f"canvas-mcp/{__version__} (https://github.com/vishalsachdev/canvas-mcp)",
             },
             timeout=config.api_timeout,
+            http2=_HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
         )
     return http_client
 
@@ -108,10 +224,12 @@ async def make_canvas_request(
     data: dict[str, Any] | list[tuple[str, str]] | None = None,
     use_form_data: bool = False,
     skip_anonymization: bool = False,
+    conditional: bool = False,
 ) -> Any:
     """Make a request to the Canvas API with proper error handling.
 
     Automatically retries on rate limit errors (429) with exponential backoff.
+    Concurrent identical GET requests are coalesced into one.
 
     Args:
         method: HTTP method (get, post, put, delete)
@@ -120,7 +238,35 @@ async def make_canvas_request(
         data: Request body data
         use_form_data: Use form data instead of JSON
         skip_anonymization: Skip anonymization (used by paginated fetchers)
+        conditional: For GETs, revalidate the last response with its ETag so
+            an unchanged resource comes back as a bodiless 304
     """
+    if method.lower() == "get":
+        return await _coalesced(
+            _request_key("get", endpoint, params, skip_anonymization, conditional),
+            lambda: _make_canvas_request(
+                method,
+                endpoint,
+                params,
+                skip_anonymization=skip_anonymization,
+                conditional=conditional,
+            ),
+        )
+    return await _make_canvas_request(
+        method, endpoint, params, data, use_form_data, skip_anonymization
+    )
+
+
+async def _make_canvas_request(
+    method: str,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    data: dict[str, Any] | list[tuple[str, str]] | None = None,
+    use_form_data: bool = False,
+    skip_anonymization: bool = False,
+    conditional: bool = False,
+) -> Any:
+    """Send one Canvas API request; see make_canvas_request for arguments."""
 
     from .config import get_config
 
@@ -134,6 +280,12 @@ async def make_canvas_request(
     # Construct the full URL
     url = f"{config.api_base_url.rstrip('/')}{endpoint}"
 
+    etag_key = None
+    cached = None
+    if conditional and method.lower() == "get":
+        etag_key = _request_key("get", url, params, skip_anonymization)
+        cached = _etag_cache.get(etag_key)
+
     # Retry loop for rate limiting
     for attempt in range(MAX_RETRIES + 1):
         try:
@@ -142,48 +294,57 @@ async def make_canvas_request(
                 retry_info = f" (retry {attempt}/{MAX_RETRIES})" if attempt > 0 else ""
                 log_debug(f"Making {method.upper()} request to {url}{retry_info}")
 
-            if method.lower() == "get":
-                response = await client.get(url, params=params)
-            elif method.lower() == "post":
-                if use_form_data:
-                    # Handle list of tuples separately to work around httpx async bug
-                    # with duplicate keys (e.g., module[prerequisite_module_ids][])
-                    if isinstance(data, list):
-                        encoded = urlencode(data)
-                        response = await client.post(
-                            url,
-                            content=encoded,
-                            headers={
-                                "Content-Type": "application/x-www-form-urlencoded"
-                            },
+            # Rate-limit backoff below sleeps outside the slot
+            async with _request_slot(config.max_concurrent_requests):
+                if method.lower() == "get":
+                    if cached is not None:
+                        response = await client.get(
+                            url, params=params, headers={"If-None-Match": cached[0]}
                         )
+                        if response.status_code == 304:
+                            return cached[1]
                     else:
-                        response = await client.post(url, data=data)
-                else:
-                    response = await client.post(url, json=data)
-            elif method.lower() == "put":
-                if use_form_data:
-                    # Handle list of tuples separately to work around httpx async bug
-                    if isinstance(data, list):
-                        encoded = urlencode(data)
-                        response = await client.put(
-                            url,
-                            content=encoded,
-                            headers={
-                                "Content-Type": "application/x-www-form-urlencoded"
-                            },
-                        )
+                        response = await client.get(url, params=params)
+                elif method.lower() == "post":
+                    if use_form_data:
+                        # Handle list of tuples separately to work around httpx async bug
+                        # with duplicate keys (e.g., module[prerequisite_module_ids][])
+                        if isinstance(data, list):
+                            encoded = urlencode(data)
+                            response = await client.post(
+                                url,
+                                content=encoded,
+                                headers={
+                                    "Content-Type": "application/x-www-form-urlencoded"
+                                },
+                            )
+                        else:
+                            response = await client.post(url, data=data)
+                    else:
+                        response = await client.post(url, **_json_body(data))
+                elif method.lower() == "put":
+                    if use_form_data:
+                        # Handle list of tuples separately to work around httpx async bug
+                        if isinstance(data, list):
+                            encoded = urlencode(data)
+                            response = await client.put(
+                                url,
+                                content=encoded,
+                                headers={
+                                    "Content-Type": "application/x-www-form-urlencoded"
+                                },
+                            )
+                        else:
+                            response = await client.put(url, data=data)
                     else:
-                        response = await client.put(url, data=data)
+                        response = await client.put(url, **_json_body(data))
+                elif method.lower() == "delete":
+                    response = await client.delete(url, params=params)
                 else:
-                    response = await client.put(url, json=data)
-            elif method.lower() == "delete":
-                response = await client.delete(url, params=params)
-            else:
-                return {"error": f"Unsupported method: {method}"}
+                    return {"error": f"Unsupported method: {method}"}
 
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
 
             # Apply anonymization if enabled and this endpoint contains student data
             # Skip if explicitly requested (e.g., from paginated fetcher that will anonymize the full result)
@@ -199,6 +360,13 @@ async def make_canvas_request(
                 if config.anonymization_debug:
                     log_info(f"Applied {data_type} anonymization to {endpoint}")
 
+            etag = response.headers.get("ETag")
+            if etag_key is not None and etag:
+                _etag_cache.pop(etag_key, None)
+                if len(_etag_cache) >= _ETAG_CACHE_MAXSIZE:
+                    del _etag_cache[next(iter(_etag_cache))]
+                _etag_cache[etag_key] = (etag, result)
+
             return result
 
         except httpx.HTTPStatusError as e:
@@ -223,14 +391,14 @@ async def make_canvas_request(
             # Not a rate limit error or out of retries - format and return error
             error_message = f"HTTP error: {e.response.status_code}"
             try:
-                error_details = e.response.json()
+                error_details = _json_loads(e.response.content)
                 error_message += f", Details: {error_details}"
             except ValueError:
                 error_details = e.response.text
                 error_message += f", Text: {error_details}"
 
             log_error(f"API error: {error_message}")
-            return {"error": error_message}
+            return {"error": error_message, "status_code": e.response.status_code}
 
         except Exception as e:
             log_error(f"Request failed: {str(e)}")
@@ -264,20 +432,20 @@ async def upload_file_multipart(
 
     content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
 
-    # Build multipart fields from upload_params + the file itself
-    files = {"file": (path.name, path.read_bytes(), content_type)}
-
     try:
         async with httpx.AsyncClient(timeout=120.0, follow_redirects=False) as client:
-            response = await client.post(
-                upload_url,
-                data=upload_params,
-                files=files,
-            )
+            # Pass the open file so httpx streams it in chunks from disk
+            # instead of holding the whole upload in memory
+            with path.open("rb") as file:
+                response = await client.post(
+                    upload_url,
+                    data=upload_params,
+                    files={"file": (path.name, file, content_type)},
+                )
 
             # Canvas returns 200/201 with JSON on direct uploads
             if response.status_code in (200, 201):
-                return response.json()
+                return _json_loads(response.content)
 
             # S3 returns 301/302/303 redirect to Canvas confirmation URL
             if response.status_code in (301, 302, 303):
@@ -287,7 +455,7 @@ async def upload_file_multipart(
                     canvas_client = _get_http_client()
                     confirm = await canvas_client.get(redirect_url)
                     confirm.raise_for_status()
-                    return confirm.json()
+                    return _json_loads(confirm.content)
                 return {"error": "Redirect with no Location header"}
 
             return {
@@ -312,22 +480,93 @@ def _parse_link_header(header: str) -> dict[str, str]:
     return links
 
 
-async def fetch_all_paginated_results(
+# Numeric page parameter in a Canvas pagination URL (bookmark pages don't match)
+_PAGE_PARAM_RE = re.compile(r"([?&]page=)(\d+)(?=&|$)")
+
+
+def _numbered_page_urls(next_url: str, last_url: str | None) -> list[str]:
+    """List the URLs from ``next_url`` through ``last_url`` inclusive.
+
+    Only possible when both links use numeric ``page=`` values; returns an
+    empty list for bookmark pagination or when no last link is given.
+    """
+    if last_url is None:
+        return []
+    next_match = _PAGE_PARAM_RE.search(next_url)
+    last_match = _PAGE_PARAM_RE.search(last_url)
+    if next_match is None or last_match is None:
+        return []
+    return [
+        _PAGE_PARAM_RE.sub(rf"\g<1>{number}", next_url, count=1)
+        for number in range(int(next_match.group(2)), int(last_match.group(2)) + 1)
+    ]
+
+
+async def _get_page(
+    client: httpx.AsyncClient, url: str, params: dict[str, Any] | None, limit: int
+) -> httpx.Response | dict[str, Any]:
+    """Fetch one page, returning the response or an error dict.
+
+    Holds a request slot (see _request_slot) while the page downloads.
+    """
+    try:
+        async with _request_slot(limit):
+            response = await client.get(url, params=params)
+        response.raise_for_status()
+        return response
+    except httpx.HTTPStatusError as e:
+        error_detail: Any = str(e)
+        try:
+            error_detail = _json_loads(e.response.content)
+        except Exception:
+            pass
+        log_error(f"HTTP error fetching {url}: {error_detail}")
+        return {
+            "error": f"HTTP error: {e.response.status_code}, Details: {error_detail}"
+        }
+    except httpx.RequestError as e:
+        log_error(f"Request error fetching {url}: {e}")
+        return {"error": f"Request error: {e}"}
+
+
+class CanvasAPIError(Exception):
+    """A streamed Canvas request failed.
+
+    Raised by iter_paginated_results, which cannot return an error dict
+    mid-stream; ``response`` holds the dict the non-streaming helpers return.
+    """
+
+    def __init__(self, response: dict[str, Any]) -> None:
+        super().__init__(response.get("error"))
+        self.response = response
+
+
+async def iter_paginated_pages(
     endpoint: str,
     params: dict[str, Any] | None = None,
     *,
     skip_anonymization: bool = False,
-) -> Any:
-    """Fetch all results from a paginated Canvas API endpoint.
-
-    Follows Link header pagination (rel="next") instead of page numbers,
-    which is required by Canvas for many endpoints. Applies anonymization
-    once to the complete dataset.
+    result_key: str | None = None,
+) -> AsyncGenerator[list[Any], None]:
+    """Yield each page of a paginated Canvas API endpoint as it arrives.
+
+    Follows Link header pagination (rel="next") like
+    fetch_all_paginated_results, but only a few pages are held at a time. The
+    next page is requested as soon as its URL is known, so it downloads
+    while the caller consumes the current one. When Canvas also links the
+    last numbered page, up to MAX_CONCURRENT_REQUESTS upcoming pages download
+    at once; they are still yielded in order. Anonymization is applied page
+    by page.
 
     Args:
         endpoint: The Canvas API endpoint to fetch from
         params: Query parameters for the request
-        skip_anonymization: If True, skip anonymization entirely (for internal tools like anonymization map)
+        skip_anonymization: If True, skip anonymization entirely
+        result_key: For endpoints that wrap each page in an object (e.g.
+            {"quiz_submissions": [...]}), the key holding the page's list
+
+    Raises:
+        CanvasAPIError: If any page fails; pages already yielded stand
     """
     from .config import get_config
 
@@ -343,54 +582,149 @@ async def fetch_all_paginated_results(
     # Build the initial URL
     if not endpoint.startswith("/"):
         endpoint = f"/{endpoint}"
-    url: str | None = f"{config.api_base_url.rstrip('/')}{endpoint}"
+    url = f"{config.api_base_url.rstrip('/')}{endpoint}"
+
+    anonymize = (
+        not skip_anonymization
+        and config.enable_data_anonymization
+        and _should_anonymize_endpoint(endpoint)
+    )
+    data_type = _determine_data_type(endpoint) if anonymize else ""
+
+    window = max(1, config.max_concurrent_requests)
+    page_urls: deque[str] = deque()
+    next_pages: deque[asyncio.Task[httpx.Response | dict[str, Any]]] = deque()
+
+    page = await _get_page(client, url, params, config.max_concurrent_requests)
+
+    try:
+        while True:
+            if isinstance(page, dict):
+                raise CanvasAPIError(page)
+
+            # Follow the Link header once the known pages run out. With a
+            # numbered last page every remaining URL is known up front;
+            # otherwise only the next one is
+            if not page_urls and not next_pages:
+                link_header = page.headers.get("link", "")
+                links = _parse_link_header(link_header) if link_header else {}
+                next_url = links.get("next")
+                if next_url:
+                    page_urls.extend(
+                        _numbered_page_urls(next_url, links.get("last")) or [next_url]
+                    )
+
+            # Prefetch upcoming pages while we decode this one
+            while page_urls and len(next_pages) < window:
+                next_pages.append(
+                    asyncio.create_task(
+                        _get_page(
+                            client,
+                            page_urls.popleft(),
+                            None,
+                            config.max_concurrent_requests,
+                        )
+                    )
+                )
+
+            data = _json_loads(page.content)
+
+            if isinstance(data, dict) and "error" in data:
+                log_error(f"API error fetching {url}: {data['error']}")
+                raise CanvasAPIError(data)
+
+            if result_key is not None and isinstance(data, dict):
+                data = data.get(result_key)
+
+            if not data or not isinstance(data, list):
+                break
 
-    all_results: list[Any] = []
+            if anonymize:
+                data = anonymize_response_data(data, data_type)
+            yield data
 
-    while url:
+            if not next_pages:
+                break
+            page = await next_pages.popleft()
+    finally:
+        # The caller stopped early or a page failed: drop the prefetches
+        for next_page in next_pages:
+            next_page.cancel()
+
+    if anonymize and config.anonymization_debug:
+        log_info(
+            f"Applied {data_type} anonymization to paginated results from {endpoint}"
+        )
+
+
+async def iter_paginated_results(
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    *,
+    skip_anonymization: bool = False,
+    result_key: str | None = None,
+) -> AsyncGenerator[Any, None]:
+    """Yield individual results from a paginated endpoint as pages arrive.
+
+    Item-level view of iter_paginated_pages; see it for arguments.
+
+    Raises:
+        CanvasAPIError: If any page fails; items already yielded stand
+    """
+    async with aclosing(
+        iter_paginated_pages(
+            endpoint,
+            params,
+            skip_anonymization=skip_anonymization,
+            result_key=result_key,
+        )
+    ) as pages:
+        async for page in pages:
+            for item in page:
+                yield item
+
+
+async def fetch_all_paginated_results(
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    *,
+    skip_anonymization: bool = False,
+    result_key: str | None = None,
+) -> Any:
+    """Fetch all results from a paginated Canvas API endpoint.
+
+    Follows Link header pagination (rel="next") instead of page numbers,
+    which is required by Canvas for many endpoints. Collects
+    iter_paginated_results into a list; use that directly to aggregate
+    without holding every page in memory. Concurrent calls for the same
+    endpoint and params share one fetch.
+
+    Args:
+        endpoint: The Canvas API endpoint to fetch from
+        params: Query parameters for the request
+        skip_anonymization: If True, skip anonymization entirely (for internal tools like anonymization map)
+        result_key: Key holding each page's list when pages are wrapped in
+            an object (see iter_paginated_pages)
+    """
+
+    async def collect() -> Any:
         try:
-            response = await client.get(url, params=params if not all_results else None)
-            response.raise_for_status()
-        except httpx.HTTPStatusError as e:
-            error_detail = str(e)
-            try:
-                error_detail = e.response.json()
-            except Exception:
-                pass
-            log_error(f"HTTP error fetching {url}: {error_detail}")
-            return {"error": f"HTTP error: {e.response.status_code}, Details: {error_detail}"}
-        except httpx.RequestError as e:
-            log_error(f"Request error fetching {url}: {e}")
-            return {"error": f"Request error: {e}"}
-
-        data = response.json()
-
-        if isinstance(data, dict) and "error" in data:
-            log_error(f"API error fetching {url}: {data['error']}")
-            return data
-
-        if not data or not isinstance(data, list) or len(data) == 0:
-            break
-
-        all_results.extend(data)
-
-        # Follow Link header for next page
-        link_header = response.headers.get("link", "")
-        links = _parse_link_header(link_header) if link_header else {}
-        url = links.get("next")
-
-    # Apply anonymization to the complete result set if needed
-    if not skip_anonymization:
-        if config.enable_data_anonymization and _should_anonymize_endpoint(endpoint):
-            data_type = _determine_data_type(endpoint)
-            all_results = anonymize_response_data(all_results, data_type)
-
-            if config.anonymization_debug:
-                log_info(
-                    f"Applied {data_type} anonymization to paginated results from {endpoint}"
+            return [
+                item
+                async for item in iter_paginated_results(
+                    endpoint,
+                    params,
+                    skip_anonymization=skip_anonymization,
+                    result_key=result_key,
                 )
+            ]
+        except CanvasAPIError as e:
+            return e.response
 
-    return all_results
+    return await _coalesced(
+        _request_key("paginate", endpoint, params, skip_anonymization, result_key),
+        collect,
+    )
 
 
 async def poll_canvas_progress(
@@ -81,6 +81,13 @@ class Config:
         # Values: "all" (default), "educator", "student" (future)
         self.user_type = os.getenv("CANVAS_MCP_USER_TYPE", "all").lower()
 
+        # Comma-separated tool groups to register (empty = all groups)
+        self.tool_groups = [
+            group.strip().lower()
+            for group in os.getenv("CANVAS_MCP_TOOLS", "").split(",")
+            if group.strip()
+        ]
+
     @property
     def api_base_url(self) -> str:
         """Legacy compatibility for API_BASE_URL."""
@@ -0,0 +1,13 @@
+"""Helpers for building CSV text in tool responses."""
+
+
+class LineBuffer(list[str]):
+    """List of CSV lines that ``csv.writer`` can write to directly.
+
+    Joining the collected lines once avoids the copies a growing
+    ``io.StringIO`` makes.
+    """
+
+    def write(self, line: str) -> int:
+        self.append(line)
+        return len(line)
@@ -19,6 +19,7 @@ For token efficiency, this module also provides smart date formatting modes:
 """
 
 import datetime
+import functools
 from typing import Literal
 
 from dateutil import parser as date_parser
@@ -78,6 +79,9 @@ def parse_date(date_str: str | None) -> datetime.datetime | None:
     return None
 
 
+# Pure function over a small key space (mostly repeated due dates), so
+# results are memoized.
+@functools.lru_cache(maxsize=2048)
 def format_date(date_str: str | None) -> str:
     """Format a date string to ISO 8601 format (YYYY-MM-DDTHH:MM:SSZ) or return 'N/A' if None.
 
@@ -7,6 +7,7 @@ import types
 from collections.abc import Callable
 from typing import Any, Union, cast, get_args, get_origin, get_type_hints
 
+from .client import CanvasAPIError
 from .logging import log_error
 
 
@@ -237,3 +238,26 @@ def validate_params[F: Callable[..., Any]](func: F) -> F:
         return await func(**bound_args.arguments)
 
     return cast(F, wrapper)
+
+
+def canvas_errors[F: Callable[..., Any]](action: str) -> Callable[[F], F]:
+    """Decorator that turns a CanvasAPIError raised by a tool into its message.
+
+    Lets tool bodies raise on API errors instead of checking every response.
+
+    Args:
+        action: What the tool was doing (e.g. "fetching student activity");
+            the tool returns "Error {action}: {error}"
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await func(*args, **kwargs)
+            except CanvasAPIError as e:
+                return f"Error {action}: {e}"
+
+        return cast(F, wrapper)
+
+    return decorator
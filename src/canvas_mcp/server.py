@@ -13,34 +13,14 @@ import sys
 
 from mcp.server.fastmcp import FastMCP
 
+from . import tools
 from .core.config import get_config, validate_config
-from .core.logging import log_error, log_info
+from .core.logging import log_error, log_info, log_warning
 from .resources import register_resources_and_prompts
-from .tools import (
-    register_accessibility_tools,
-    register_analytics_tools,
-    register_assignment_analytics_tools,
-    register_assignment_tools,
-    register_code_execution_tools,
-    register_content_migration_tools,
-    register_course_tools,
-    register_discovery_tools,
-    register_discussion_analytics_tools,
-    register_discussion_tools,
-    register_enrollment_tools,
-    register_gradebook_tools,
-    register_grading_export_tools,
-    register_messaging_tools,
-    register_module_tools,
-    register_page_tools,
-    register_peer_review_comment_tools,
-    register_peer_review_tools,
-    register_quiz_tools,
-    register_rubric_grading_tools,
-    register_rubric_tools,
-    register_search_helper_tools,
-    register_student_tools,
-)
+
+# Tool groups gated on CANVAS_MCP_USER_TYPE
+STUDENT_TOOL_GROUPS = ("student_tools",)
+DEVELOPER_TOOL_GROUPS = ("discovery", "code_execution")
 
 
 def create_server() -> FastMCP:
@@ -57,42 +37,36 @@ def register_all_tools(mcp: FastMCP) -> None:
 
     log_info(f"Registering Canvas MCP tools (user_type={user_type})...")
 
-    # Always register shared and educator tools
-    register_course_tools(mcp)
-    register_assignment_tools(mcp)
-    register_assignment_analytics_tools(mcp)
-    register_discussion_tools(mcp)
-    register_discussion_analytics_tools(mcp)
-    register_enrollment_tools(mcp)
-    register_module_tools(mcp)
-    register_page_tools(mcp)
-    register_rubric_tools(mcp)
-    register_rubric_grading_tools(mcp)
-    register_peer_review_tools(mcp)
-    register_peer_review_comment_tools(mcp)
-    register_messaging_tools(mcp)
-    register_accessibility_tools(mcp)
-    register_analytics_tools(mcp)
-    register_search_helper_tools(mcp)
-    register_quiz_tools(mcp)
-    register_gradebook_tools(mcp)
-    register_grading_export_tools(mcp)
-    register_content_migration_tools(mcp)
-
-    # Conditionally register student tools
-    if user_type in ("all", "student"):
-        register_student_tools(mcp)
+    # Student and developer tools depend on the configured user type
+    skip: set[str] = set()
+    if user_type not in ("all", "student"):
+        skip.update(STUDENT_TOOL_GROUPS)
+    if user_type != "all":
+        skip.update(DEVELOPER_TOOL_GROUPS)
+
+    only = config.tool_groups or None
+    if only:
+        unknown = set(only) - set(tools.TOOL_GROUPS)
+        if unknown:
+            log_warning(f"Ignoring unknown CANVAS_MCP_TOOLS groups: {sorted(unknown)}")
+        known = [group for group in only if group in tools.TOOL_GROUPS]
+        if not known:
+            # An empty list would register nothing; fall back to every group
+            log_warning("No known CANVAS_MCP_TOOLS groups; registering all groups")
+        only = known or None
+
+    registered = tools.register_all_tools(mcp, only=only, skip=skip)
+    log_info(f"  Registered {len(registered)} tool groups")
+
+    if set(STUDENT_TOOL_GROUPS) & set(registered):
         log_info("  Registered: student tools (5 tools)")
     else:
-        log_info("  Skipped: student tools (user_type=educator)")
+        log_info("  Skipped: student tools")
 
-    # Conditionally register developer tools
-    if user_type == "all":
-        register_discovery_tools(mcp)
-        register_code_execution_tools(mcp)
+    if set(DEVELOPER_TOOL_GROUPS) & set(registered):
         log_info("  Registered: developer tools (3 tools)")
     else:
-        log_info("  Skipped: developer tools (user_type!=all)")
+        log_info("  Skipped: developer tools")
 
     # Register resources and prompts
     register_resources_and_prompts(mcp)
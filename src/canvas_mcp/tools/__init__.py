@@ -1,51 +1,147 @@
-"""Tool modules for Canvas MCP server."""
-
-from .accessibility import register_accessibility_tools
-from .analytics import register_analytics_tools
-from .assignment_analytics import register_assignment_analytics_tools
-from .assignments import register_assignment_tools
-from .code_execution import register_code_execution_tools
-from .content_migrations import register_content_migration_tools
-from .courses import register_course_tools
-from .discovery import register_discovery_tools
-from .discussion_analytics import register_discussion_analytics_tools
-from .discussions import register_discussion_tools
-from .enrollment import register_enrollment_tools
-from .gradebook import register_gradebook_tools
-from .grading_export import register_grading_export_tools
-from .messaging import register_messaging_tools
-from .modules import register_module_tools
-from .pages import register_page_tools
-from .peer_review_comments import register_peer_review_comment_tools
-from .peer_reviews import register_peer_review_tools
-from .quizzes import register_quiz_tools
-from .rubric_grading import register_rubric_grading_tools
-from .rubrics import register_rubric_tools
-from .search_helpers import register_search_helper_tools
-from .student_tools import register_student_tools
-
-__all__ = [
-    "register_course_tools",
-    "register_assignment_analytics_tools",
-    "register_assignment_tools",
-    "register_discussion_tools",
-    "register_discussion_analytics_tools",
-    "register_enrollment_tools",
-    "register_module_tools",
-    "register_rubric_grading_tools",
-    "register_rubric_tools",
-    "register_peer_review_tools",
-    "register_peer_review_comment_tools",
-    "register_messaging_tools",
-    "register_student_tools",
-    "register_accessibility_tools",
-    "register_discovery_tools",
-    "register_code_execution_tools",
-    "register_page_tools",
-    "register_analytics_tools",
-    "register_search_helper_tools",
-    "register_quiz_tools",
-    "register_gradebook_tools",
-    "register_grading_export_tools",
-    "register_content_migration_tools",
-]
+"""Tool modules for Canvas MCP server.
+
+Submodules are imported lazily (PEP 562): each ``register_*`` function is
+resolved on first attribute access, so importing this package does not pay
+for loading every tool module up front. Set ``CANVAS_MCP_EAGER_IMPORT=true``
+to import everything at package import time instead, so a broken tool module
+fails immediately (useful in CI and cold-start probes).
+"""
+
+import importlib
+import os
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from mcp.server.fastmcp import FastMCP
+
+    # Concrete imports for type checkers and IDEs; never executed at runtime.
+    from .accessibility import register_accessibility_tools
+    from .analytics import register_analytics_tools
+    from .assignment_analytics import register_assignment_analytics_tools
+    from .assignments import register_assignment_tools
+    from .code_execution import register_code_execution_tools
+    from .content_migrations import register_content_migration_tools
+    from .courses import register_course_tools
+    from .discovery import register_discovery_tools
+    from .discussion_analytics import register_discussion_analytics_tools
+    from .discussions import register_discussion_tools
+    from .enrollment import register_enrollment_tools
+    from .gradebook import register_gradebook_tools
+    from .grading_export import register_grading_export_tools
+    from .messaging import register_messaging_tools
+    from .modules import register_module_tools
+    from .pages import register_page_tools
+    from .peer_review_comments import register_peer_review_comment_tools
+    from .peer_reviews import register_peer_review_tools
+    from .quizzes import register_quiz_tools
+    from .rubric_grading import register_rubric_grading_tools
+    from .rubrics import register_rubric_tools
+    from .search_helpers import register_search_helper_tools
+    from .student_tools import register_student_tools
+
+# Maps each public register function to the submodule that defines it, in the
+# order the server registers them.
+_LAZY: dict[str, str] = {
+    "register_course_tools": ".courses",
+    "register_assignment_tools": ".assignments",
+    "register_assignment_analytics_tools": ".assignment_analytics",
+    "register_discussion_tools": ".discussions",
+    "register_discussion_analytics_tools": ".discussion_analytics",
+    "register_enrollment_tools": ".enrollment",
+    "register_module_tools": ".modules",
+    "register_page_tools": ".pages",
+    "register_rubric_tools": ".rubrics",
+    "register_rubric_grading_tools": ".rubric_grading",
+    "register_peer_review_tools": ".peer_reviews",
+    "register_peer_review_comment_tools": ".peer_review_comments",
+    "register_messaging_tools": ".messaging",
+    "register_accessibility_tools": ".accessibility",
+    "register_analytics_tools": ".analytics",
+    "register_search_helper_tools": ".search_helpers",
+    "register_quiz_tools": ".quizzes",
+    "register_gradebook_tools": ".gradebook",
+    "register_grading_export_tools": ".grading_export",
+    "register_content_migration_tools": ".content_migrations",
+    "register_student_tools": ".student_tools",
+    "register_discovery_tools": ".discovery",
+    "register_code_execution_tools": ".code_execution",
+}
+
+# Companion submodules that are always used together load and register as a
+# single lazy group under their parent's name.
+_COMPOUND_GROUPS: dict[str, str] = {
+    "discussion_analytics": "discussions",
+    "peer_review_comments": "peer_reviews",
+}
+
+
+def _group_of(name: str) -> str:
+    submodule = _LAZY[name].lstrip(".")
+    return _COMPOUND_GROUPS.get(submodule, submodule)
+
+
+# Tool group names accepted by register_all_tools.
+TOOL_GROUPS: tuple[str, ...] = tuple(dict.fromkeys(map(_group_of, _LAZY)))
+
+
+def __getattr__(name: str) -> Any:
+    """Import the tool group that defines ``name`` on first access."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    group = _group_of(name)
+    for member, submodule in _LAZY.items():
+        if _group_of(member) == group:
+            # Cache in module globals: PEP 562 only calls __getattr__ for
+            # missing names, so later lookups are plain dict hits. Do not remove.
+            module = importlib.import_module(submodule, __name__)
+            globals()[member] = getattr(module, member)
+    return globals()[name]
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def register_all_tools(
+    mcp: "FastMCP",
+    *,
+    only: Iterable[str] | None = None,
+    skip: Iterable[str] | None = None,
+) -> list[str]:
+    """Register tool groups on ``mcp`` in server order.
+
+    Only the submodules of registered groups are imported.
+
+    Args:
+        mcp: The FastMCP server instance
+        only: Group names to register (default: every group in TOOL_GROUPS)
+        skip: Group names to leave out
+
+    Returns:
+        The group names that were registered, in registration order
+    """
+    wanted = set(TOOL_GROUPS if only is None else only)
+    skipped = set(skip or ())
+    unknown = (wanted | skipped) - set(TOOL_GROUPS)
+    if unknown:
+        raise ValueError(f"Unknown tool group(s): {', '.join(sorted(unknown))}")
+
+    registered: list[str] = []
+    for name in _LAZY:
+        group = _group_of(name)
+        if group not in wanted or group in skipped:
+            continue
+        __getattr__(name)(mcp)
+        if group not in registered:
+            registered.append(group)
+    return registered
+
+
+# Single source of truth: every lazy export comes from the manifest above.
+__all__ = ["TOOL_GROUPS", "register_all_tools", *_LAZY]
+
+if os.getenv("CANVAS_MCP_EAGER_IMPORT", "").strip().lower() in ("1", "true"):
+    for _name in _LAZY:
+        __getattr__(_name)
+    del _name
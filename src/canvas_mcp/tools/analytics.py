@@ -4,14 +4,218 @@ Provides teacher-facing analytics tools for monitoring student engagement,
 course activity, assignment statistics, and generating reports.
 """
 
+import functools
+import heapq
+import itertools
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import date
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
 from mcp.server.fastmcp import FastMCP
 
 from ..core.anonymization import anonymize_response_data, generate_anonymous_id
-from ..core.cache import get_course_code, get_course_id
-from ..core.client import fetch_all_paginated_results, make_canvas_request
+from ..core.cache import async_ttl_cache, resolve_course
+from ..core.client import (
+    CanvasAPIError,
+    fetch_all_paginated_results,
+    iter_paginated_pages,
+    make_canvas_request,
+)
 from ..core.dates import format_date
 from ..core.logging import log_warning
-from ..core.validation import validate_params
+from ..core.validation import canvas_errors, validate_params
+
+# Shared read-only stand-in for missing nested objects (e.g. tardiness_breakdown)
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Exact types counted as activity values; bools are not counts
+_NUMERIC = frozenset({int, float})
+
+# Accepted tool arguments: ordered for error messages, frozen for lookups
+_SORT_OPTIONS = (
+    "name",
+    "name_descending",
+    "score",
+    "score_descending",
+    "participations",
+    "participations_descending",
+    "page_views",
+    "page_views_descending",
+)
+_VALID_SORT = frozenset(_SORT_OPTIONS)
+_VALID_SORT_TEXT = ", ".join(_SORT_OPTIONS)
+
+_REPORT_TYPES = (
+    "grade_export_csv",
+    "student_assignment_outcome_map_csv",
+    "provisioning_csv",
+)
+_VALID_REPORTS = frozenset(_REPORT_TYPES)
+_VALID_REPORTS_TEXT = ", ".join(_REPORT_TYPES)
+
+
+_WEEKDAYS = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _weekday_index(date_str: str) -> int | None:
+    """Weekday (Monday=0) of an ISO 8601 date or datetime, or None if unparseable.
+
+    The weekday depends only on the YYYY-MM-DD prefix, so the time and
+    offset are ignored.
+    """
+    try:
+        return date.fromisoformat(date_str[:10]).weekday()
+    except (ValueError, TypeError):
+        return None
+
+
+def _weekday(date_str: str) -> str | None:
+    """Day-of-week name for an ISO 8601 date or datetime, or None if unparseable."""
+    index = _weekday_index(date_str)
+    return None if index is None else _WEEKDAYS[index]
+
+
+def _trunc(text: str | None, limit: int) -> str:
+    """Shorten ``text`` to ``limit`` characters plus an ellipsis; None becomes ""."""
+    if not text:
+        return ""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _capped_section(header: str, entries: Sequence[str], limit: int = 10) -> list[str]:
+    """Report lines for a header, the first ``limit`` entries and an overflow note."""
+    section = [header, *(f"  - {entry}" for entry in entries[:limit])]
+    if len(entries) > limit:
+        section.append(f"  ... and {len(entries) - limit} more")
+    section.append("")
+    return section
+
+
+def _tardiness_columns(
+    assignments: Iterable[Mapping[str, Any]],
+) -> tuple[list[int], list[int], list[int], list[int]]:
+    """Split tardiness breakdowns into on_time, late, missing and floating columns."""
+    breakdowns = [a.get("tardiness_breakdown") or _EMPTY for a in assignments]
+    return (
+        [t.get("on_time") or 0 for t in breakdowns],
+        [t.get("late") or 0 for t in breakdowns],
+        [t.get("missing") or 0 for t in breakdowns],
+        [t.get("floating") or 0 for t in breakdowns],
+    )
+
+
+def _submission_totals(on_time: list[int], late: list[int]) -> tuple[int, int]:
+    """Total submitted (on time plus late) and total late counts."""
+    total_late = sum(late)
+    return sum(on_time) + total_late, total_late
+
+
+class _Engagement(NamedTuple):
+    """Partial student-summary aggregate for one page (or several merged)."""
+
+    students: int = 0
+    page_views: int = 0
+    participations: int = 0
+    no_activity: tuple[str, ...] = ()
+    low_engagement: tuple[str, ...] = ()
+    high_tardiness: tuple[dict[str, Any], ...] = ()
+    top: tuple[Mapping[str, Any], ...] = ()
+
+
+def _summarize_page(students: list[Mapping[str, Any]]) -> _Engagement:
+    """Aggregate one page of student summaries in a single pass."""
+    total_page_views = 0
+    total_participations = 0
+    no_activity = []
+    low_engagement = []
+    high_tardiness = []
+
+    for student in students:
+        page_views = student.get("page_views") or 0
+        participations = student.get("participations") or 0
+        total_page_views += page_views
+        total_participations += participations
+        tardiness = student.get("tardiness_breakdown") or _EMPTY
+        late_count = tardiness.get("late") or 0
+        missing_count = tardiness.get("missing") or 0
+
+        student_name = student.get("name", f"Student {student.get('id', 'Unknown')}")
+
+        if page_views == 0 and participations == 0:
+            no_activity.append(student_name)
+        elif page_views < 10 and participations < 5:
+            low_engagement.append(student_name)
+
+        if missing_count > 2 or late_count > 3:
+            high_tardiness.append(
+                {"name": student_name, "late": late_count, "missing": missing_count}
+            )
+
+    return _Engagement(
+        len(students),
+        total_page_views,
+        total_participations,
+        tuple(no_activity),
+        tuple(low_engagement),
+        tuple(high_tardiness),
+        tuple(students[:5]),
+    )
+
+
+def _merge_engagement(parts: Iterable[_Engagement]) -> _Engagement:
+    """Combine partial aggregates in order, joining each list once.
+
+    Merging already-merged partials gives the same result as merging the
+    pages directly, so page and course partials combine the same way.
+    """
+    parts = list(parts)
+    joined = itertools.chain.from_iterable
+    return _Engagement(
+        sum(part.students for part in parts),
+        sum(part.page_views for part in parts),
+        sum(part.participations for part in parts),
+        tuple(joined(part.no_activity for part in parts)),
+        tuple(joined(part.low_engagement for part in parts)),
+        tuple(joined(part.high_tardiness for part in parts)),
+        tuple(itertools.islice(joined(part.top for part in parts), 5)),
+    )
+
+
+def _merge_counts(counts: Iterable[Mapping[str, Any]]) -> Counter[str]:
+    """Sum per-key counts, keeping zero-count keys.
+
+    Unlike ``Counter.__add__``, which drops non-positive totals.
+    """
+    merged: Counter[str] = Counter()
+    for part in counts:
+        merged.update(part)
+    return merged
+
+
+# Canvas recomputes course analytics roughly daily, so repeat calls within
+# CACHE_TTL can safely reuse the previous response.
+@async_ttl_cache()
+async def _get_analytics(endpoint: str, params: dict[str, Any] | None = None) -> Any:
+    """GET a course analytics endpoint through the TTL cache.
+
+    Raises:
+        CanvasAPIError: If Canvas returns an error (errors are not cached)
+    """
+    response = await make_canvas_request("get", endpoint, params=params)
+    if isinstance(response, dict) and "error" in response:
+        raise CanvasAPIError(response)
+    return response
 
 
 def register_analytics_tools(mcp: FastMCP) -> None:
@@ -19,6 +223,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @validate_params
+    @canvas_errors("fetching student summaries")
     async def get_course_student_summaries(
         course_identifier: str | int, sort_by: str = "name"
     ) -> str:
@@ -33,120 +238,76 @@ def register_analytics_tools(mcp: FastMCP) -> None:
                      score, score_descending, participations, participations_descending,
                      page_views, page_views_descending
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         # Validate sort_by parameter
-        valid_sort_options = [
-            "name",
-            "name_descending",
-            "score",
-            "score_descending",
-            "participations",
-            "participations_descending",
-            "page_views",
-            "page_views_descending",
-        ]
-        if sort_by not in valid_sort_options:
-            return f"Error: Invalid sort_by option '{sort_by}'. Valid options: {', '.join(valid_sort_options)}"
+        if sort_by not in _VALID_SORT:
+            return f"Error: Invalid sort_by option '{sort_by}'. Valid options: {_VALID_SORT_TEXT}"
 
         params = {"sort_column": sort_by.replace("_descending", ""), "per_page": 100}
         if sort_by.endswith("_descending"):
             params["sort_order"] = "descending"
 
-        students = await fetch_all_paginated_results(
-            f"/courses/{course_id}/analytics/student_summaries", params
+        # Reduce each page to a partial as it streams in, then merge once
+        summary = _merge_engagement(
+            [
+                _summarize_page(page)
+                async for page in iter_paginated_pages(
+                    f"/courses/{course_id}/analytics/student_summaries", params
+                )
+            ]
         )
 
-        if isinstance(students, dict) and "error" in students:
-            return f"Error fetching student summaries: {students['error']}"
-
-        if not students:
+        if not summary.students:
             return "No student analytics data available for this course."
 
-        # Calculate summary statistics
-        total_students = len(students)
-        total_page_views = sum(s.get("page_views", 0) or 0 for s in students)
-        total_participations = sum(s.get("participations", 0) or 0 for s in students)
-
-        # Identify engagement levels
-        no_activity = []
-        low_engagement = []
-        high_tardiness = []
-
-        for student in students:
-            page_views = student.get("page_views", 0) or 0
-            participations = student.get("participations", 0) or 0
-            tardiness = student.get("tardiness_breakdown", {})
-            late_count = tardiness.get("late", 0) or 0
-            missing_count = tardiness.get("missing", 0) or 0
-
-            student_name = student.get(
-                "name", f"Student {student.get('id', 'Unknown')}"
-            )
-
-            if page_views == 0 and participations == 0:
-                no_activity.append(student_name)
-            elif page_views < 10 and participations < 5:
-                low_engagement.append(student_name)
-
-            if missing_count > 2 or late_count > 3:
-                high_tardiness.append(
-                    {"name": student_name, "late": late_count, "missing": missing_count}
-                )
-
         # Build summary report
-        course_display = await get_course_code(course_id) or course_identifier
         lines = [
             f"Student Analytics Summary for {course_display}",
             "=" * 50,
             "",
-            f"Total Students: {total_students}",
-            f"Total Page Views: {total_page_views}",
-            f"Total Participations: {total_participations}",
+            f"Total Students: {summary.students}",
+            f"Total Page Views: {summary.page_views}",
+            f"Total Participations: {summary.participations}",
             (
-                f"Average Page Views per Student: {total_page_views / total_students:.1f}"
-                if total_students > 0
+                f"Average Page Views per Student: {summary.page_views / summary.students:.1f}"
+                if summary.students > 0
                 else ""
             ),
             (
-                f"Average Participations per Student: {total_participations / total_students:.1f}"
-                if total_students > 0
+                f"Average Participations per Student: {summary.participations / summary.students:.1f}"
+                if summary.students > 0
                 else ""
             ),
             "",
         ]
 
         # Students needing attention
-        if no_activity:
-            lines.append(f"⚠️ Students with No Activity ({len(no_activity)}):")
-            for name in no_activity[:10]:
-                lines.append(f"  - {name}")
-            if len(no_activity) > 10:
-                lines.append(f"  ... and {len(no_activity) - 10} more")
-            lines.append("")
+        if summary.no_activity:
+            lines += _capped_section(
+                f"⚠️ Students with No Activity ({len(summary.no_activity)}):",
+                summary.no_activity,
+            )
 
-        if low_engagement:
-            lines.append(f"📉 Students with Low Engagement ({len(low_engagement)}):")
-            for name in low_engagement[:10]:
-                lines.append(f"  - {name}")
-            if len(low_engagement) > 10:
-                lines.append(f"  ... and {len(low_engagement) - 10} more")
-            lines.append("")
+        if summary.low_engagement:
+            lines += _capped_section(
+                f"📉 Students with Low Engagement ({len(summary.low_engagement)}):",
+                summary.low_engagement,
+            )
 
-        if high_tardiness:
-            lines.append(f"⏰ Students with Tardiness Issues ({len(high_tardiness)}):")
-            for s in high_tardiness[:10]:
-                lines.append(
-                    f"  - {s['name']}: {s['late']} late, {s['missing']} missing"
-                )
-            if len(high_tardiness) > 10:
-                lines.append(f"  ... and {len(high_tardiness) - 10} more")
-            lines.append("")
+        if summary.high_tardiness:
+            lines += _capped_section(
+                f"⏰ Students with Tardiness Issues ({len(summary.high_tardiness)}):",
+                [
+                    f"{s['name']}: {s['late']} late, {s['missing']} missing"
+                    for s in summary.high_tardiness
+                ],
+            )
 
         # Top engaged students (first 5 by current sort)
-        if students:
+        if summary.top:
             lines.append("Top 5 Students by Current Sort:")
-            for student in students[:5]:
+            for student in summary.top:
                 name = student.get("name", f"Student {student.get('id', 'Unknown')}")
                 pv = student.get("page_views", 0) or 0
                 part = student.get("participations", 0) or 0
@@ -156,6 +317,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @validate_params
+    @canvas_errors("fetching student activity")
     async def get_student_activity(
         course_identifier: str | int, student_id: str | int
     ) -> str:
@@ -167,15 +329,12 @@ def register_analytics_tools(mcp: FastMCP) -> None:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             student_id: The student's Canvas user ID
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
-        response = await make_canvas_request(
-            "get", f"/courses/{course_id}/analytics/users/{student_id}/activity"
+        response = await _get_analytics(
+            f"/courses/{course_id}/analytics/users/{student_id}/activity"
         )
 
-        if isinstance(response, dict) and "error" in response:
-            return f"Error fetching student activity: {response['error']}"
-
         if not response:
             return "No activity data available for this student."
 
@@ -188,36 +347,34 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         view_by_day: dict[str, int] = {}
 
         if isinstance(page_views, dict):
+            total_views = sum(filter(None, page_views.values()))
+            # Bin by weekday index into a fixed list, then name the non-empty days
+            by_weekday = [0] * 7
             for date_str, count in page_views.items():
                 if count:
-                    total_views += count
-                    # Extract day of week from date
-                    try:
-                        from datetime import datetime
-
-                        date_obj = datetime.fromisoformat(
-                            date_str.replace("Z", "+00:00")
-                        )
-                        day_name = date_obj.strftime("%A")
-                        view_by_day[day_name] = view_by_day.get(day_name, 0) + count
-                    except (ValueError, TypeError):
-                        pass
+                    index = _weekday_index(date_str)
+                    if index is not None:
+                        by_weekday[index] += count
+            view_by_day = {
+                day: views
+                for day, views in zip(_WEEKDAYS, by_weekday, strict=True)
+                if views
+            }
 
         # Process participations
         recent_participations = []
         if isinstance(participations, list):
-            # Sort by created_at descending and take most recent
-            sorted_parts = sorted(
-                [p for p in participations if p.get("created_at")],
-                key=lambda x: x.get("created_at", ""),
-                reverse=True,
+            # Take the 10 most recent by created_at
+            latest_parts = heapq.nlargest(
+                10,
+                (p for p in participations if p.get("created_at")),
+                key=lambda x: x["created_at"],
             )
-            for p in sorted_parts[:10]:
+            for p in latest_parts:
                 created_at = format_date(p.get("created_at"))
                 url = p.get("url", "")
                 recent_participations.append({"date": created_at, "url": url})
 
-        course_display = await get_course_code(course_id) or course_identifier
         lines = [
             f"Student Activity for Course {course_display}",
             "=" * 50,
@@ -228,25 +385,28 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         ]
 
         if view_by_day:
-            lines.append("Page Views by Day of Week:")
             # Sort by view count
-            for day, count in sorted(
-                view_by_day.items(), key=lambda x: x[1], reverse=True
-            ):
-                lines.append(f"  {day}: {count}")
-            lines.append("")
+            lines += [
+                "Page Views by Day of Week:",
+                *(
+                    f"  {day}: {count}"
+                    for day, count in sorted(
+                        view_by_day.items(), key=lambda x: x[1], reverse=True
+                    )
+                ),
+                "",
+            ]
 
             # Find peak activity day
-            if view_by_day:
-                peak_day = max(view_by_day.keys(), key=lambda d: view_by_day[d])
-                lines.append(f"📊 Peak Activity Day: {peak_day}")
-                lines.append("")
+            peak_day = max(view_by_day, key=view_by_day.__getitem__)
+            lines += [f"📊 Peak Activity Day: {peak_day}", ""]
 
         if recent_participations:
             lines.append("Recent Participations (last 10):")
-            for p in recent_participations:
-                url_short = p["url"][:50] + "..." if len(p["url"]) > 50 else p["url"]
-                lines.append(f"  - {p['date']}: {url_short}")
+            lines += [
+                f"  - {p['date']}: {_trunc(p['url'], 50)}"
+                for p in recent_participations
+            ]
         else:
             lines.append("No recent participations recorded.")
 
@@ -254,6 +414,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @validate_params
+    @canvas_errors("fetching student assignments")
     async def get_student_assignment_data(
         course_identifier: str | int, student_id: str | int
     ) -> str:
@@ -265,15 +426,12 @@ def register_analytics_tools(mcp: FastMCP) -> None:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             student_id: The student's Canvas user ID
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
-        response = await make_canvas_request(
-            "get", f"/courses/{course_id}/analytics/users/{student_id}/assignments"
+        response = await _get_analytics(
+            f"/courses/{course_id}/analytics/users/{student_id}/assignments"
         )
 
-        if isinstance(response, dict) and "error" in response:
-            return f"Error fetching student assignments: {response['error']}"
-
         if not response or not isinstance(response, list):
             return "No assignment analytics data available for this student."
 
@@ -288,8 +446,8 @@ def register_analytics_tools(mcp: FastMCP) -> None:
 
         for assignment in response:
             title = assignment.get("title", "Untitled")
-            points_possible = assignment.get("points_possible", 0) or 0
-            submission = assignment.get("submission", {})
+            points_possible = assignment.get("points_possible") or 0
+            submission = assignment.get("submission")
 
             if submission:
                 score = submission.get("score")
@@ -360,7 +518,6 @@ def register_analytics_tools(mcp: FastMCP) -> None:
             else 0
         )
 
-        course_display = await get_course_code(course_id) or course_identifier
         lines = [
             f"Student Assignment Analytics for {course_display}",
             "=" * 50,
@@ -377,11 +534,10 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         ]
 
         for a in assignments_info:
-            title_short = (
-                a["title"][:30] + "..." if len(a["title"]) > 30 else a["title"]
-            )
-            lines.append(f"  {title_short}")
-            lines.append(f"    Score: {a['score']} ({a['percent']}) {a['status']}")
+            lines += [
+                f"  {_trunc(a['title'], 30)}",
+                f"    Score: {a['score']} ({a['percent']}) {a['status']}",
+            ]
             if a["submitted_at"] != "N/A":
                 lines.append(f"    Submitted: {a['submitted_at']}")
             lines.append("")
@@ -390,6 +546,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @validate_params
+    @canvas_errors("fetching student communication")
     async def get_student_communication(
         course_identifier: str | int, student_id: str | int
     ) -> str:
@@ -401,15 +558,12 @@ def register_analytics_tools(mcp: FastMCP) -> None:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             student_id: The student's Canvas user ID
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
-        response = await make_canvas_request(
-            "get", f"/courses/{course_id}/analytics/users/{student_id}/communication"
+        response = await _get_analytics(
+            f"/courses/{course_id}/analytics/users/{student_id}/communication"
         )
 
-        if isinstance(response, dict) and "error" in response:
-            return f"Error fetching student communication: {response['error']}"
-
         if not response:
             return "No communication data available for this student."
 
@@ -418,7 +572,6 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         instructor_messages = message_data.get("instructorMessages", 0) or 0
         student_messages = message_data.get("studentMessages", 0) or 0
 
-        course_display = await get_course_code(course_id) or course_identifier
         lines = [
             f"Student Communication Analytics for {course_display}",
             "=" * 50,
@@ -443,6 +596,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
 
     @mcp.tool()
     @validate_params
+    @canvas_errors("fetching course activity")
     async def get_course_activity(
         course_identifier: str | int,
         start_date: str | None = None,
@@ -458,7 +612,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
             start_date: Optional start date filter (ISO 8601 format, e.g., 2024-01-01)
             end_date: Optional end date filter (ISO 8601 format, e.g., 2024-12-31)
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         params = {}
         if start_date:
@@ -466,85 +620,87 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         if end_date:
             params["end_date"] = end_date
 
-        response = await make_canvas_request(
-            "get",
+        response = await _get_analytics(
             f"/courses/{course_id}/analytics/activity",
             params=params if params else None,
         )
 
-        if isinstance(response, dict) and "error" in response:
-            return f"Error fetching course activity: {response['error']}"
-
         if not response or not isinstance(response, list):
             return "No course activity data available."
 
         # Aggregate by category
-        category_totals: dict[str, int | float] = {}
-        daily_totals = []
-
-        for day_data in response:
-            date = day_data.get("date", "Unknown")
-            day_total: int | float = 0
-
-            for category, count in day_data.items():
-                if category != "date" and isinstance(count, (int, float)):
-                    category_totals[category] = category_totals.get(category, 0) + count
-                    day_total += count
-
-            daily_totals.append({"date": date, "total": day_total})
+        day_counts = [
+            {
+                category: count
+                for category, count in day_data.items()
+                if category != "date" and type(count) in _NUMERIC
+            }
+            for day_data in response
+        ]
+        category_totals = _merge_counts(day_counts)
+        daily_totals = [
+            {"date": day_data.get("date", "Unknown"), "total": sum(counts.values())}
+            for day_data, counts in zip(response, day_counts, strict=True)
+        ]
 
-        # Sort daily totals to find peak days
-        daily_totals.sort(key=lambda x: x["total"], reverse=True)
+        # Only the top 5 days are shown, so avoid a full sort
+        peak_days = heapq.nlargest(5, daily_totals, key=lambda x: x["total"])
 
         total_activity = sum(category_totals.values())
 
-        course_display = await get_course_code(course_id) or course_identifier
         lines = [f"Course Activity Analytics for {course_display}", "=" * 50, ""]
 
         if start_date or end_date:
             date_range = f"{start_date or 'start'} to {end_date or 'present'}"
-            lines.append(f"Date Range: {date_range}")
-            lines.append("")
+            lines += [f"Date Range: {date_range}", ""]
 
         lines.extend(
             [
                 f"Total Activity Events: {total_activity}",
-                f"Days with Activity: {len([d for d in daily_totals if d['total'] > 0])}",
+                f"Days with Activity: {sum(d['total'] > 0 for d in daily_totals)}",
                 "",
             ]
         )
 
         if category_totals:
-            lines.append("Activity by Category:")
-            for category, count in sorted(
-                category_totals.items(), key=lambda x: x[1], reverse=True
-            ):
-                percentage = (count / total_activity * 100) if total_activity > 0 else 0
-                lines.append(f"  {category}: {count} ({percentage:.1f}%)")
-            lines.append("")
+            lines += [
+                "Activity by Category:",
+                *(
+                    f"  {category}: {count} ({count / total_activity * 100 if total_activity > 0 else 0:.1f}%)"
+                    for category, count in sorted(
+                        category_totals.items(), key=lambda x: x[1], reverse=True
+                    )
+                ),
+                "",
+            ]
 
         if daily_totals:
-            lines.append("Top 5 Peak Activity Days:")
-            for day in daily_totals[:5]:
-                if day["total"] > 0:
-                    lines.append(f"  {day['date']}: {day['total']} events")
-            lines.append("")
+            lines += [
+                "Top 5 Peak Activity Days:",
+                *(
+                    f"  {day['date']}: {day['total']} events"
+                    for day in peak_days
+                    if day["total"] > 0
+                ),
+                "",
+            ]
 
             # Most recent activity
-            recent = sorted(
-                [d for d in daily_totals if d["total"] > 0],
+            recent = max(
+                (d for d in daily_totals if d["total"] > 0),
                 key=lambda x: x["date"],
-                reverse=True,
+                default=None,
             )
             if recent:
                 lines.append(
-                    f"📅 Most Recent Activity: {recent[0]['date']} ({recent[0]['total']} events)"
+                    f"📅 Most Recent Activity: {recent['date']} ({recent['total']} events)"
                 )
 
         return "\n".join(lines)
 
     @mcp.tool()
     @validate_params
+    @canvas_errors("fetching assignment statistics")
     async def get_assignment_statistics(course_identifier: str | int) -> str:
         """Get grade distribution and timing statistics for all assignments.
 
@@ -554,65 +710,39 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         Args:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
         """
-        course_id = await get_course_id(course_identifier)
-
-        response = await make_canvas_request(
-            "get", f"/courses/{course_id}/analytics/assignments"
-        )
+        course_id, course_display = await resolve_course(course_identifier)
 
-        if isinstance(response, dict) and "error" in response:
-            return f"Error fetching assignment statistics: {response['error']}"
+        response = await _get_analytics(f"/courses/{course_id}/analytics/assignments")
 
         if not response or not isinstance(response, list):
             return "No assignment statistics available for this course."
 
-        # Process assignments
-        assignments_stats = []
-        total_submissions = 0
-        total_late = 0
-
-        for assignment in response:
-            title = assignment.get("title", "Untitled")
-            points_possible = assignment.get("points_possible", 0)
-            due_at = assignment.get("due_at")
-
-            # Get statistics
-            min_score = assignment.get("min_score")
-            max_score = assignment.get("max_score")
-            median = assignment.get("median")
-            first_quartile = assignment.get("first_quartile")
-            third_quartile = assignment.get("third_quartile")
-
-            # Get tardiness info
-            tardiness = assignment.get("tardiness_breakdown", {})
-            on_time = tardiness.get("on_time", 0) or 0
-            late = tardiness.get("late", 0) or 0
-            missing = tardiness.get("missing", 0) or 0
-            floating = tardiness.get("floating", 0) or 0
-
-            total_for_assignment = on_time + late
-            total_submissions += total_for_assignment
-            total_late += late
+        # Tardiness counts as columns, so the totals are plain sums
+        on_time, late, missing, floating = _tardiness_columns(response)
+        total_submissions, total_late = _submission_totals(on_time, late)
 
+        assignments_stats = []
+        for assignment, on_time_n, late_n, missing_n, floating_n in zip(
+            response, on_time, late, missing, floating, strict=True
+        ):
             assignments_stats.append(
                 {
-                    "title": title,
-                    "points_possible": points_possible,
-                    "due_at": format_date(due_at),
-                    "min_score": min_score,
-                    "max_score": max_score,
-                    "median": median,
-                    "first_quartile": first_quartile,
-                    "third_quartile": third_quartile,
-                    "on_time": on_time,
-                    "late": late,
-                    "missing": missing,
-                    "floating": floating,
-                    "total_submitted": total_for_assignment,
+                    "title": assignment.get("title", "Untitled"),
+                    "points_possible": assignment.get("points_possible", 0),
+                    "due_at": format_date(assignment.get("due_at")),
+                    "min_score": assignment.get("min_score"),
+                    "max_score": assignment.get("max_score"),
+                    "median": assignment.get("median"),
+                    "first_quartile": assignment.get("first_quartile"),
+                    "third_quartile": assignment.get("third_quartile"),
+                    "on_time": on_time_n,
+                    "late": late_n,
+                    "missing": missing_n,
+                    "floating": floating_n,
+                    "total_submitted": on_time_n + late_n,
                 }
             )
 
-        course_display = await get_course_code(course_id) or course_identifier
         lines = [
             f"Assignment Statistics for {course_display}",
             "=" * 50,
@@ -630,17 +760,16 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         ]
 
         for a in assignments_stats:
-            title_short = (
-                a["title"][:35] + "..." if len(a["title"]) > 35 else a["title"]
-            )
-            lines.append(f"\n📝 {title_short}")
-            lines.append(f"   Points: {a['points_possible']} | Due: {a['due_at']}")
+            lines += [
+                f"\n📝 {_trunc(a['title'], 35)}",
+                f"   Points: {a['points_possible']} | Due: {a['due_at']}",
+            ]
 
             if a["median"] is not None:
-                lines.append("   Score Distribution:")
-                lines.append(
-                    f"     Min: {a['min_score']:.1f} | Q1: {a['first_quartile']:.1f} | Median: {a['median']:.1f} | Q3: {a['third_quartile']:.1f} | Max: {a['max_score']:.1f}"
-                )
+                lines += [
+                    "   Score Distribution:",
+                    f"     Min: {a['min_score']:.1f} | Q1: {a['first_quartile']:.1f} | Median: {a['median']:.1f} | Q3: {a['third_quartile']:.1f} | Max: {a['max_score']:.1f}",
+                ]
             else:
                 lines.append("   Score Distribution: No graded submissions yet")
 
@@ -667,16 +796,11 @@ def register_analytics_tools(mcp: FastMCP) -> None:
                 - student_assignment_outcome_map_csv: Student assignment outcomes
                 - provisioning_csv: Provisioning data export
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         # Validate report type
-        valid_report_types = [
-            "grade_export_csv",
-            "student_assignment_outcome_map_csv",
-            "provisioning_csv",
-        ]
-        if report_type not in valid_report_types:
-            return f"Error: Invalid report type '{report_type}'. Valid options: {', '.join(valid_report_types)}"
+        if report_type not in _VALID_REPORTS:
+            return f"Error: Invalid report type '{report_type}'. Valid options: {_VALID_REPORTS_TEXT}"
 
         # Note: Course reports use a different endpoint structure
         # The /courses/{id}/reports endpoint allows starting reports
@@ -694,7 +818,6 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         status = response.get("status", "unknown")
         progress = response.get("progress", 0)
 
-        course_display = await get_course_code(course_id) or course_identifier
         lines = [
             f"Report Started for {course_display}",
             "=" * 50,
@@ -723,7 +846,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
             report_type: Type of report that was started
             report_id: The report ID returned from start_course_report
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         response = await make_canvas_request(
             "get", f"/courses/{course_id}/reports/{report_type}/{report_id}"
@@ -740,7 +863,6 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         created_at = format_date(response.get("created_at"))
         attachment = response.get("attachment", {})
 
-        course_display = await get_course_code(course_id) or course_identifier
         lines = [
             f"Report Status for {course_display}",
             "=" * 50,
@@ -844,7 +966,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
             include_assignment_stats: Whether to include assignment completion statistics
             include_access_stats: Whether to include course access statistics
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         course_response = await make_canvas_request("get", f"/courses/{course_id}")
         if "error" in course_response:
@@ -872,7 +994,6 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         if isinstance(assignments, dict) and "error" in assignments:
             assignments = []
 
-        course_display = await get_course_code(course_id) or course_identifier
         output = f"Student Analytics for Course {course_display} ({course_name})\n\n"
 
         output += f"Total Students: {len(students)}\n"
@@ -909,7 +1030,7 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         import csv
         from pathlib import Path
 
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         params = {
             "enrollment_type[]": "student",
@@ -930,7 +1051,6 @@ def register_analytics_tools(mcp: FastMCP) -> None:
         maps_dir = Path("local_maps")
         maps_dir.mkdir(exist_ok=True)
 
-        course_display = await get_course_code(course_id) or str(course_identifier)
         safe_course_name = "".join(
             c for c in course_display if c.isalnum() or c in ("-", "_")
         )
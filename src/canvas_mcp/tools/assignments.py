@@ -6,7 +6,12 @@ import markdown as _markdown  # type: ignore[import-untyped]
 from mcp.server.fastmcp import FastMCP
 
 from ..core.anonymization import anonymize_response_data
-from ..core.cache import get_course_code, get_course_id
+from ..core.cache import (
+    clear_ttl_caches,
+    get_course_code,
+    get_course_id,
+    search_course_assignments,
+)
 from ..core.client import fetch_all_paginated_results, make_canvas_request
 from ..core.dates import (
     format_date,
@@ -372,6 +377,7 @@ def register_assignment_tools(mcp: FastMCP) -> None:
 
         if "error" in response:
             return f"Error updating assignment: {response['error']}"
+        clear_ttl_caches(search_course_assignments)
 
         # Build confirmation message
         course_display = await get_course_code(course_id) if course_id else str(course_identifier)
@@ -413,6 +419,7 @@ def register_assignment_tools(mcp: FastMCP) -> None:
 
         if isinstance(response, dict) and "error" in response:
             return f"Error deleting assignment: {response['error']}"
+        clear_ttl_caches(search_course_assignments)
 
         course_display = await get_course_code(course_id) if course_id else str(course_identifier)
         return f"Successfully deleted assignment '{assignment_name}' (ID {assignment_id}) from course {course_display}."
@@ -741,6 +748,7 @@ def register_assignment_tools(mcp: FastMCP) -> None:
 
         if "error" in response:
             return f"Error creating assignment: {response['error']}"
+        clear_ttl_caches(search_course_assignments)
 
         # Format success response
         assignment_id = response.get("id")
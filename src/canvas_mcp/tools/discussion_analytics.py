@@ -1,17 +1,145 @@
 """Discussion analytics MCP tools for Canvas API."""
 
+import asyncio
 import csv
-import io
 import re
+from array import array
+from collections import deque
+from collections.abc import Awaitable, Iterable, Iterator
 from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
-from ..core.cache import get_course_code, get_course_id
-from ..core.client import fetch_all_paginated_results, make_canvas_request
+from ..core.cache import (
+    evict_ttl_cache,
+    get_course_students,
+    get_discussion_entries,
+    resolve_course,
+)
+from ..core.client import CanvasAPIError, make_canvas_request, poll_canvas_progress
+from ..core.csv_output import LineBuffer
+from ..core.grading import build_bulk_grade_form_data
 from ..core.logging import log_warning
 from ..core.validation import validate_params
 
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Export previews keep 200 characters of text; only this much of the raw HTML
+# is scanned, leaving room for markup around those characters
+_PREVIEW_LENGTH = 200
+_PREVIEW_SCAN_LENGTH = 2000
+
+
+def _message_preview(message: str) -> str:
+    """Strip HTML tags from the start of a message and truncate it."""
+    head = message[:_PREVIEW_SCAN_LENGTH]
+    if len(message) > _PREVIEW_SCAN_LENGTH:
+        # Drop a tag cut in half by the slice
+        cut = head.rfind("<")
+        if cut > head.rfind(">"):
+            head = head[:cut]
+    return _HTML_TAG_RE.sub("", head)[:_PREVIEW_LENGTH]
+
+
+def _iter_contributions(
+    entries: Iterable[dict[str, Any]],
+) -> Iterator[tuple[str, str]]:
+    """Yield ``(user_id, "posts" | "replies")`` for each authored entry.
+
+    Walks replies breadth-first to any depth, whether nested under
+    ``replies`` (threaded view) or ``recent_replies`` (entries list).
+    Top-level entries are posts unless they carry a ``parent_id``, as flat
+    ``new_entries`` from the view do; everything nested is a reply.
+    """
+    queue = deque(
+        (entry, "replies" if entry.get("parent_id") else "posts") for entry in entries
+    )
+
+    while queue:
+        entry, kind = queue.popleft()
+        user_id = str(entry.get("user_id", ""))
+        if user_id:
+            yield user_id, kind
+        nested = entry.get("replies") or entry.get("recent_replies") or []
+        queue.extend((reply, "replies") for reply in nested)
+
+
+class _ParticipationCounts:
+    """Post and reply counts per user, kept in parallel int arrays.
+
+    ``index`` maps each user ID to its slot in ``posts`` and ``replies``, so
+    a large roster costs two machine ints per user instead of a dict each.
+    """
+
+    __slots__ = ("index", "posts", "replies")
+
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+        self.posts = array("i")
+        self.replies = array("i")
+
+    def add(self, user_id: str, kind: str) -> None:
+        """Record one post or reply by a user."""
+        idx = self.index.get(user_id)
+        if idx is None:
+            idx = self.index[user_id] = len(self.posts)
+            self.posts.append(0)
+            self.replies.append(0)
+        if kind == "posts":
+            self.posts[idx] += 1
+        else:
+            self.replies[idx] += 1
+
+    def counts(self, user_id: str) -> tuple[int, int]:
+        """Return ``(posts, replies)`` for a user, zero if they never posted."""
+        idx = self.index.get(user_id)
+        if idx is None:
+            return 0, 0
+        return self.posts[idx], self.replies[idx]
+
+    def items(self) -> Iterator[tuple[str, int, int]]:
+        """Yield ``(user_id, posts, replies)`` for every participating user."""
+        for user_id, idx in self.index.items():
+            yield user_id, self.posts[idx], self.replies[idx]
+
+
+def _count_participation(entries: Iterable[dict[str, Any]]) -> _ParticipationCounts:
+    """Count posts and replies per user across a discussion's entries."""
+    participation = _ParticipationCounts()
+    for user_id, kind in _iter_contributions(entries):
+        participation.add(user_id, kind)
+    return participation
+
+
+async def _participation_entries(
+    course_id: str | None, topic_id: str | int, view_response: Any
+) -> list[dict[str, Any]]:
+    """Return every entry of a topic for participation counting.
+
+    Uses the threaded view (plus its ``new_entries``) when it was fetched
+    successfully, since it holds every reply. Otherwise falls back to the
+    paginated entries, whose ``recent_replies`` Canvas truncates.
+
+    Raises:
+        CanvasAPIError: If the fallback entries fetch fails
+    """
+    if isinstance(view_response, dict) and isinstance(view_response.get("view"), list):
+        return [*view_response["view"], *(view_response.get("new_entries") or [])]
+
+    entries = await get_discussion_entries(course_id, topic_id)
+    if isinstance(entries, dict) and "error" in entries:
+        raise CanvasAPIError(entries)
+    return entries if isinstance(entries, list) else []
+
+
+def _view_request(course_id: str | None, topic_id: str | int) -> Awaitable[Any]:
+    """Request a topic's full threaded view, including not-yet-cached entries."""
+    return make_canvas_request(
+        "get",
+        f"/courses/{course_id}/discussion_topics/{topic_id}/view",
+        params={"include_new_entries": 1},
+    )
+
 
 def register_discussion_analytics_tools(mcp: FastMCP) -> None:
     """Register discussion analytics MCP tools."""
@@ -19,7 +147,7 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
     @mcp.tool()
     @validate_params
     async def get_discussion_participation_summary(
-        course_identifier: str | int, topic_id: str | int
+        course_identifier: str | int, topic_id: str | int, force_refresh: bool = False
     ) -> str:
         """Get a participation summary for a discussion topic, showing who posted, replied, and who is silent.
 
@@ -29,152 +157,129 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
         Args:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             topic_id: The Canvas discussion topic ID
+            force_refresh: If True, refetch the course roster, and this topic's
+                entries when the threaded view is unavailable, instead of
+                reusing recently cached ones (default: False)
         """
-        course_id = await get_course_id(course_identifier)
-
-        # Fetch enrolled students
-        students = await fetch_all_paginated_results(
-            f"/courses/{course_id}/users",
-            {"enrollment_type[]": "student", "per_page": 100},
+        course_id, course_display = await resolve_course(course_identifier)
+        if force_refresh:
+            evict_ttl_cache(get_course_students, course_id)
+            evict_ttl_cache(get_discussion_entries, course_id, topic_id)
+
+        # The threaded view carries every entry and reply in one request;
+        # fetch it alongside the roster and topic details
+        fetched = await asyncio.gather(
+            get_course_students(course_id),
+            make_canvas_request(
+                "get",
+                f"/courses/{course_id}/discussion_topics/{topic_id}",
+                conditional=True,
+            ),
+            _view_request(course_id, topic_id),
+            return_exceptions=True,
         )
+        students, topic_response, view_response = fetched
 
+        if isinstance(students, BaseException):
+            return f"Error fetching students: {students}"
         if isinstance(students, dict) and "error" in students:
             return f"Error fetching students: {students['error']}"
 
-        # Fetch discussion entries
-        entries = await fetch_all_paginated_results(
-            f"/courses/{course_id}/discussion_topics/{topic_id}/entries",
-            {"per_page": 100},
-        )
-
-        if isinstance(entries, dict) and "error" in entries:
-            return f"Error fetching discussion entries: {entries['error']}"
-
-        # Fetch topic details for context
-        topic_response = await make_canvas_request(
-            "get", f"/courses/{course_id}/discussion_topics/{topic_id}"
-        )
         topic_title = "Unknown Topic"
-        if not isinstance(topic_response, dict) or "error" not in topic_response:
+        if isinstance(topic_response, dict) and "error" not in topic_response:
             topic_title = topic_response.get("title", "Unknown Topic")
 
-        # Build participation map: user_id -> {posts: int, replies: int}
-        participation: dict[str, dict[str, int]] = {}
-        entries_list = entries if isinstance(entries, list) else []
+        if isinstance(view_response, BaseException):
+            log_warning(
+                "Failed to fetch discussion view for participation", exc=view_response
+            )
 
-        for entry in entries_list:
-            user_id = str(entry.get("user_id", ""))
-            if not user_id:
-                continue
-            if user_id not in participation:
-                participation[user_id] = {"posts": 0, "replies": 0}
-            participation[user_id]["posts"] += 1
-
-            # Count replies to this entry
-            replies = entry.get("recent_replies", [])
-            for reply in replies:
-                reply_user_id = str(reply.get("user_id", ""))
-                if not reply_user_id:
-                    continue
-                if reply_user_id not in participation:
-                    participation[reply_user_id] = {"posts": 0, "replies": 0}
-                participation[reply_user_id]["replies"] += 1
-
-        # Also fetch replies via the view endpoint for more complete data
+        # Count posts and replies per participating user
         try:
-            view_response = await make_canvas_request(
-                "get", f"/courses/{course_id}/discussion_topics/{topic_id}/view"
+            participation = _count_participation(
+                await _participation_entries(course_id, topic_id, view_response)
             )
-            if not isinstance(view_response, dict) or "error" not in view_response:
-                for view_entry in view_response.get("view", []):
-                    for reply in view_entry.get("replies", []):
-                        reply_user_id = str(reply.get("user_id", ""))
-                        if not reply_user_id:
-                            continue
-                        if reply_user_id not in participation:
-                            participation[reply_user_id] = {"posts": 0, "replies": 0}
-                        # Only count if not already counted
-                        if participation[reply_user_id]["replies"] == 0:
-                            participation[reply_user_id]["replies"] += 1
-        except Exception as e:
-            log_warning("Failed to fetch discussion view for participation", exc=e)
-
-        # Categorize students
+        except CanvasAPIError as e:
+            return f"Error fetching discussion entries: {e}"
+
+        # Categorize students: hash-join participants against the roster,
+        # then whatever remains in the roster is silent
         student_list = students if isinstance(students, list) else []
         student_map = {
             str(s.get("id", "")): s.get("name", "Unknown") for s in student_list
         }
+        total_students = len(student_map)
 
         full_participants = []  # Posted AND replied
         posters_only = []  # Posted but no replies
         repliers_only = []  # Replied but no posts
-        silent = []  # No participation at all
-
-        for student_id, student_name in student_map.items():
-            p = participation.get(student_id, {"posts": 0, "replies": 0})
-            has_posts = p["posts"] > 0
-            has_replies = p["replies"] > 0
-
-            if has_posts and has_replies:
-                full_participants.append((student_id, student_name, p))
-            elif has_posts:
-                posters_only.append((student_id, student_name, p))
-            elif has_replies:
-                repliers_only.append((student_id, student_name, p))
+
+        for student_id, posts, replies in participation.items():
+            student_name = student_map.pop(student_id, None)
+            if student_name is None:
+                continue
+
+            entry = (student_id, student_name, posts, replies)
+            if posts and replies:
+                full_participants.append(entry)
+            elif posts:
+                posters_only.append(entry)
             else:
-                silent.append((student_id, student_name))
+                repliers_only.append(entry)
+
+        silent = list(student_map.items())  # No participation at all
 
         # Format output
-        course_display = await get_course_code(course_id) or course_identifier
-        total_students = len(student_map)
         total_participants = total_students - len(silent)
 
-        result = "Discussion Participation Summary\n"
-        result += f"Course: {course_display}\n"
-        result += f"Discussion: {topic_title} (ID: {topic_id})\n\n"
-
-        result += (
-            f"Overview: {total_participants}/{total_students} students participated "
-        )
-        result += (
-            f"({total_participants / total_students * 100:.0f}%)\n"
+        percent = (
+            f"{total_participants / total_students * 100:.0f}%"
             if total_students > 0
-            else "(0%)\n"
+            else "0%"
         )
-        result += f"  Full participation (post + reply): {len(full_participants)}\n"
-        result += f"  Posted only: {len(posters_only)}\n"
-        result += f"  Replied only: {len(repliers_only)}\n"
-        result += f"  Silent (no participation): {len(silent)}\n\n"
+        parts = [
+            "Discussion Participation Summary\n",
+            f"Course: {course_display}\n",
+            f"Discussion: {topic_title} (ID: {topic_id})\n\n",
+            f"Overview: {total_participants}/{total_students} students participated "
+            f"({percent})\n",
+            f"  Full participation (post + reply): {len(full_participants)}\n",
+            f"  Posted only: {len(posters_only)}\n",
+            f"  Replied only: {len(repliers_only)}\n",
+            f"  Silent (no participation): {len(silent)}\n\n",
+        ]
 
         if full_participants:
-            result += "Full Participants:\n"
-            for sid, name, p in full_participants:
-                result += f"  - {name} (ID: {sid}) - {p['posts']} posts, {p['replies']} replies\n"
-            result += "\n"
+            parts.append("Full Participants:\n")
+            parts.extend(
+                f"  - {name} (ID: {sid}) - {posts} posts, {replies} replies\n"
+                for sid, name, posts, replies in full_participants
+            )
+            parts.append("\n")
 
         if posters_only:
-            result += "Posted Only (no replies):\n"
-            for sid, name, p in posters_only:
-                result += f"  - {name} (ID: {sid}) - {p['posts']} posts\n"
-            result += "\n"
+            parts.append("Posted Only (no replies):\n")
+            parts.extend(
+                f"  - {name} (ID: {sid}) - {posts} posts\n"
+                for sid, name, posts, _replies in posters_only
+            )
+            parts.append("\n")
 
         if repliers_only:
-            result += "Replied Only (no original post):\n"
-            for sid, name, p in repliers_only:
-                result += f"  - {name} (ID: {sid}) - {p['replies']} replies\n"
-            result += "\n"
+            parts.append("Replied Only (no original post):\n")
+            parts.extend(
+                f"  - {name} (ID: {sid}) - {replies} replies\n"
+                for sid, name, _posts, replies in repliers_only
+            )
+            parts.append("\n")
 
         if silent:
-            result += "Silent Students (no participation):\n"
-            silent_ids = []
-            for sid, name in silent:
-                result += f"  - {name} (ID: {sid})\n"
-                silent_ids.append(sid)
-            result += (
-                f"\nSilent student IDs (for bulk messaging): {','.join(silent_ids)}\n"
-            )
+            parts.append("Silent Students (no participation):\n")
+            parts.extend(f"  - {name} (ID: {sid})\n" for sid, name in silent)
+            silent_ids = ",".join(sid for sid, _name in silent)
+            parts.append(f"\nSilent student IDs (for bulk messaging): {silent_ids}\n")
 
-        return result
+        return "".join(parts)
 
     @mcp.tool()
     @validate_params
@@ -186,6 +291,8 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
         points_for_reply: float = 3.0,
         max_points: float | None = None,
         dry_run: bool = True,
+        max_concurrent: int = 10,
+        force_refresh: bool = False,
     ) -> str:
         """Auto-grade discussion participation based on post and reply counts.
 
@@ -200,53 +307,54 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
             points_for_reply: Points awarded per reply (default: 3.0)
             max_points: Maximum total points (default: use assignment's points_possible)
             dry_run: If True (default), preview grades without submitting
+            max_concurrent: Maximum individual submissions in flight if the bulk
+                update fails (default: 10)
+            force_refresh: If True, refetch the course roster, and this topic's
+                entries when the threaded view is unavailable, instead of
+                reusing recently cached ones (default: False)
         """
-        course_id = await get_course_id(course_identifier)
-
-        # Get assignment details for max points
-        assignment = await make_canvas_request(
-            "get", f"/courses/{course_id}/assignments/{assignment_id}"
+        course_id, course_display = await resolve_course(course_identifier)
+        if force_refresh:
+            evict_ttl_cache(get_course_students, course_id)
+            evict_ttl_cache(get_discussion_entries, course_id, topic_id)
+
+        # Assignment details, students and the threaded view are independent
+        fetched = await asyncio.gather(
+            make_canvas_request(
+                "get",
+                f"/courses/{course_id}/assignments/{assignment_id}",
+                conditional=True,
+            ),
+            get_course_students(course_id),
+            _view_request(course_id, topic_id),
+            return_exceptions=True,
         )
+        assignment, students, view_response = fetched
+
+        if isinstance(assignment, BaseException):
+            return f"Error fetching assignment: {assignment}"
         if isinstance(assignment, dict) and "error" in assignment:
             return f"Error fetching assignment: {assignment['error']}"
 
         points_possible = max_points or assignment.get("points_possible", 10)
 
-        # Fetch enrolled students
-        students = await fetch_all_paginated_results(
-            f"/courses/{course_id}/users",
-            {"enrollment_type[]": "student", "per_page": 100},
-        )
+        if isinstance(students, BaseException):
+            return f"Error fetching students: {students}"
         if isinstance(students, dict) and "error" in students:
             return f"Error fetching students: {students['error']}"
 
-        # Fetch discussion entries
-        entries = await fetch_all_paginated_results(
-            f"/courses/{course_id}/discussion_topics/{topic_id}/entries",
-            {"per_page": 100},
-        )
-        if isinstance(entries, dict) and "error" in entries:
-            return f"Error fetching entries: {entries['error']}"
-
-        # Build participation counts
-        participation: dict[str, dict[str, int]] = {}
-        entries_list = entries if isinstance(entries, list) else []
+        if isinstance(view_response, BaseException):
+            log_warning(
+                "Failed to fetch discussion view for grading", exc=view_response
+            )
 
-        for entry in entries_list:
-            user_id = str(entry.get("user_id", ""))
-            if not user_id:
-                continue
-            if user_id not in participation:
-                participation[user_id] = {"posts": 0, "replies": 0}
-            participation[user_id]["posts"] += 1
-
-            for reply in entry.get("recent_replies", []):
-                reply_user_id = str(reply.get("user_id", ""))
-                if not reply_user_id:
-                    continue
-                if reply_user_id not in participation:
-                    participation[reply_user_id] = {"posts": 0, "replies": 0}
-                participation[reply_user_id]["replies"] += 1
+        # Count posts and replies per participating user
+        try:
+            participation = _count_participation(
+                await _participation_entries(course_id, topic_id, view_response)
+            )
+        except CanvasAPIError as e:
+            return f"Error fetching entries: {e}"
 
         # Calculate grades
         student_list = students if isinstance(students, list) else []
@@ -255,70 +363,120 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
         for student in student_list:
             student_id = str(student.get("id", ""))
             student_name = student.get("name", "Unknown")
-            p = participation.get(student_id, {"posts": 0, "replies": 0})
+            post_count, reply_count = participation.counts(student_id)
 
-            raw_score = (p["posts"] * points_for_post) + (
-                p["replies"] * points_for_reply
+            raw_score = (post_count * points_for_post) + (
+                reply_count * points_for_reply
             )
             capped_score = min(raw_score, points_possible)
 
             grades[student_id] = {
                 "name": student_name,
-                "posts": p["posts"],
-                "replies": p["replies"],
+                "posts": post_count,
+                "replies": reply_count,
                 "raw_score": raw_score,
                 "final_score": capped_score,
             }
 
         # Format results
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"{'DRY RUN - ' if dry_run else ''}Discussion Participation Grading\n"
-        result += f"Course: {course_display}\n"
-        result += (
-            f"Assignment: {assignment.get('name', 'Unknown')} (ID: {assignment_id})\n"
+        parts = [
+            f"{'DRY RUN - ' if dry_run else ''}Discussion Participation Grading\n",
+            f"Course: {course_display}\n",
+            f"Assignment: {assignment.get('name', 'Unknown')} (ID: {assignment_id})\n",
+            f"Points: {points_for_post}/post, {points_for_reply}/reply, max {points_possible}\n\n",
+            f"{'Name':<30} {'Posts':<6} {'Replies':<8} {'Score':<8}\n",
+            "-" * 55 + "\n",
+        ]
+        parts.extend(
+            f"{g['name']:<30} {g['posts']:<6} {g['replies']:<8} {g['final_score']:<8.1f}\n"
+            for g in sorted(
+                grades.values(), key=lambda g: g["final_score"], reverse=True
+            )
         )
-        result += f"Points: {points_for_post}/post, {points_for_reply}/reply, max {points_possible}\n\n"
-
-        result += f"{'Name':<30} {'Posts':<6} {'Replies':<8} {'Score':<8}\n"
-        result += "-" * 55 + "\n"
-
-        for _sid, g in sorted(
-            grades.items(), key=lambda x: x[1]["final_score"], reverse=True
-        ):
-            result += f"{g['name']:<30} {g['posts']:<6} {g['replies']:<8} {g['final_score']:<8.1f}\n"
 
         if dry_run:
-            result += (
+            parts.append(
                 f"\nDry run complete. Set dry_run=False to submit {len(grades)} grades."
             )
-            return result
+            return "".join(parts)
 
-        # Submit grades
-        successful = 0
-        failed = 0
-        for student_id, g in grades.items():
-            response = await make_canvas_request(
-                "put",
-                f"/courses/{course_id}/assignments/{assignment_id}/submissions/{student_id}",
-                data={
-                    "submission": {"posted_grade": str(g["final_score"])},
-                    "comment": {
-                        "text_comment": f"Discussion participation: {g['posts']} posts, {g['replies']} replies"
-                    },
-                },
+        if not grades:
+            parts.append("\nGrading complete: 0 submitted, 0 failed.")
+            return "".join(parts)
+
+        comments = {
+            sid: f"Discussion participation: {g['posts']} posts, {g['replies']} replies"
+            for sid, g in grades.items()
+        }
+
+        # Submit every grade in one bulk request; Canvas processes it as a
+        # background job that we poll for completion
+        bulk_response = await make_canvas_request(
+            "post",
+            f"/courses/{course_id}/assignments/{assignment_id}/submissions/update_grades",
+            data=build_bulk_grade_form_data(
+                {
+                    sid: {"grade": g["final_score"], "comment": comments[sid]}
+                    for sid, g in grades.items()
+                }
+            ),
+            use_form_data=True,
+        )
+
+        if isinstance(bulk_response, dict) and "error" in bulk_response:
+            bulk_error = bulk_response["error"]
+        else:
+            progress = await poll_canvas_progress(
+                bulk_response.get("url") or bulk_response.get("id")
             )
-            if isinstance(response, dict) and "error" in response:
-                failed += 1
-            else:
-                successful += 1
+            if progress["workflow_state"] == "completed":
+                parts.append(f"\nGrading complete: {len(grades)} submitted, 0 failed.")
+                return "".join(parts)
+            if progress["workflow_state"] != "failed":
+                parts.append(
+                    f"\nBulk grading still in progress for {len(grades)} students "
+                    f"(Progress ID: {progress['progress_id']})."
+                )
+                return "".join(parts)
+            bulk_error = progress["error"]
+
+        # Fall back to per-student submissions, bounded to respect rate limits
+        parts.append(f"\nBulk update failed ({bulk_error}); submitting individually.")
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+        async def submit_grade(student_id: str, g: dict[str, Any]) -> Any:
+            async with semaphore:
+                return await make_canvas_request(
+                    "put",
+                    f"/courses/{course_id}/assignments/{assignment_id}/submissions/{student_id}",
+                    data={
+                        "submission": {"posted_grade": str(g["final_score"])},
+                        "comment": {"text_comment": comments[student_id]},
+                    },
+                )
+
+        responses = await asyncio.gather(
+            *(submit_grade(sid, g) for sid, g in grades.items()),
+            return_exceptions=True,
+        )
+        failed = sum(
+            1
+            for response in responses
+            if isinstance(response, BaseException)
+            or (isinstance(response, dict) and "error" in response)
+        )
+        successful = len(responses) - failed
 
-        result += f"\nGrading complete: {successful} submitted, {failed} failed."
-        return result
+        parts.append(f"\nGrading complete: {successful} submitted, {failed} failed.")
+        return "".join(parts)
 
     @mcp.tool()
     @validate_params
     async def export_discussion_data(
-        course_identifier: str | int, topic_id: str | int, format: str = "csv"
+        course_identifier: str | int,
+        topic_id: str | int,
+        format: str = "csv",
+        force_refresh: bool = False,
     ) -> str:
         """Export discussion data including all entries and replies.
 
@@ -326,29 +484,40 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             topic_id: The Canvas discussion topic ID
             format: Export format - "csv" (default) or "summary"
+            force_refresh: If True, refetch this topic's entries instead of
+                reusing ones fetched in the last minute (default: False)
         """
-        course_id = await get_course_id(course_identifier)
-
-        # Fetch topic details
-        topic = await make_canvas_request(
-            "get", f"/courses/{course_id}/discussion_topics/{topic_id}"
+        course_id, course_display = await resolve_course(course_identifier)
+        if force_refresh:
+            evict_ttl_cache(get_discussion_entries, course_id, topic_id)
+
+        # Fetch topic details and all entries concurrently
+        fetched = await asyncio.gather(
+            make_canvas_request(
+                "get",
+                f"/courses/{course_id}/discussion_topics/{topic_id}",
+                conditional=True,
+            ),
+            get_discussion_entries(course_id, topic_id),
+            return_exceptions=True,
         )
+        topic, entries = fetched
+
         topic_title = "Unknown"
-        if not isinstance(topic, dict) or "error" not in topic:
+        if isinstance(topic, dict) and "error" not in topic:
             topic_title = topic.get("title", "Unknown")
 
-        # Fetch all entries
-        entries = await fetch_all_paginated_results(
-            f"/courses/{course_id}/discussion_topics/{topic_id}/entries",
-            {"per_page": 100},
-        )
+        if isinstance(entries, BaseException):
+            return f"Error fetching entries: {entries}"
         if isinstance(entries, dict) and "error" in entries:
             return f"Error fetching entries: {entries['error']}"
 
         entries_list = entries if isinstance(entries, list) else []
 
         if format == "csv":
-            output = io.StringIO()
+            output = LineBuffer(
+                [f"Discussion Export: '{topic_title}' in {course_display}\n\n"]
+            )
             writer = csv.writer(output)
             writer.writerow(
                 [
@@ -364,7 +533,7 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
 
             for entry in entries_list:
                 msg = entry.get("message", "")
-                msg_clean = re.sub(r"<[^>]+>", "", msg)[:200] if msg else ""
+                msg_clean = _message_preview(msg) if msg else ""
 
                 writer.writerow(
                     [
@@ -380,9 +549,7 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
 
                 for reply in entry.get("recent_replies", []):
                     reply_msg = reply.get("message", "")
-                    reply_clean = (
-                        re.sub(r"<[^>]+>", "", reply_msg)[:200] if reply_msg else ""
-                    )
+                    reply_clean = _message_preview(reply_msg) if reply_msg else ""
 
                     writer.writerow(
                         [
@@ -396,22 +563,22 @@ def register_discussion_analytics_tools(mcp: FastMCP) -> None:
                         ]
                     )
 
-            course_display = await get_course_code(course_id) or course_identifier
-            return f"Discussion Export: '{topic_title}' in {course_display}\n\n{output.getvalue()}"
+            return "".join(output)
 
         else:
             # Summary format
             total_entries = len(entries_list)
-            total_replies = sum(len(e.get("recent_replies", [])) for e in entries_list)
-            unique_users = set()
+            total_replies = 0
+            unique_users: set[str] = set()
             for e in entries_list:
-                if e.get("user_id"):
-                    unique_users.add(str(e["user_id"]))
-                for r in e.get("recent_replies", []):
-                    if r.get("user_id"):
-                        unique_users.add(str(r["user_id"]))
+                if uid := e.get("user_id"):
+                    unique_users.add(str(uid))
+                replies = e.get("recent_replies", [])
+                total_replies += len(replies)
+                for r in replies:
+                    if reply_uid := r.get("user_id"):
+                        unique_users.add(str(reply_uid))
 
-            course_display = await get_course_code(course_id) or course_identifier
             result = f"Discussion Summary: '{topic_title}' in {course_display}\n\n"
             result += f"Total posts: {total_entries}\n"
             result += f"Total replies: {total_replies}\n"
@@ -7,7 +7,13 @@ from typing import Any
 from mcp.server.fastmcp import FastMCP
 
 from ..core.anonymization import anonymize_response_data
-from ..core.cache import get_course_code, get_course_id
+from ..core.cache import (
+    clear_ttl_caches,
+    get_course_code,
+    get_course_id,
+    get_discussion_entries,
+    get_discussion_topics,
+)
 from ..core.client import fetch_all_paginated_results, make_canvas_request
 from ..core.dates import format_date, truncate_text
 from ..core.logging import log_error, log_warning
@@ -731,6 +737,8 @@ def register_discussion_tools(mcp: FastMCP) -> None:
         if "error" in response:
             return f"Error posting discussion entry: {response['error']}"
 
+        clear_ttl_caches(get_discussion_entries)
+
         # Get context information for confirmation
         topic_response = await make_canvas_request(
             "get", f"/courses/{course_id}/discussion_topics/{topic_id}"
@@ -790,6 +798,8 @@ def register_discussion_tools(mcp: FastMCP) -> None:
         if "error" in response:
             return f"Error posting reply: {response['error']}"
 
+        clear_ttl_caches(get_discussion_entries)
+
         reply_id = response.get("id")
         course_display = await get_course_code(course_id) or course_identifier
 
@@ -845,6 +855,7 @@ def register_discussion_tools(mcp: FastMCP) -> None:
 
         if "error" in response:
             return f"Error creating discussion topic: {response['error']}"
+        clear_ttl_caches(get_discussion_topics)
 
         topic_id = response.get("id")
         topic_title = response.get("title", title)
@@ -939,6 +950,7 @@ def register_discussion_tools(mcp: FastMCP) -> None:
 
         if "error" in response:
             return f"Error creating announcement: {response['error']}"
+        clear_ttl_caches(get_discussion_topics)
 
         announcement_id = response.get("id")
         announcement_title = response.get("title", title)
@@ -1119,6 +1131,9 @@ def register_discussion_tools(mcp: FastMCP) -> None:
             except Exception as e:
                 failed.append({**target, "error": str(e)})
 
+        if deleted:
+            clear_ttl_caches(get_discussion_topics)
+
         result += f"Result: {len(deleted)} deleted, {len(failed)} failed\n\n"
 
         if deleted:
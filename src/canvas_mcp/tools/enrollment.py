@@ -6,7 +6,12 @@ from typing import Any
 from mcp.server.fastmcp import FastMCP
 
 from ..core.anonymization import anonymize_response_data
-from ..core.cache import get_course_code, get_course_id
+from ..core.cache import (
+    clear_ttl_caches,
+    get_course_code,
+    get_course_id,
+    get_course_students,
+)
 from ..core.client import (
     fetch_all_paginated_results,
     make_canvas_request,
@@ -134,6 +139,8 @@ def register_enrollment_tools(mcp: FastMCP) -> None:
         if isinstance(response, dict) and "error" in response:
             return f"Error enrolling user: {response['error']}"
 
+        clear_ttl_caches(get_course_students)
+
         enrollment_id = response.get("id")
         role = response.get("type", enrollment_type)
         state = response.get("enrollment_state", enrollment_state)
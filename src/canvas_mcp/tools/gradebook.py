@@ -1,15 +1,26 @@
 """Gradebook management MCP tools for Canvas API."""
 
+import asyncio
 import csv
-import io
+from typing import Any
 
 from mcp.server.fastmcp import FastMCP
 
-from ..core.cache import get_course_code, get_course_id
-from ..core.client import fetch_all_paginated_results, make_canvas_request
+from ..core.cache import get_course_students, resolve_course
+from ..core.client import (
+    CanvasAPIError,
+    fetch_all_paginated_results,
+    iter_paginated_results,
+    make_canvas_request,
+)
+from ..core.csv_output import LineBuffer
 from ..core.dates import format_date
 from ..core.validation import validate_params
 
+# Canvas repeats every assignment_ids[] value in each page's next link, so
+# ask for submissions in batches that keep those URLs to a safe length
+_SUBMISSION_BATCH_SIZE = 50
+
 
 def register_gradebook_tools(mcp: FastMCP) -> None:
     """Register gradebook management MCP tools."""
@@ -25,20 +36,20 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             format: Export format - "csv" (default) or "summary"
         """
-        course_id = await get_course_id(course_identifier)
-
-        # Fetch students
-        students = await fetch_all_paginated_results(
-            f"/courses/{course_id}/users",
-            {"enrollment_type[]": "student", "per_page": 100},
+        course_id, course_display = await resolve_course(course_identifier)
+
+        # Students (shared with other tools through the roster cache) and
+        # assignments are independent, so fetch them together; submissions
+        # depend on the published assignment IDs and follow
+        fetched = await asyncio.gather(
+            get_course_students(course_id),
+            fetch_all_paginated_results(
+                f"/courses/{course_id}/assignments", {"per_page": 100}
+            ),
         )
+        students, assignments = fetched
         if isinstance(students, dict) and "error" in students:
             return f"Error fetching students: {students['error']}"
-
-        # Fetch assignments
-        assignments = await fetch_all_paginated_results(
-            f"/courses/{course_id}/assignments", {"per_page": 100}
-        )
         if isinstance(assignments, dict) and "error" in assignments:
             return f"Error fetching assignments: {assignments['error']}"
 
@@ -52,73 +63,91 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
         if not student_list:
             return "No students found."
 
-        # Fetch submissions for each assignment
-        grade_data: dict[str, dict[str, str]] = (
-            {}
-        )  # student_id -> {assignment_id -> grade}
-        for student in student_list:
-            sid = str(student.get("id", ""))
-            grade_data[sid] = {}
-
-        for assignment in assignment_list:
-            aid = str(assignment.get("id", ""))
-            submissions = await fetch_all_paginated_results(
-                f"/courses/{course_id}/assignments/{aid}/submissions", {"per_page": 100}
+        aid_list = [str(a.get("id", "")) for a in assignment_list]
+
+        # Fold every published assignment's submissions in as each page
+        # arrives, one bulk request per batch of assignments
+        grade_data: dict[str, dict[str, float | None]] = {
+            str(s.get("id", "")): {} for s in student_list
+        }  # student_id -> {assignment_id -> score}
+
+        async def fold_submissions(batch: list[str]) -> None:
+            params: dict[str, Any] = {
+                "student_ids[]": "all",
+                "assignment_ids[]": batch,
+                "per_page": 100,
+            }
+            async for sub in iter_paginated_results(
+                f"/courses/{course_id}/students/submissions", params
+            ):
+                student_grades = grade_data.get(str(sub.get("user_id", "")))
+                if student_grades is not None:
+                    score = sub.get("score")
+                    student_grades[str(sub.get("assignment_id", ""))] = (
+                        score if isinstance(score, int | float) else None
+                    )
+
+        try:
+            await asyncio.gather(
+                *(
+                    fold_submissions(aid_list[i : i + _SUBMISSION_BATCH_SIZE])
+                    for i in range(0, len(aid_list), _SUBMISSION_BATCH_SIZE)
+                )
             )
-            if isinstance(submissions, list):
-                for sub in submissions:
-                    sid = str(sub.get("user_id", ""))
-                    if sid in grade_data:
-                        score = sub.get("score")
-                        grade_data[sid][aid] = str(score) if score is not None else ""
-
-        course_display = await get_course_code(course_id) or course_identifier
+        except CanvasAPIError as e:
+            return f"Error fetching submissions: {e}"
 
         if format == "csv":
-            output = io.StringIO()
+            output = LineBuffer([f"Gradebook Export for {course_display}:\n\n"])
             writer = csv.writer(output)
 
             # Header row
-            header = ["Student ID", "Student Name"]
-            for a in assignment_list:
-                header.append(
-                    f"{a.get('name', 'Unknown')} ({a.get('points_possible', 0)} pts)"
-                )
-            header.append("Total")
-            writer.writerow(header)
+            writer.writerow(
+                [
+                    "Student ID",
+                    "Student Name",
+                    *(
+                        f"{a.get('name', 'Unknown')} ({a.get('points_possible', 0)} pts)"
+                        for a in assignment_list
+                    ),
+                    "Total",
+                ]
+            )
 
             # Data rows
             for student in student_list:
                 sid = str(student.get("id", ""))
                 row = [sid, student.get("name", "Unknown")]
+                student_grades = grade_data.get(sid, {})
                 total = 0.0
-                for a in assignment_list:
-                    aid = str(a.get("id", ""))
-                    score_str = grade_data.get(sid, {}).get(aid, "")
-                    row.append(score_str)
-                    if score_str:
-                        try:
-                            total += float(score_str)
-                        except ValueError:
-                            pass
+                for aid in aid_list:
+                    score = student_grades.get(aid)
+                    if score is None:
+                        row.append("")
+                    else:
+                        row.append(str(score))
+                        total += score
                 row.append(str(total))
                 writer.writerow(row)
 
-            return f"Gradebook Export for {course_display}:\n\n{output.getvalue()}"
+            return "".join(output)
 
         else:
             # Summary format
             total_points = sum(a.get("points_possible", 0) for a in assignment_list)
-            result = f"Gradebook Summary for {course_display}:\n\n"
-            result += f"Students: {len(student_list)}\n"
-            result += f"Published Assignments: {len(assignment_list)}\n"
-            result += f"Total Points Available: {total_points}\n\n"
-
-            result += "Assignments:\n"
-            for a in assignment_list:
-                result += f"  - {a.get('name', 'Unknown')} | {a.get('points_possible', 0)} pts | Due: {format_date(a.get('due_at'))}\n"
+            parts = [
+                f"Gradebook Summary for {course_display}:\n\n",
+                f"Students: {len(student_list)}\n",
+                f"Published Assignments: {len(assignment_list)}\n",
+                f"Total Points Available: {total_points}\n\n",
+                "Assignments:\n",
+            ]
+            parts.extend(
+                f"  - {a.get('name', 'Unknown')} | {a.get('points_possible', 0)} pts | Due: {format_date(a.get('due_at'))}\n"
+                for a in assignment_list
+            )
 
-            return result
+            return "".join(parts)
 
     @mcp.tool()
     @validate_params
@@ -128,7 +157,7 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
         Args:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         groups = await fetch_all_paginated_results(
             f"/courses/{course_id}/assignment_groups", {"per_page": 100}
@@ -140,8 +169,7 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
         if not groups or not isinstance(groups, list):
             return f"No assignment groups found for course {course_identifier}."
 
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"Assignment Groups for {course_display}:\n\n"
+        parts = [f"Assignment Groups for {course_display}:\n\n"]
 
         for g in groups:
             gid = g.get("id")
@@ -150,23 +178,23 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
             position = g.get("position", 0)
             rules = g.get("rules", {})
 
-            result += f"ID: {gid} | {name}\n"
-            result += f"  Weight: {weight}% | Position: {position}\n"
+            parts.append(f"ID: {gid} | {name}\n")
+            parts.append(f"  Weight: {weight}% | Position: {position}\n")
 
             if rules:
                 drop_lowest = rules.get("drop_lowest", 0)
                 drop_highest = rules.get("drop_highest", 0)
                 never_drop = rules.get("never_drop", [])
                 if drop_lowest:
-                    result += f"  Drop Lowest: {drop_lowest}\n"
+                    parts.append(f"  Drop Lowest: {drop_lowest}\n")
                 if drop_highest:
-                    result += f"  Drop Highest: {drop_highest}\n"
+                    parts.append(f"  Drop Highest: {drop_highest}\n")
                 if never_drop:
-                    result += f"  Never Drop: {len(never_drop)} assignments\n"
+                    parts.append(f"  Never Drop: {len(never_drop)} assignments\n")
 
-            result += "\n"
+            parts.append("\n")
 
-        return result
+        return "".join(parts)
 
     @mcp.tool()
     @validate_params
@@ -188,7 +216,7 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
             drop_lowest: Number of lowest scores to drop
             drop_highest: Number of highest scores to drop
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         data: dict = {"name": name, "group_weight": weight}
 
@@ -210,7 +238,6 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
         if isinstance(response, dict) and "error" in response:
             return f"Error creating assignment group: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
         new_id = response.get("id")
         return (
             f"Assignment group created in course {course_display}:\n\n"
@@ -241,7 +268,7 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
             drop_lowest: New number of lowest scores to drop
             drop_highest: New number of highest scores to drop
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         data: dict = {}
         if name is not None:
@@ -269,7 +296,6 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
         if isinstance(response, dict) and "error" in response:
             return f"Error updating assignment group: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
         return f"Assignment group '{response.get('name', 'Unknown')}' (ID: {group_id}) updated in course {course_display}."
 
     @mcp.tool()
@@ -296,7 +322,7 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
             missing_submission_deduction_enabled: Enable automatic grade for missing submissions
             missing_submission_deduction: Percentage deducted for missing submissions (default: 100.0)
         """
-        course_id = await get_course_id(course_identifier)
+        course_id, course_display = await resolve_course(course_identifier)
 
         policy: dict = {
             "late_submission_deduction_enabled": late_submission_deduction_enabled,
@@ -311,18 +337,12 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
         policy[min_pct_key] = late_submission_minimum_percent_enabled
         data = {"late_policy": policy}
 
-        # Try to get existing policy first (PATCH if exists, POST if not)
-        existing = await make_canvas_request("get", f"/courses/{course_id}/late_policy")
-
-        if (
-            isinstance(existing, dict)
-            and "error" not in existing
-            and existing.get("late_policy")
-        ):
-            response = await make_canvas_request(
-                "put", f"/courses/{course_id}/late_policy", data=data
-            )
-        else:
+        # Update the existing policy; a course without one answers 404, so
+        # create it instead
+        response = await make_canvas_request(
+            "put", f"/courses/{course_id}/late_policy", data=data
+        )
+        if isinstance(response, dict) and response.get("status_code") == 404:
             response = await make_canvas_request(
                 "post", f"/courses/{course_id}/late_policy", data=data
             )
@@ -330,20 +350,25 @@ def register_gradebook_tools(mcp: FastMCP) -> None:
         if isinstance(response, dict) and "error" in response:
             return f"Error configuring late policy: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"Late policy configured for course {course_display}:\n\n"
+        parts = [f"Late policy configured for course {course_display}:\n\n"]
 
         if late_submission_deduction_enabled:
-            result += f"Late deduction: {late_submission_deduction}% per {late_submission_interval}\n"
+            parts.append(
+                f"Late deduction: {late_submission_deduction}% per {late_submission_interval}\n"
+            )
         else:
-            result += "Late deduction: Disabled\n"
+            parts.append("Late deduction: Disabled\n")
 
         if late_submission_minimum_percent_enabled:
-            result += f"Minimum grade for late: {late_submission_minimum_percent}%\n"
+            parts.append(
+                f"Minimum grade for late: {late_submission_minimum_percent}%\n"
+            )
 
         if missing_submission_deduction_enabled:
-            result += f"Missing submission deduction: {missing_submission_deduction}%\n"
+            parts.append(
+                f"Missing submission deduction: {missing_submission_deduction}%\n"
+            )
         else:
-            result += "Missing submission auto-grade: Disabled\n"
+            parts.append("Missing submission auto-grade: Disabled\n")
 
-        return result
+        return "".join(parts)
@@ -1,8 +1,26 @@
 """Message templates for Canvas conversations."""
 
+from functools import lru_cache
+from string import Formatter
 from typing import Any
 
 
+@lru_cache(maxsize=128)
+def _template_variables(content: str) -> frozenset[str]:
+    """Return the ``{variable}`` names a template string formats in.
+
+    Parsed once per distinct string, so repeat listings of a template skip
+    rescanning it.
+    """
+    names = set()
+    for _literal, field_name, _spec, _conversion in Formatter().parse(content):
+        if field_name:
+            name = field_name.partition(".")[0].partition("[")[0]
+            if name and not name.isdigit():
+                names.add(name)
+    return frozenset(names)
+
+
 class MessageTemplates:
     """Manages message templates for Canvas conversations."""
 
@@ -176,6 +194,15 @@ Note: A late penalty may have been applied per the course late policy.""",
         },
     }
 
+    # Template groups by category name, built once for lookups and listings
+    CATEGORIES = {
+        "peer_review": PEER_REVIEW_TEMPLATES,
+        "assignment": ASSIGNMENT_TEMPLATES,
+        "discussion": DISCUSSION_TEMPLATES,
+        "grade": GRADE_TEMPLATES,
+        "grading_feedback": GRADING_FEEDBACK_TEMPLATES,
+    }
+
     @classmethod
     def compose_grading_feedback(
         cls,
@@ -261,15 +288,7 @@ Note: A late penalty may have been applied per the course late policy.""",
         Returns:
             Template dict with 'subject' and 'body' keys, or None if not found
         """
-        category_map = {
-            "peer_review": cls.PEER_REVIEW_TEMPLATES,
-            "assignment": cls.ASSIGNMENT_TEMPLATES,
-            "discussion": cls.DISCUSSION_TEMPLATES,
-            "grade": cls.GRADE_TEMPLATES,
-            "grading_feedback": cls.GRADING_FEEDBACK_TEMPLATES,
-        }
-
-        category_templates = category_map.get(category)
+        category_templates = cls.CATEGORIES.get(category)
         if not category_templates:
             return None
 
@@ -329,11 +348,7 @@ Note: A late penalty may have been applied per the course late policy.""",
             Dict mapping category names to lists of available template names
         """
         return {
-            "peer_review": list(cls.PEER_REVIEW_TEMPLATES.keys()),
-            "assignment": list(cls.ASSIGNMENT_TEMPLATES.keys()),
-            "discussion": list(cls.DISCUSSION_TEMPLATES.keys()),
-            "grade": list(cls.GRADE_TEMPLATES.keys()),
-            "grading_feedback": list(cls.GRADING_FEEDBACK_TEMPLATES.keys()),
+            category: list(templates) for category, templates in cls.CATEGORIES.items()
         }
 
     @classmethod
@@ -352,16 +367,23 @@ Note: A late penalty may have been applied per the course late policy.""",
         if not template:
             return []
 
-        import re
-
         # Extract variables from both subject and body
-        variables = set()
-        for content in [template["subject"], template["body"]]:
-            # Find all {variable_name} patterns
-            matches = re.findall(r"\{([^}]+)\}", content)
-            variables.update(matches)
+        return sorted(
+            _template_variables(template["subject"])
+            | _template_variables(template["body"])
+        )
 
-        return sorted(variables)
+
+# Placeholder values for template variables the caller does not name
+_DEFAULT_VARIABLES: dict[str, Any] = {
+    "assignment_url": "",
+    "discussion_url": "",
+    "deadline": "",
+    "total_assigned": "2",
+    "completed_count": "0",
+    "remaining_count": "2",
+    "assignment_description": "",
+}
 
 
 def create_default_variables(
@@ -384,21 +406,12 @@ def create_default_variables(
     Returns:
         Dict of template variables
     """
-    variables = {
+    return {
+        **_DEFAULT_VARIABLES,
         "student_name": student_name,
         "assignment_name": assignment_name,
         "instructor_name": instructor_name,
         "course_name": course_name,
-        "assignment_url": "",
-        "discussion_url": "",
-        "deadline": "",
-        "total_assigned": "2",
-        "completed_count": "0",
-        "remaining_count": "2",
-        "assignment_description": "",
+        # Override with any provided kwargs
+        **kwargs,
     }
-
-    # Override with any provided kwargs
-    variables.update(kwargs)
-
-    return variables
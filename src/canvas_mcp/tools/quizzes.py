@@ -1,14 +1,107 @@
 """Quiz management MCP tools for Canvas API (Classic Quizzes)."""
 
+import asyncio
 import json
+import re
+from collections.abc import Awaitable
 
 from mcp.server.fastmcp import FastMCP
 
-from ..core.cache import get_course_code, get_course_id
-from ..core.client import fetch_all_paginated_results, make_canvas_request
+from ..core.cache import (
+    clear_ttl_caches,
+    get_course_id,
+    get_quiz,
+    resolve_course,
+    search_course_assignments,
+)
+from ..core.client import (
+    CanvasAPIError,
+    iter_paginated_results,
+    make_canvas_request,
+)
 from ..core.dates import format_date
 from ..core.validation import validate_params
 
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Truncated previews scan this many characters of raw HTML per character
+# kept, leaving room for the markup around them
+_STRIP_SCAN_FACTOR = 10
+
+# Canvas caps page size at 100 for quiz endpoints (larger values are clamped),
+# and every extra page is another round trip, so always ask for the maximum
+_MAX_PER_PAGE = 100
+
+# Request bodies for unpublishing and publishing, indexed by the new state;
+# make_canvas_request only serializes them
+_PUBLISH_BODIES = ({"quiz": {"published": False}}, {"quiz": {"published": True}})
+
+
+def _strip_html(text: str) -> str:
+    """Remove HTML tags and surrounding whitespace from Canvas rich text."""
+    # No tag can start after the last ">", so leave that tail unscanned;
+    # otherwise every stray "<" in it would rescan to the end of the text
+    end = text.rfind(">") + 1
+    return (_HTML_TAG_RE.sub("", text[:end]) + text[end:]).strip()
+
+
+def _strip_truncate(text: str, limit: int) -> str:
+    """Strip HTML from the start of ``text`` and cut it to ``limit`` characters.
+
+    Only the first ``limit * _STRIP_SCAN_FACTOR`` characters of markup are
+    scanned, so long descriptions are not stripped in full just to be cut.
+    """
+    head = text[: limit * _STRIP_SCAN_FACTOR]
+    scan_cut = len(text) > len(head)
+    if scan_cut:
+        # Drop a tag cut in half by the slice
+        tag_start = head.rfind("<")
+        if tag_start > head.rfind(">"):
+            head = head[:tag_start]
+    clean = _strip_html(head)
+    if scan_cut or len(clean) > limit:
+        return clean[:limit] + "..."
+    return clean
+
+
+async def _with_course_display[T](
+    course_identifier: str | int, request: Awaitable[T]
+) -> tuple[str, T]:
+    """Await ``request`` while the course's display code is looked up.
+
+    Callers resolve the course ID first, so on a cold cache only the code
+    lookup is left, and it overlaps the Canvas request instead of adding a
+    round trip before it.
+    """
+    (_, course_display), result = await asyncio.gather(
+        resolve_course(course_identifier), request
+    )
+    return course_display, result
+
+
+async def _set_published(
+    course_identifier: str | int, quiz_id: str | int, published: bool
+) -> str:
+    """Publish or unpublish a quiz and report the outcome."""
+    course_id = await get_course_id(course_identifier)
+
+    course_display, response = await _with_course_display(
+        course_identifier,
+        make_canvas_request(
+            "put",
+            f"/courses/{course_id}/quizzes/{quiz_id}",
+            data=_PUBLISH_BODIES[published],
+        ),
+    )
+
+    action = "publish" if published else "unpublish"
+    if isinstance(response, dict) and "error" in response:
+        return f"Error {action}ing quiz: {response['error']}"
+
+    clear_ttl_caches(get_quiz, search_course_assignments)
+
+    return f"Quiz '{response.get('title', 'Unknown')}' (ID: {quiz_id}) {action}ed in course {course_display}."
+
 
 def register_quiz_tools(mcp: FastMCP) -> None:
     """Register quiz management MCP tools."""
@@ -28,41 +121,44 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        params: dict = {"per_page": 100}
+        params: dict = {"per_page": _MAX_PER_PAGE}
         if search_term:
             params["search_term"] = search_term
 
-        quizzes = await fetch_all_paginated_results(
-            f"/courses/{course_id}/quizzes", params
-        )
+        async def format_quizzes() -> list[str]:
+            rows = []
+            async for q in iter_paginated_results(
+                f"/courses/{course_id}/quizzes", params
+            ):
+                quiz_id = q.get("id")
+                title = q.get("title", "Untitled")
+                quiz_type = q.get("quiz_type", "assignment")
+                points = q.get("points_possible", "N/A")
+                published = "Published" if q.get("published") else "Unpublished"
+                due_at = format_date(q.get("due_at"))
+                time_limit = q.get("time_limit")
+                question_count = q.get("question_count", 0)
+
+                limit = f" | Time limit: {time_limit} min" if time_limit else ""
+                rows.append(
+                    f"ID: {quiz_id} | {title}\n"
+                    f"  Type: {quiz_type} | Points: {points} | Questions: {question_count}\n"
+                    f"  Due: {due_at} | Status: {published}{limit}\n\n"
+                )
+            return rows
 
-        if isinstance(quizzes, dict) and "error" in quizzes:
-            return f"Error fetching quizzes: {quizzes['error']}"
+        # Format each page as it arrives
+        try:
+            course_display, rows = await _with_course_display(
+                course_identifier, format_quizzes()
+            )
+        except CanvasAPIError as e:
+            return f"Error fetching quizzes: {e}"
 
-        if not quizzes or not isinstance(quizzes, list):
+        if not rows:
             return f"No quizzes found for course {course_identifier}."
 
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"Quizzes for Course {course_display}:\n\n"
-
-        for q in quizzes:
-            quiz_id = q.get("id")
-            title = q.get("title", "Untitled")
-            quiz_type = q.get("quiz_type", "assignment")
-            points = q.get("points_possible", "N/A")
-            published = "Published" if q.get("published") else "Unpublished"
-            due_at = format_date(q.get("due_at"))
-            time_limit = q.get("time_limit")
-            question_count = q.get("question_count", 0)
-
-            result += f"ID: {quiz_id} | {title}\n"
-            result += f"  Type: {quiz_type} | Points: {points} | Questions: {question_count}\n"
-            result += f"  Due: {due_at} | Status: {published}"
-            if time_limit:
-                result += f" | Time limit: {time_limit} min"
-            result += "\n\n"
-
-        return result
+        return "".join([f"Quizzes for Course {course_display}:\n\n", *rows])
 
     @mcp.tool()
     @validate_params
@@ -75,47 +171,42 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        response = await make_canvas_request(
-            "get", f"/courses/{course_id}/quizzes/{quiz_id}"
+        course_display, response = await _with_course_display(
+            course_identifier, get_quiz(course_id, quiz_id)
         )
 
         if isinstance(response, dict) and "error" in response:
             return f"Error fetching quiz details: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
-
-        result = f"Quiz Details for Course {course_display}:\n\n"
-        result += f"Title: {response.get('title', 'Untitled')}\n"
-        result += f"ID: {quiz_id}\n"
-        result += f"Type: {response.get('quiz_type', 'N/A')}\n"
-        result += f"Points Possible: {response.get('points_possible', 'N/A')}\n"
-        result += f"Question Count: {response.get('question_count', 0)}\n"
-        result += f"Published: {'Yes' if response.get('published') else 'No'}\n"
-        result += f"Due: {format_date(response.get('due_at'))}\n"
-        result += f"Unlock At: {format_date(response.get('unlock_at'))}\n"
-        result += f"Lock At: {format_date(response.get('lock_at'))}\n"
+        parts = [
+            f"Quiz Details for Course {course_display}:\n\n",
+            f"Title: {response.get('title', 'Untitled')}\n",
+            f"ID: {quiz_id}\n",
+            f"Type: {response.get('quiz_type', 'N/A')}\n",
+            f"Points Possible: {response.get('points_possible', 'N/A')}\n",
+            f"Question Count: {response.get('question_count', 0)}\n",
+            f"Published: {'Yes' if response.get('published') else 'No'}\n",
+            f"Due: {format_date(response.get('due_at'))}\n",
+            f"Unlock At: {format_date(response.get('unlock_at'))}\n",
+            f"Lock At: {format_date(response.get('lock_at'))}\n",
+        ]
 
         time_limit = response.get("time_limit")
         if time_limit:
-            result += f"Time Limit: {time_limit} minutes\n"
+            parts.append(f"Time Limit: {time_limit} minutes\n")
 
-        result += f"Allowed Attempts: {response.get('allowed_attempts', 1)}\n"
-        result += (
+        parts.append(
+            f"Allowed Attempts: {response.get('allowed_attempts', 1)}\n"
             f"Shuffle Answers: {'Yes' if response.get('shuffle_answers') else 'No'}\n"
+            f"Show Correct Answers: {'Yes' if response.get('show_correct_answers') else 'No'}\n"
+            f"One Question at a Time: {'Yes' if response.get('one_question_at_a_time') else 'No'}\n"
         )
-        result += f"Show Correct Answers: {'Yes' if response.get('show_correct_answers') else 'No'}\n"
-        result += f"One Question at a Time: {'Yes' if response.get('one_question_at_a_time') else 'No'}\n"
 
         description = response.get("description", "")
         if description:
-            import re
+            parts.append(f"\nDescription:\n{_strip_truncate(description, 500)}\n")
 
-            desc_clean = re.sub(r"<[^>]+>", "", description).strip()
-            if len(desc_clean) > 500:
-                desc_clean = desc_clean[:500] + "..."
-            result += f"\nDescription:\n{desc_clean}\n"
-
-        return result
+        return "".join(parts)
 
     @mcp.tool()
     @validate_params
@@ -180,14 +271,16 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         if points_possible is not None:
             data["quiz"]["points_possible"] = points_possible
 
-        response = await make_canvas_request(
-            "post", f"/courses/{course_id}/quizzes", data=data
+        course_display, response = await _with_course_display(
+            course_identifier,
+            make_canvas_request("post", f"/courses/{course_id}/quizzes", data=data),
         )
 
         if isinstance(response, dict) and "error" in response:
             return f"Error creating quiz: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
+        clear_ttl_caches(search_course_assignments)
+
         new_id = response.get("id")
         result = f"Quiz created successfully in course {course_display}:\n\n"
         result += f"ID: {new_id}\n"
@@ -237,45 +330,40 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        quiz_data: dict = {}
-        if title is not None:
-            quiz_data["title"] = title
-        if description is not None:
-            quiz_data["description"] = description
-        if quiz_type is not None:
-            quiz_data["quiz_type"] = quiz_type
-        if due_at is not None:
-            quiz_data["due_at"] = due_at
-        if unlock_at is not None:
-            quiz_data["unlock_at"] = unlock_at
-        if lock_at is not None:
-            quiz_data["lock_at"] = lock_at
-        if time_limit is not None:
-            quiz_data["time_limit"] = time_limit
-        if allowed_attempts is not None:
-            quiz_data["allowed_attempts"] = allowed_attempts
-        if points_possible is not None:
-            quiz_data["points_possible"] = points_possible
-        if shuffle_answers is not None:
-            quiz_data["shuffle_answers"] = shuffle_answers
-        if show_correct_answers is not None:
-            quiz_data["show_correct_answers"] = show_correct_answers
-        if one_question_at_a_time is not None:
-            quiz_data["one_question_at_a_time"] = one_question_at_a_time
-        if published is not None:
-            quiz_data["published"] = published
+        fields = (
+            ("title", title),
+            ("description", description),
+            ("quiz_type", quiz_type),
+            ("due_at", due_at),
+            ("unlock_at", unlock_at),
+            ("lock_at", lock_at),
+            ("time_limit", time_limit),
+            ("allowed_attempts", allowed_attempts),
+            ("points_possible", points_possible),
+            ("shuffle_answers", shuffle_answers),
+            ("show_correct_answers", show_correct_answers),
+            ("one_question_at_a_time", one_question_at_a_time),
+            ("published", published),
+        )
+        quiz_data = {key: value for key, value in fields if value is not None}
 
         if not quiz_data:
             return "No update parameters provided."
 
-        response = await make_canvas_request(
-            "put", f"/courses/{course_id}/quizzes/{quiz_id}", data={"quiz": quiz_data}
+        course_display, response = await _with_course_display(
+            course_identifier,
+            make_canvas_request(
+                "put",
+                f"/courses/{course_id}/quizzes/{quiz_id}",
+                data={"quiz": quiz_data},
+            ),
         )
 
         if isinstance(response, dict) and "error" in response:
             return f"Error updating quiz: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
+        clear_ttl_caches(get_quiz, search_course_assignments)
+
         return f"Quiz '{response.get('title', 'Unknown')}' (ID: {quiz_id}) updated successfully in course {course_display}."
 
     @mcp.tool()
@@ -289,22 +377,33 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        # Fetch details first for confirmation
-        quiz = await make_canvas_request(
-            "get", f"/courses/{course_id}/quizzes/{quiz_id}"
-        )
-        quiz_title = "Unknown"
-        if isinstance(quiz, dict) and "error" not in quiz:
-            quiz_title = quiz.get("title", "Unknown")
-
-        response = await make_canvas_request(
-            "delete", f"/courses/{course_id}/quizzes/{quiz_id}"
+        # The title is only for the confirmation, so look it up alongside the
+        # delete (a recent read serves it without a request); the GET may
+        # lose the race, but Canvas also returns the deleted quiz
+        course_display, (quiz, response) = await _with_course_display(
+            course_identifier,
+            asyncio.gather(
+                get_quiz(course_id, quiz_id),
+                make_canvas_request(
+                    "delete", f"/courses/{course_id}/quizzes/{quiz_id}"
+                ),
+            ),
         )
 
         if isinstance(response, dict) and "error" in response:
             return f"Error deleting quiz: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
+        clear_ttl_caches(get_quiz, search_course_assignments)
+
+        quiz_title = next(
+            (
+                d["title"]
+                for d in (quiz, response)
+                if isinstance(d, dict) and d.get("title")
+            ),
+            "Unknown",
+        )
+
         return (
             f"Quiz '{quiz_title}' (ID: {quiz_id}) deleted from course {course_display}."
         )
@@ -318,19 +417,7 @@ def register_quiz_tools(mcp: FastMCP) -> None:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             quiz_id: The Canvas quiz ID to publish
         """
-        course_id = await get_course_id(course_identifier)
-
-        response = await make_canvas_request(
-            "put",
-            f"/courses/{course_id}/quizzes/{quiz_id}",
-            data={"quiz": {"published": True}},
-        )
-
-        if isinstance(response, dict) and "error" in response:
-            return f"Error publishing quiz: {response['error']}"
-
-        course_display = await get_course_code(course_id) or course_identifier
-        return f"Quiz '{response.get('title', 'Unknown')}' (ID: {quiz_id}) published in course {course_display}."
+        return await _set_published(course_identifier, quiz_id, True)
 
     @mcp.tool()
     @validate_params
@@ -341,19 +428,7 @@ def register_quiz_tools(mcp: FastMCP) -> None:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             quiz_id: The Canvas quiz ID to unpublish
         """
-        course_id = await get_course_id(course_identifier)
-
-        response = await make_canvas_request(
-            "put",
-            f"/courses/{course_id}/quizzes/{quiz_id}",
-            data={"quiz": {"published": False}},
-        )
-
-        if isinstance(response, dict) and "error" in response:
-            return f"Error unpublishing quiz: {response['error']}"
-
-        course_display = await get_course_code(course_id) or course_identifier
-        return f"Quiz '{response.get('title', 'Unknown')}' (ID: {quiz_id}) unpublished in course {course_display}."
+        return await _set_published(course_identifier, quiz_id, False)
 
     # ===== QUIZ QUESTIONS =====
 
@@ -370,52 +445,58 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        questions = await fetch_all_paginated_results(
-            f"/courses/{course_id}/quizzes/{quiz_id}/questions", {"per_page": 100}
-        )
-
-        if isinstance(questions, dict) and "error" in questions:
-            return f"Error fetching quiz questions: {questions['error']}"
-
-        if not questions or not isinstance(questions, list):
-            return f"No questions found for quiz {quiz_id}."
-
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"Quiz Questions (Quiz ID: {quiz_id}) in {course_display}:\n\n"
-
-        for i, q in enumerate(questions, 1):
-            q_id = q.get("id")
-            q_type = q.get("question_type", "unknown")
-            q_text = q.get("question_text", "")
-            points = q.get("points_possible", 0)
-            position = q.get("position", i)
-
-            # Clean HTML from question text
-            import re
-
-            text_clean = re.sub(r"<[^>]+>", "", q_text).strip()
-            if len(text_clean) > 200:
-                text_clean = text_clean[:200] + "..."
-
-            result += f"Q{position}. [ID: {q_id}] ({q_type}, {points} pts)\n"
-            result += f"   {text_clean}\n"
-
-            # Show answer choices for applicable types
-            answers = q.get("answers", [])
-            if answers and q_type in (
-                "multiple_choice_question",
-                "true_false_question",
-                "matching_question",
+        async def format_questions() -> list[str]:
+            rows = []
+            i = 0
+            async for q in iter_paginated_results(
+                f"/courses/{course_id}/quizzes/{quiz_id}/questions",
+                {"per_page": _MAX_PER_PAGE},
             ):
-                for ans in answers:
-                    ans_text = ans.get("text", ans.get("html", ""))
-                    if ans_text:
-                        ans_clean = re.sub(r"<[^>]+>", "", str(ans_text)).strip()
-                        result += f"     - {ans_clean}\n"
+                i += 1
+                q_id = q.get("id")
+                q_type = q.get("question_type", "unknown")
+                q_text = q.get("question_text", "")
+                points = q.get("points_possible", 0)
+                position = q.get("position", i)
+
+                # Clean HTML from question text
+                text_clean = _strip_truncate(q_text, 200)
+
+                rows.append(
+                    f"Q{position}. [ID: {q_id}] ({q_type}, {points} pts)\n"
+                    f"   {text_clean}\n"
+                )
 
-            result += "\n"
+                # Show answer choices for applicable types
+                answers = q.get("answers", [])
+                if answers and q_type in (
+                    "multiple_choice_question",
+                    "true_false_question",
+                    "matching_question",
+                ):
+                    for ans in answers:
+                        ans_text = ans.get("text", ans.get("html", ""))
+                        if ans_text:
+                            ans_clean = _strip_html(str(ans_text))
+                            rows.append(f"     - {ans_clean}\n")
+
+                rows.append("\n")
+            return rows
+
+        # Format each page as it arrives
+        try:
+            course_display, rows = await _with_course_display(
+                course_identifier, format_questions()
+            )
+        except CanvasAPIError as e:
+            return f"Error fetching quiz questions: {e}"
+
+        if not rows:
+            return f"No questions found for quiz {quiz_id}."
 
-        return result
+        return "".join(
+            [f"Quiz Questions (Quiz ID: {quiz_id}) in {course_display}:\n\n", *rows]
+        )
 
     @mcp.tool()
     @validate_params
@@ -453,26 +534,27 @@ def register_quiz_tools(mcp: FastMCP) -> None:
 
         if answers:
             try:
-                parsed_answers = (
-                    json.loads(answers) if isinstance(answers, str) else answers
-                )
-                question_data["answers"] = parsed_answers
+                question_data["answers"] = json.loads(answers)
             except json.JSONDecodeError:
                 return "Error: 'answers' must be a valid JSON array."
 
         if position is not None:
             question_data["position"] = position
 
-        response = await make_canvas_request(
-            "post",
-            f"/courses/{course_id}/quizzes/{quiz_id}/questions",
-            data={"question": question_data},
+        course_display, response = await _with_course_display(
+            course_identifier,
+            make_canvas_request(
+                "post",
+                f"/courses/{course_id}/quizzes/{quiz_id}/questions",
+                data={"question": question_data},
+            ),
         )
 
         if isinstance(response, dict) and "error" in response:
             return f"Error adding question: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
+        clear_ttl_caches(get_quiz, search_course_assignments)
+
         new_id = response.get("id")
         return (
             f"Question added to quiz {quiz_id} in course {course_display}:\n\n"
@@ -507,38 +589,37 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        question_data: dict = {}
-        if question_text is not None:
-            question_data["question_text"] = question_text
-        if question_type is not None:
-            question_data["question_type"] = question_type
-        if points_possible is not None:
-            question_data["points_possible"] = points_possible
-        if position is not None:
-            question_data["position"] = position
+        fields = (
+            ("question_text", question_text),
+            ("question_type", question_type),
+            ("points_possible", points_possible),
+            ("position", position),
+        )
+        question_data: dict = {key: value for key, value in fields if value is not None}
 
         if answers is not None:
             try:
-                parsed_answers = (
-                    json.loads(answers) if isinstance(answers, str) else answers
-                )
-                question_data["answers"] = parsed_answers
+                question_data["answers"] = json.loads(answers)
             except json.JSONDecodeError:
                 return "Error: 'answers' must be a valid JSON array."
 
         if not question_data:
             return "No update parameters provided."
 
-        response = await make_canvas_request(
-            "put",
-            f"/courses/{course_id}/quizzes/{quiz_id}/questions/{question_id}",
-            data={"question": question_data},
+        course_display, response = await _with_course_display(
+            course_identifier,
+            make_canvas_request(
+                "put",
+                f"/courses/{course_id}/quizzes/{quiz_id}/questions/{question_id}",
+                data={"question": question_data},
+            ),
         )
 
         if isinstance(response, dict) and "error" in response:
             return f"Error updating question: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
+        clear_ttl_caches(get_quiz, search_course_assignments)
+
         return f"Question {question_id} updated in quiz {quiz_id} in course {course_display}."
 
     @mcp.tool()
@@ -555,14 +636,19 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        response = await make_canvas_request(
-            "delete", f"/courses/{course_id}/quizzes/{quiz_id}/questions/{question_id}"
+        course_display, response = await _with_course_display(
+            course_identifier,
+            make_canvas_request(
+                "delete",
+                f"/courses/{course_id}/quizzes/{quiz_id}/questions/{question_id}",
+            ),
         )
 
         if isinstance(response, dict) and "error" in response:
             return f"Error deleting question: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
+        clear_ttl_caches(get_quiz, search_course_assignments)
+
         return f"Question {question_id} deleted from quiz {quiz_id} in course {course_display}."
 
     # ===== QUIZ ANALYTICS =====
@@ -580,15 +666,16 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        response = await make_canvas_request(
-            "get", f"/courses/{course_id}/quizzes/{quiz_id}/statistics"
+        course_display, response = await _with_course_display(
+            course_identifier,
+            make_canvas_request(
+                "get", f"/courses/{course_id}/quizzes/{quiz_id}/statistics"
+            ),
         )
 
         if isinstance(response, dict) and "error" in response:
             return f"Error fetching quiz statistics: {response['error']}"
 
-        course_display = await get_course_code(course_id) or course_identifier
-
         stats_list = response.get("quiz_statistics", [])
         if not stats_list:
             return f"No statistics available for quiz {quiz_id}."
@@ -596,32 +683,32 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         stats = stats_list[0] if stats_list else {}
         submission_stats = stats.get("submission_statistics", {})
 
-        result = f"Quiz Statistics (Quiz ID: {quiz_id}) in {course_display}:\n\n"
-        result += f"Submissions: {submission_stats.get('unique_count', 0)}\n"
-        result += f"Average Score: {submission_stats.get('score_average', 'N/A')}\n"
-        result += f"High Score: {submission_stats.get('score_high', 'N/A')}\n"
-        result += f"Low Score: {submission_stats.get('score_low', 'N/A')}\n"
-        result += f"Standard Deviation: {submission_stats.get('score_stdev', 'N/A')}\n"
-        result += f"Duration Average: {submission_stats.get('duration_average', 'N/A')} sec\n\n"
+        parts = [
+            f"Quiz Statistics (Quiz ID: {quiz_id}) in {course_display}:\n\n",
+            f"Submissions: {submission_stats.get('unique_count', 0)}\n",
+            f"Average Score: {submission_stats.get('score_average', 'N/A')}\n",
+            f"High Score: {submission_stats.get('score_high', 'N/A')}\n",
+            f"Low Score: {submission_stats.get('score_low', 'N/A')}\n",
+            f"Standard Deviation: {submission_stats.get('score_stdev', 'N/A')}\n",
+            f"Duration Average: {submission_stats.get('duration_average', 'N/A')} sec\n\n",
+        ]
 
         # Question statistics
         question_stats = stats.get("question_statistics", [])
         if question_stats:
-            result += "Question Analysis:\n"
+            parts.append("Question Analysis:\n")
             for qs in question_stats:
                 q_text = qs.get("question_text", "")
-                import re
+                text_clean = _strip_truncate(q_text, 100)
 
-                text_clean = re.sub(r"<[^>]+>", "", q_text).strip()
-                if len(text_clean) > 100:
-                    text_clean = text_clean[:100] + "..."
+                parts.append(
+                    f"\n  Q: {text_clean}\n"
+                    f"  Correct: {qs.get('correct', 'N/A')} | "
+                    f"Incorrect: {qs.get('incorrect', 'N/A')} | "
+                    f"Partially Correct: {qs.get('partially_correct', 'N/A')}\n"
+                )
 
-                result += f"\n  Q: {text_clean}\n"
-                result += f"  Correct: {qs.get('correct', 'N/A')} | "
-                result += f"Incorrect: {qs.get('incorrect', 'N/A')} | "
-                result += f"Partially Correct: {qs.get('partially_correct', 'N/A')}\n"
-
-        return result
+        return "".join(parts)
 
     @mcp.tool()
     @validate_params
@@ -636,41 +723,48 @@ def register_quiz_tools(mcp: FastMCP) -> None:
         """
         course_id = await get_course_id(course_identifier)
 
-        response = await make_canvas_request(
-            "get",
-            f"/courses/{course_id}/quizzes/{quiz_id}/submissions",
-            params={"per_page": 100},
-        )
-
-        if isinstance(response, dict) and "error" in response:
-            return f"Error fetching quiz submissions: {response['error']}"
-
-        submissions = (
-            response.get("quiz_submissions", []) if isinstance(response, dict) else []
-        )
-
-        if not submissions:
+        async def format_submissions() -> list[str]:
+            rows = []
+            async for s in iter_paginated_results(
+                f"/courses/{course_id}/quizzes/{quiz_id}/submissions",
+                {"per_page": _MAX_PER_PAGE},
+                result_key="quiz_submissions",
+            ):
+                user_id = s.get("user_id")
+                score = s.get("score", "N/A")
+                kept_score = s.get("kept_score", "N/A")
+                attempt = s.get("attempt", 1)
+                workflow_state = s.get("workflow_state", "unknown")
+                time_spent = s.get("time_spent")
+                finished_at = format_date(s.get("finished_at"))
+
+                duration = ""
+                if time_spent:
+                    minutes, seconds = divmod(time_spent, 60)
+                    duration = f" | Time: {minutes}m {seconds}s"
+                rows.append(
+                    f"User ID: {user_id} | Score: {score} | Kept: {kept_score}\n"
+                    f"  Attempt: {attempt} | Status: {workflow_state} | Finished: {finished_at}"
+                    f"{duration}\n\n"
+                )
+            return rows
+
+        # Canvas pages quiz submissions, so walk every page rather than
+        # reporting only the first
+        try:
+            course_display, rows = await _with_course_display(
+                course_identifier, format_submissions()
+            )
+        except CanvasAPIError as e:
+            return f"Error fetching quiz submissions: {e}"
+
+        if not rows:
             return f"No submissions found for quiz {quiz_id}."
 
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"Quiz Submissions (Quiz ID: {quiz_id}) in {course_display}:\n\n"
-        result += f"Total: {len(submissions)} submissions\n\n"
-
-        for s in submissions:
-            user_id = s.get("user_id")
-            score = s.get("score", "N/A")
-            kept_score = s.get("kept_score", "N/A")
-            attempt = s.get("attempt", 1)
-            workflow_state = s.get("workflow_state", "unknown")
-            time_spent = s.get("time_spent")
-            finished_at = format_date(s.get("finished_at"))
-
-            result += f"User ID: {user_id} | Score: {score} | Kept: {kept_score}\n"
-            result += f"  Attempt: {attempt} | Status: {workflow_state} | Finished: {finished_at}"
-            if time_spent:
-                minutes = time_spent // 60
-                seconds = time_spent % 60
-                result += f" | Time: {minutes}m {seconds}s"
-            result += "\n\n"
-
-        return result
+        return "".join(
+            [
+                f"Quiz Submissions (Quiz ID: {quiz_id}) in {course_display}:\n\n",
+                f"Total: {len(rows)} submissions\n\n",
+                *rows,
+            ]
+        )
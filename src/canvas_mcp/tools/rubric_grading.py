@@ -8,43 +8,11 @@ from ..core.anonymization import anonymize_response_data
 from ..core.cache import get_course_code, get_course_id
 from ..core.client import make_canvas_request, poll_canvas_progress
 from ..core.dates import format_date, truncate_text
+from ..core.grading import build_bulk_grade_form_data
 from ..core.logging import log_error
 from ..core.validation import validate_params
 
 
-def build_bulk_grade_form_data(
-    grades: dict[str, dict[str, Any]],
-) -> list[tuple[str, str]]:
-    """Convert a grades dict to Canvas bulk update form-encoded tuples.
-
-    Canvas's bulk update endpoint expects:
-        grade_data[<student_id>][posted_grade] = "value"
-        grade_data[<student_id>][excuse] = "true"
-        grade_data[<student_id>][text_comment] = "comment text"
-
-    Args:
-        grades: Dict mapping user IDs to grade info.
-                Each value can contain: grade, excused, comment.
-
-    Returns:
-        List of (key, value) tuples for form encoding.
-    """
-    form_tuples: list[tuple[str, str]] = []
-
-    for user_id, grade_info in grades.items():
-        prefix = f"grade_data[{user_id}]"
-
-        if grade_info.get("excused"):
-            form_tuples.append((f"{prefix}[excuse]", "true"))
-        elif "grade" in grade_info:
-            form_tuples.append((f"{prefix}[posted_grade]", str(grade_info["grade"])))
-
-        if "comment" in grade_info:
-            form_tuples.append((f"{prefix}[text_comment]", str(grade_info["comment"])))
-
-    return form_tuples
-
-
 def build_rubric_assessment_form_data(
     rubric_assessment: dict[str, Any], comment: str | None = None
 ) -> dict[str, str]:
@@ -1,19 +1,147 @@
 """Search-by-name helper tools for Canvas MCP."""
 
+import asyncio
+from collections.abc import Callable
+from contextlib import aclosing
+from itertools import islice
+from typing import Any
+
 from mcp.server.fastmcp import FastMCP
 
-from ..core.cache import get_course_code, get_course_id
-from ..core.client import fetch_all_paginated_results
+from ..core.cache import (
+    get_course_students,
+    get_discussion_topics,
+    resolve_course,
+    search_course_assignments,
+)
+from ..core.client import CanvasAPIError, iter_paginated_results
 from ..core.dates import format_date
 from ..core.validation import validate_params
 
+# Shortest search_term Canvas accepts
+_MIN_SEARCH_TERM_LENGTH = 2
+
+# Matches listed per call unless the caller asks for more
+_DEFAULT_LIMIT = 25
+
+# Each search returns its matches, or the error dict of the failed fetch.
+# Searches take ``stop``, the number of matches after which to stop looking
+_SearchResult = list[dict[str, Any]] | dict[str, Any]
+
+
+def _filter_by(
+    items: Any, key: str, query_folded: str, stop: int | None
+) -> _SearchResult:
+    """Keep the first ``stop`` items whose ``key`` contains ``query_folded``.
+
+    Comparing casefolded text lets e.g. "strasse" match "Straße".
+    """
+    if isinstance(items, dict) and "error" in items:
+        return items
+    if not isinstance(items, list):
+        return []
+    return list(
+        islice((i for i in items if query_folded in i.get(key, "").casefold()), stop)
+    )
+
+
+async def _search_assignments(
+    course_id: str | None, name_query: str, stop: int | None = None
+) -> _SearchResult:
+    """Find assignments whose name contains ``name_query``."""
+    # Canvas matches search_term as a case-insensitive substring of the
+    # title, so its results are used as is; they are cached so a repeat
+    # search skips the round trip
+    if len(name_query.strip()) >= _MIN_SEARCH_TERM_LENGTH:
+        assignments = await search_course_assignments(course_id, name_query)
+        if isinstance(assignments, dict) and "error" in assignments:
+            return assignments
+        return assignments[:stop] if isinstance(assignments, list) else []
+
+    # Canvas rejects shorter terms: stream every assignment and filter here,
+    # leaving the stream (and cancelling pending pages) once enough match
+    query_folded = name_query.casefold()
+    matches: list[dict[str, Any]] = []
+    try:
+        async with aclosing(
+            iter_paginated_results(
+                f"/courses/{course_id}/assignments", {"per_page": 100}
+            )
+        ) as assignments:
+            async for a in assignments:
+                if query_folded in a.get("name", "").casefold():
+                    matches.append(a)
+                    if len(matches) == stop:
+                        break
+    except CanvasAPIError as e:
+        return e.response
+    return matches
+
+
+async def _search_students(
+    course_id: str | None, query_folded: str, stop: int | None = None
+) -> _SearchResult:
+    """Find students whose name contains ``query_folded``."""
+    # Filter the cached roster client-side: one fetch at most, shared
+    # with the other roster-based tools
+    users = await get_course_students(course_id)
+    return _filter_by(users, "name", query_folded, stop)
+
+
+async def _search_discussions(
+    course_id: str | None, query_folded: str, stop: int | None = None
+) -> _SearchResult:
+    """Find discussion topics whose title contains ``query_folded``."""
+    # The topic list is cached briefly, so a burst of searches on one
+    # course shares one fetch
+    topics = await get_discussion_topics(course_id)
+    return _filter_by(topics, "title", query_folded, stop)
+
+
+def _assignment_row(a: dict[str, Any]) -> str:
+    due = format_date(a.get("due_at"))
+    points = a.get("points_possible", "N/A")
+    published = "Published" if a.get("published") else "Unpublished"
+    return f"  ID: {a['id']} | {a.get('name', 'Untitled')} | {points} pts | Due: {due} | {published}\n"
+
+
+def _student_row(u: dict[str, Any]) -> str:
+    email = u.get("email", "N/A")
+    return f"  ID: {u['id']} | {u.get('name', 'Unknown')} | Email: {email}\n"
+
+
+def _discussion_row(t: dict[str, Any]) -> str:
+    posted = format_date(t.get("posted_at"))
+    topic_type = "Announcement" if t.get("is_announcement", False) else "Discussion"
+    entry_count = t.get("discussion_subentry_count", 0)
+    return f"  ID: {t['id']} | {t.get('title', 'Untitled')} | {topic_type} | {entry_count} entries | Posted: {posted}\n"
+
+
+def _page_parts(
+    matches: list[dict[str, Any]],
+    row: Callable[[dict[str, Any]], str],
+    limit: int,
+    offset: int,
+) -> list[str]:
+    """Format one page of matches, noting the offset of the next page."""
+    end = offset + limit
+    parts = [row(m) for m in matches[offset:end]]
+    if len(matches) > end:
+        parts.append(f"\nMore matches available: call again with offset={end}\n")
+    return parts
+
 
 def register_search_helper_tools(mcp: FastMCP) -> None:
     """Register search-by-name helper tools."""
 
     @mcp.tool()
     @validate_params
-    async def find_assignment(course_identifier: str | int, name_query: str) -> str:
+    async def find_assignment(
+        course_identifier: str | int,
+        name_query: str,
+        limit: int = _DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> str:
         """Find assignments by name (case-insensitive search).
 
         Searches assignment titles for the given query string.
@@ -22,55 +150,38 @@ def register_search_helper_tools(mcp: FastMCP) -> None:
         Args:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             name_query: Search term to match against assignment titles
+            limit: Maximum number of matches to list (default: 25)
+            offset: Number of matches to skip, for fetching the next page
         """
-        course_id = await get_course_id(course_identifier)
-        query_lower = name_query.lower()
-
-        assignments = await fetch_all_paginated_results(
-            f"/courses/{course_id}/assignments",
-            {"per_page": 100, "search_term": name_query},
+        course_id, course_display = await resolve_course(course_identifier)
+        limit, offset = max(limit, 1), max(offset, 0)
+        # One match past the page tells whether another page follows
+        matches = await _search_assignments(
+            course_id, name_query, stop=offset + limit + 1
         )
 
-        if isinstance(assignments, dict) and "error" in assignments:
-            return f"Error searching assignments: {assignments['error']}"
-
-        # Canvas search_term may not be exact, so also do client-side filtering
-        matches = []
-        if isinstance(assignments, list):
-            for a in assignments:
-                title = a.get("name", "")
-                if query_lower in title.lower():
-                    matches.append(a)
-
-        if not matches:
-            # Fallback: fetch all and search client-side
-            all_assignments = await fetch_all_paginated_results(
-                f"/courses/{course_id}/assignments", {"per_page": 100}
-            )
-            if isinstance(all_assignments, list):
-                matches = [
-                    a
-                    for a in all_assignments
-                    if query_lower in a.get("name", "").lower()
-                ]
+        if isinstance(matches, dict):
+            return f"Error searching assignments: {matches['error']}"
 
         if not matches:
             return f"No assignments matching '{name_query}' found."
 
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"Assignments matching '{name_query}' in {course_display}:\n\n"
-
-        for a in matches:
-            due = format_date(a.get("due_at"))
-            points = a.get("points_possible", "N/A")
-            published = "Published" if a.get("published") else "Unpublished"
-            result += f"  ID: {a['id']} | {a.get('name', 'Untitled')} | {points} pts | Due: {due} | {published}\n"
+        rows = _page_parts(matches, _assignment_row, limit, offset)
+        if not rows:
+            return f"No assignments matching '{name_query}' after offset {offset}."
 
-        return result
+        parts = [f"Assignments matching '{name_query}' in {course_display}:\n\n"]
+        parts.extend(rows)
+        return "".join(parts)
 
     @mcp.tool()
     @validate_params
-    async def find_student(course_identifier: str | int, name_query: str) -> str:
+    async def find_student(
+        course_identifier: str | int,
+        name_query: str,
+        limit: int = _DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> str:
         """Find students by name (case-insensitive search).
 
         Searches enrolled student names for the given query string.
@@ -79,53 +190,38 @@ def register_search_helper_tools(mcp: FastMCP) -> None:
         Args:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             name_query: Search term to match against student names
+            limit: Maximum number of matches to list (default: 25)
+            offset: Number of matches to skip, for fetching the next page
         """
-        course_id = await get_course_id(course_identifier)
-        query_lower = name_query.lower()
-
-        users = await fetch_all_paginated_results(
-            f"/courses/{course_id}/users",
-            {
-                "enrollment_type[]": "student",
-                "search_term": name_query,
-                "per_page": 100,
-            },
+        course_id, course_display = await resolve_course(course_identifier)
+        limit, offset = max(limit, 1), max(offset, 0)
+        # One match past the page tells whether another page follows
+        matches = await _search_students(
+            course_id, name_query.casefold(), stop=offset + limit + 1
         )
 
-        if isinstance(users, dict) and "error" in users:
-            return f"Error searching students: {users['error']}"
-
-        # Client-side filter for accuracy
-        matches = []
-        if isinstance(users, list):
-            matches = [u for u in users if query_lower in u.get("name", "").lower()]
-
-        if not matches:
-            # Fallback: fetch all students and filter
-            all_users = await fetch_all_paginated_results(
-                f"/courses/{course_id}/users",
-                {"enrollment_type[]": "student", "per_page": 100},
-            )
-            if isinstance(all_users, list):
-                matches = [
-                    u for u in all_users if query_lower in u.get("name", "").lower()
-                ]
+        if isinstance(matches, dict):
+            return f"Error searching students: {matches['error']}"
 
         if not matches:
             return f"No students matching '{name_query}' found."
 
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"Students matching '{name_query}' in {course_display}:\n\n"
+        rows = _page_parts(matches, _student_row, limit, offset)
+        if not rows:
+            return f"No students matching '{name_query}' after offset {offset}."
 
-        for u in matches:
-            email = u.get("email", "N/A")
-            result += f"  ID: {u['id']} | {u.get('name', 'Unknown')} | Email: {email}\n"
-
-        return result
+        parts = [f"Students matching '{name_query}' in {course_display}:\n\n"]
+        parts.extend(rows)
+        return "".join(parts)
 
     @mcp.tool()
     @validate_params
-    async def find_discussion(course_identifier: str | int, name_query: str) -> str:
+    async def find_discussion(
+        course_identifier: str | int,
+        name_query: str,
+        limit: int = _DEFAULT_LIMIT,
+        offset: int = 0,
+    ) -> str:
         """Find discussion topics by title (case-insensitive search).
 
         Searches discussion topic titles for the given query string.
@@ -134,32 +230,75 @@ def register_search_helper_tools(mcp: FastMCP) -> None:
         Args:
             course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
             name_query: Search term to match against discussion titles
+            limit: Maximum number of matches to list (default: 25)
+            offset: Number of matches to skip, for fetching the next page
         """
-        course_id = await get_course_id(course_identifier)
-        query_lower = name_query.lower()
-
-        topics = await fetch_all_paginated_results(
-            f"/courses/{course_id}/discussion_topics", {"per_page": 100}
+        course_id, course_display = await resolve_course(course_identifier)
+        limit, offset = max(limit, 1), max(offset, 0)
+        # One match past the page tells whether another page follows
+        matches = await _search_discussions(
+            course_id, name_query.casefold(), stop=offset + limit + 1
         )
 
-        if isinstance(topics, dict) and "error" in topics:
-            return f"Error searching discussions: {topics['error']}"
-
-        matches = []
-        if isinstance(topics, list):
-            matches = [t for t in topics if query_lower in t.get("title", "").lower()]
+        if isinstance(matches, dict):
+            return f"Error searching discussions: {matches['error']}"
 
         if not matches:
             return f"No discussions matching '{name_query}' found."
 
-        course_display = await get_course_code(course_id) or course_identifier
-        result = f"Discussions matching '{name_query}' in {course_display}:\n\n"
+        rows = _page_parts(matches, _discussion_row, limit, offset)
+        if not rows:
+            return f"No discussions matching '{name_query}' after offset {offset}."
+
+        parts = [f"Discussions matching '{name_query}' in {course_display}:\n\n"]
+        parts.extend(rows)
+        return "".join(parts)
 
-        for t in matches:
-            posted = format_date(t.get("posted_at"))
-            is_announcement = t.get("is_announcement", False)
-            topic_type = "Announcement" if is_announcement else "Discussion"
-            entry_count = t.get("discussion_subentry_count", 0)
-            result += f"  ID: {t['id']} | {t.get('title', 'Untitled')} | {topic_type} | {entry_count} entries | Posted: {posted}\n"
+    @mcp.tool()
+    @validate_params
+    async def find_all(
+        course_identifier: str | int, query: str, limit: int = _DEFAULT_LIMIT
+    ) -> str:
+        """Find assignments, students, and discussions by name in one call.
 
-        return result
+        Runs the three name searches concurrently against one course.
+        Use this instead of calling find_assignment, find_student and
+        find_discussion separately.
+
+        Args:
+            course_identifier: The Canvas course code (e.g., badm_554_120251_246794) or ID
+            query: Search term to match against assignment, student and discussion names
+            limit: Maximum number of matches to list per type (default: 25)
+        """
+        course_id, course_display = await resolve_course(course_identifier)
+        query_folded = query.casefold()
+        limit = max(limit, 1)
+
+        searched = await asyncio.gather(
+            _search_assignments(course_id, query, stop=limit + 1),
+            _search_students(course_id, query_folded, stop=limit + 1),
+            _search_discussions(course_id, query_folded, stop=limit + 1),
+        )
+
+        parts = [f"Matches for '{query}' in {course_display}:\n"]
+        sections = zip(
+            ("Assignments", "Students", "Discussions"),
+            searched,
+            (_assignment_row, _student_row, _discussion_row),
+            ("find_assignment", "find_student", "find_discussion"),
+            strict=True,
+        )
+        for label, matches, row, tool in sections:
+            parts.append(f"\n{label}:\n")
+            if isinstance(matches, dict):
+                parts.append(f"  Error: {matches['error']}\n")
+            elif not matches:
+                parts.append("  None found\n")
+            else:
+                parts.extend(row(m) for m in matches[:limit])
+                if len(matches) > limit:
+                    parts.append(
+                        f"  ... more matches; use {tool} with offset={limit}\n"
+                    )
+
+        return "".join(parts)
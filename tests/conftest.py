@@ -1,9 +1,25 @@
 """Shared pytest fixtures for Canvas MCP tests."""
 
+import os
+
+# Import every tool module up front so a broken one fails the whole session
+# instead of only the tests that happen to touch it.
+os.environ.setdefault("CANVAS_MCP_EAGER_IMPORT", "true")
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 
+@pytest.fixture(autouse=True)
+def _clear_ttl_caches():
+    """Keep cached Canvas responses from leaking between tests."""
+    from canvas_mcp.core.cache import clear_ttl_caches
+
+    clear_ttl_caches()
+    yield
+    clear_ttl_caches()
+
+
 @pytest.fixture
 def mock_canvas_request():
     """Mock Canvas API request function."""
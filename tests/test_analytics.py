@@ -1,7 +1,45 @@
 """Tests for Canvas MCP analytics tools."""
 
 import pytest
-from unittest.mock import AsyncMock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+
+async def _aiter(items):
+    """Async iterator over ``items``, standing in for a paginated stream."""
+    for item in items:
+        yield item
+
+
+@pytest.fixture(scope="module")
+def analytics_tools():
+    """Analytics tool functions by name, registered once per module.
+
+    Tests patch the tools' dependencies and call the functions directly.
+    """
+    from canvas_mcp.tools.analytics import register_analytics_tools
+    from mcp.server.fastmcp import FastMCP
+
+    mcp = FastMCP("test")
+    register_analytics_tools(mcp)
+    return {name: tool.fn for name, tool in mcp._tool_manager._tools.items()}
+
+
+@pytest.fixture(autouse=True)
+def analytics_mocks(monkeypatch):
+    """Mock the analytics tools' Canvas calls for every test.
+
+    The course resolves to ("12345", "CS101"); tests set what the request
+    and page-stream mocks return.
+    """
+    mocks = SimpleNamespace(
+        resolve_course=AsyncMock(return_value=("12345", "CS101")),
+        make_canvas_request=AsyncMock(),
+        iter_paginated_pages=MagicMock(),
+    )
+    for name, mock in vars(mocks).items():
+        monkeypatch.setattr(f"canvas_mcp.tools.analytics.{name}", mock)
+    return mocks
 
 
 @pytest.fixture
@@ -166,358 +204,301 @@ class TestGetCourseStudentSummaries:
     """Tests for get_course_student_summaries tool."""
 
     @pytest.mark.asyncio
-    async def test_returns_student_summaries(self, sample_student_summaries):
+    async def test_returns_student_summaries(
+        self, analytics_tools, analytics_mocks, sample_student_summaries
+    ):
         """Test successful retrieval of student summaries."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.fetch_all_paginated_results",
-                new_callable=AsyncMock,
-            ) as mock_fetch,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
-
-            mock_get_id.return_value = "12345"
-            mock_fetch.return_value = sample_student_summaries
-            mock_get_code.return_value = "CS101"
-
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
-
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
-
-            # Get the tool function
-            tool = mcp._tool_manager._tools.get("get_course_student_summaries")
-            assert tool is not None
-
-            result = await tool.fn("12345")
-
-            assert "Total Students: 3" in result
-            assert "Students with No Activity" in result
-            assert "Carol Davis" in result
-            assert "Tardiness Issues" in result
+        analytics_mocks.iter_paginated_pages.side_effect = (
+            lambda *args, **kwargs: _aiter(
+                [sample_student_summaries[:2], sample_student_summaries[2:]]
+            )
+        )
 
-    @pytest.mark.asyncio
-    async def test_invalid_sort_option(self):
-        """Test error handling for invalid sort option."""
-        with patch(
-            "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-        ) as mock_get_id:
-            mock_get_id.return_value = "12345"
+        tool = analytics_tools["get_course_student_summaries"]
 
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
+        result = await tool("12345")
 
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
+        assert "Total Students: 3" in result
+        assert "Students with No Activity" in result
+        assert "Carol Davis" in result
+        assert "Tardiness Issues" in result
 
-            tool = mcp._tool_manager._tools.get("get_course_student_summaries")
-            result = await tool.fn("12345", sort_by="invalid_option")
+    @pytest.mark.asyncio
+    async def test_invalid_sort_option(self, analytics_tools):
+        """Test error handling for invalid sort option."""
+        tool = analytics_tools["get_course_student_summaries"]
+        result = await tool("12345", sort_by="invalid_option")
 
-            assert "Error: Invalid sort_by option" in result
+        assert "Error: Invalid sort_by option" in result
 
 
 class TestGetStudentActivity:
     """Tests for get_student_activity tool."""
 
     @pytest.mark.asyncio
-    async def test_returns_student_activity(self, sample_student_activity):
+    async def test_returns_student_activity(
+        self, analytics_tools, analytics_mocks, sample_student_activity
+    ):
         """Test successful retrieval of student activity."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.make_canvas_request", new_callable=AsyncMock
-            ) as mock_request,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
+        analytics_mocks.make_canvas_request.return_value = sample_student_activity
+
+        tool = analytics_tools["get_student_activity"]
+        result = await tool("12345", 1001)
+
+        assert "Total Page Views: 33" in result
+        assert "Tuesday: 15" in result
+        assert "Recent Participations" in result
+
+    @pytest.mark.asyncio
+    async def test_api_error_message(self, analytics_tools, analytics_mocks):
+        """Test that Canvas errors are reported with the tool's action."""
+        analytics_mocks.make_canvas_request.return_value = {"error": "HTTP error: 404"}
+
+        tool = analytics_tools["get_student_activity"]
+        result = await tool("12345", 1001)
+
+        assert result == "Error fetching student activity: HTTP error: 404"
+
+
+class TestWeekday:
+    """Tests for the cached weekday helper."""
+
+    def test_datetime_string(self):
+        """The weekday comes from the date portion of an ISO datetime."""
+        from canvas_mcp.tools.analytics import _weekday
+
+        assert _weekday("2024-01-15T00:00:00Z") == "Monday"
+        assert _weekday("2024-01-21T23:30:00-06:00") == "Sunday"
+
+    def test_invalid_string(self):
+        """Unparseable dates return None instead of raising."""
+        from canvas_mcp.tools.analytics import _weekday
+
+        assert _weekday("not-a-date") is None
+
+
+class TestTrunc:
+    """Tests for the title/URL truncation helper."""
+
+    def test_truncates_long_text(self):
+        """Text over the limit is cut and gets an ellipsis."""
+        from canvas_mcp.tools.analytics import _trunc
+
+        assert _trunc("abcdef", 3) == "abc..."
+        assert _trunc("abc", 3) == "abc"
+        assert _trunc(None, 3) == ""
+
+
+class TestCappedSection:
+    """Tests for the capped report section helper."""
+
+    def test_overflow_note(self):
+        """Entries beyond the limit are summarized in a trailing note."""
+        from canvas_mcp.tools.analytics import _capped_section
+
+        section = _capped_section("Header:", ["a", "b", "c"], limit=2)
+
+        assert section == ["Header:", "  - a", "  - b", "  ... and 1 more", ""]
+
 
-            mock_get_id.return_value = "12345"
-            mock_request.return_value = sample_student_activity
-            mock_get_code.return_value = "CS101"
+class TestSubmissionTotals:
+    """Tests for the tardiness column helpers."""
 
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
+    def test_columns_and_totals(self):
+        """Tardiness is split into columns and summed."""
+        from canvas_mcp.tools.analytics import _submission_totals, _tardiness_columns
 
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
+        on_time, late, missing, floating = _tardiness_columns(
+            [
+                {"tardiness_breakdown": {"on_time": 28, "late": 2, "missing": 5}},
+                {"tardiness_breakdown": None},
+            ]
+        )
 
-            tool = mcp._tool_manager._tools.get("get_student_activity")
-            result = await tool.fn("12345", 1001)
+        assert (on_time, late, missing, floating) == ([28, 0], [2, 0], [5, 0], [0, 0])
+        assert _submission_totals(on_time, late) == (30, 2)
+        assert _submission_totals([], []) == (0, 0)
 
-            assert "Total Page Views: 33" in result
-            assert "Recent Participations" in result
+
+class TestEngagementReducers:
+    """Tests for the mergeable student-summary partials."""
+
+    def test_merged_pages_match_one_page(self, sample_student_summaries):
+        """Merging per-page partials matches summarizing one combined page."""
+        from canvas_mcp.tools.analytics import _merge_engagement, _summarize_page
+
+        merged = _merge_engagement(
+            _summarize_page([student]) for student in sample_student_summaries
+        )
+
+        assert merged == _summarize_page(sample_student_summaries)
+        assert merged.no_activity == ("Carol Davis",)
+
+    def test_merge_is_associative(self, sample_student_summaries):
+        """Merging already-merged partials gives the same result."""
+        from canvas_mcp.tools.analytics import _merge_engagement, _summarize_page
+
+        parts = [_summarize_page([student]) for student in sample_student_summaries]
+
+        regrouped = _merge_engagement(
+            [_merge_engagement(parts[:1]), _merge_engagement(parts[1:])]
+        )
+
+        assert regrouped == _merge_engagement(parts)
+
+    def test_top_keeps_first_five_across_pages(self):
+        """The merged top list holds the first five students in page order."""
+        from canvas_mcp.tools.analytics import _merge_engagement, _summarize_page
+
+        merged = _merge_engagement(
+            [
+                _summarize_page([{"id": i} for i in range(3)]),
+                _summarize_page([{"id": i} for i in range(3, 9)]),
+            ]
+        )
+
+        assert [s["id"] for s in merged.top] == [0, 1, 2, 3, 4]
+
+    def test_merge_counts_keeps_zero_counts(self):
+        """Categories that only ever count zero stay in the totals."""
+        from canvas_mcp.tools.analytics import _merge_counts
+
+        totals = _merge_counts([{"views": 2, "posts": 0}, {"views": 3}])
+
+        assert totals == {"views": 5, "posts": 0}
+        assert "posts" in totals
 
 
 class TestGetStudentAssignmentData:
     """Tests for get_student_assignment_data tool."""
 
     @pytest.mark.asyncio
-    async def test_returns_assignment_data(self, sample_student_assignments):
+    async def test_returns_assignment_data(
+        self, analytics_tools, analytics_mocks, sample_student_assignments
+    ):
         """Test successful retrieval of student assignment data."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.make_canvas_request", new_callable=AsyncMock
-            ) as mock_request,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
-
-            mock_get_id.return_value = "12345"
-            mock_request.return_value = sample_student_assignments
-            mock_get_code.return_value = "CS101"
-
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
-
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
+        analytics_mocks.make_canvas_request.return_value = sample_student_assignments
 
-            tool = mcp._tool_manager._tools.get("get_student_assignment_data")
-            result = await tool.fn("12345", 1001)
+        tool = analytics_tools["get_student_assignment_data"]
+        result = await tool("12345", 1001)
 
-            assert "Total Assignments: 3" in result
-            assert "Missing: 1" in result
-            assert "Late: 1" in result
-            assert "Overall Grade:" in result
+        assert "Total Assignments: 3" in result
+        assert "Missing: 1" in result
+        assert "Late: 1" in result
+        assert "Overall Grade:" in result
 
 
 class TestGetStudentCommunication:
     """Tests for get_student_communication tool."""
 
     @pytest.mark.asyncio
-    async def test_returns_communication_data(self, sample_student_communication):
+    async def test_returns_communication_data(
+        self, analytics_tools, analytics_mocks, sample_student_communication
+    ):
         """Test successful retrieval of communication data."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.make_canvas_request", new_callable=AsyncMock
-            ) as mock_request,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
+        analytics_mocks.make_canvas_request.return_value = sample_student_communication
 
-            mock_get_id.return_value = "12345"
-            mock_request.return_value = sample_student_communication
-            mock_get_code.return_value = "CS101"
+        tool = analytics_tools["get_student_communication"]
+        result = await tool("12345", 1001)
 
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
-
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
-
-            tool = mcp._tool_manager._tools.get("get_student_communication")
-            result = await tool.fn("12345", 1001)
-
-            assert "Messages from Instructor: 5" in result
-            assert "Messages from Student: 8" in result
+        assert "Messages from Instructor: 5" in result
+        assert "Messages from Student: 8" in result
 
 
 class TestGetCourseActivity:
     """Tests for get_course_activity tool."""
 
     @pytest.mark.asyncio
-    async def test_returns_course_activity(self, sample_course_activity):
+    async def test_returns_course_activity(
+        self, analytics_tools, analytics_mocks, sample_course_activity
+    ):
         """Test successful retrieval of course activity."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.make_canvas_request", new_callable=AsyncMock
-            ) as mock_request,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
-
-            mock_get_id.return_value = "12345"
-            mock_request.return_value = sample_course_activity
-            mock_get_code.return_value = "CS101"
-
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
+        analytics_mocks.make_canvas_request.return_value = sample_course_activity
 
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
+        tool = analytics_tools["get_course_activity"]
+        result = await tool("12345")
 
-            tool = mcp._tool_manager._tools.get("get_course_activity")
-            result = await tool.fn("12345")
+        assert "Activity by Category:" in result
+        assert "Peak Activity Days" in result
 
-            assert "Activity by Category:" in result
-            assert "Peak Activity Days" in result
+        # Peak days are ordered by total, most recent is by date
+        peak_section = result.split("Top 5 Peak Activity Days:")[1]
+        assert peak_section.index("2024-01-17") < peak_section.index("2024-01-15")
+        assert peak_section.index("2024-01-15") < peak_section.index("2024-01-16")
+        assert "Most Recent Activity: 2024-01-17 (330 events)" in result
 
 
 class TestGetAssignmentStatistics:
     """Tests for get_assignment_statistics tool."""
 
     @pytest.mark.asyncio
-    async def test_returns_assignment_statistics(self, sample_assignment_statistics):
+    async def test_returns_assignment_statistics(
+        self, analytics_tools, analytics_mocks, sample_assignment_statistics
+    ):
         """Test successful retrieval of assignment statistics."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.make_canvas_request", new_callable=AsyncMock
-            ) as mock_request,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
+        analytics_mocks.make_canvas_request.return_value = sample_assignment_statistics
 
-            mock_get_id.return_value = "12345"
-            mock_request.return_value = sample_assignment_statistics
-            mock_get_code.return_value = "CS101"
+        tool = analytics_tools["get_assignment_statistics"]
+        result = await tool("12345")
 
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
-
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
-
-            tool = mcp._tool_manager._tools.get("get_assignment_statistics")
-            result = await tool.fn("12345")
-
-            assert "Total Assignments: 2" in result
-            assert "Midterm Exam" in result
-            assert "Score Distribution" in result
-            assert "Min:" in result
+        assert "Total Assignments: 2" in result
+        assert "Midterm Exam" in result
+        assert "Score Distribution" in result
+        assert "Min:" in result
 
 
 class TestStartCourseReport:
     """Tests for start_course_report tool."""
 
     @pytest.mark.asyncio
-    async def test_starts_report(self, sample_report_response):
+    async def test_starts_report(
+        self, analytics_tools, analytics_mocks, sample_report_response
+    ):
         """Test successful report start."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.make_canvas_request", new_callable=AsyncMock
-            ) as mock_request,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
-
-            mock_get_id.return_value = "12345"
-            mock_request.return_value = sample_report_response
-            mock_get_code.return_value = "CS101"
-
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
-
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
-
-            tool = mcp._tool_manager._tools.get("start_course_report")
-            result = await tool.fn("12345", "grade_export_csv")
-
-            assert "Report Started" in result
-            assert "Report ID: 12345" in result
-            assert "Status: running" in result
+        analytics_mocks.make_canvas_request.return_value = sample_report_response
 
-    @pytest.mark.asyncio
-    async def test_invalid_report_type(self):
-        """Test error handling for invalid report type."""
-        with patch(
-            "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-        ) as mock_get_id:
-            mock_get_id.return_value = "12345"
-
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
+        tool = analytics_tools["start_course_report"]
+        result = await tool("12345", "grade_export_csv")
 
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
+        assert "Report Started" in result
+        assert "Report ID: 12345" in result
+        assert "Status: running" in result
 
-            tool = mcp._tool_manager._tools.get("start_course_report")
-            result = await tool.fn("12345", "invalid_report")
+    @pytest.mark.asyncio
+    async def test_invalid_report_type(self, analytics_tools):
+        """Test error handling for invalid report type."""
+        tool = analytics_tools["start_course_report"]
+        result = await tool("12345", "invalid_report")
 
-            assert "Error: Invalid report type" in result
+        assert "Error: Invalid report type" in result
 
 
 class TestGetReportStatus:
     """Tests for get_report_status tool."""
 
     @pytest.mark.asyncio
-    async def test_returns_complete_status(self, sample_report_complete):
+    async def test_returns_complete_status(
+        self, analytics_tools, analytics_mocks, sample_report_complete
+    ):
         """Test successful retrieval of complete report status."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.make_canvas_request", new_callable=AsyncMock
-            ) as mock_request,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
-
-            mock_get_id.return_value = "12345"
-            mock_request.return_value = sample_report_complete
-            mock_get_code.return_value = "CS101"
-
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
-
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
-
-            tool = mcp._tool_manager._tools.get("get_report_status")
-            result = await tool.fn("12345", "grade_export_csv", 12345)
-
-            assert "Report Complete" in result
-            assert "Download URL:" in result
-            assert "grades.csv" in result
+        analytics_mocks.make_canvas_request.return_value = sample_report_complete
+
+        tool = analytics_tools["get_report_status"]
+        result = await tool("12345", "grade_export_csv", 12345)
+
+        assert "Report Complete" in result
+        assert "Download URL:" in result
+        assert "grades.csv" in result
 
     @pytest.mark.asyncio
-    async def test_returns_running_status(self, sample_report_response):
+    async def test_returns_running_status(
+        self, analytics_tools, analytics_mocks, sample_report_response
+    ):
         """Test status check for running report."""
-        with (
-            patch(
-                "canvas_mcp.tools.analytics.get_course_id", new_callable=AsyncMock
-            ) as mock_get_id,
-            patch(
-                "canvas_mcp.tools.analytics.make_canvas_request", new_callable=AsyncMock
-            ) as mock_request,
-            patch(
-                "canvas_mcp.tools.analytics.get_course_code", new_callable=AsyncMock
-            ) as mock_get_code,
-        ):
-
-            mock_get_id.return_value = "12345"
-            mock_request.return_value = sample_report_response
-            mock_get_code.return_value = "CS101"
-
-            from canvas_mcp.tools.analytics import register_analytics_tools
-            from mcp.server.fastmcp import FastMCP
-
-            mcp = FastMCP("test")
-            register_analytics_tools(mcp)
-
-            tool = mcp._tool_manager._tools.get("get_report_status")
-            result = await tool.fn("12345", "grade_export_csv", 12345)
-
-            assert "Status: running" in result
-            assert "still generating" in result
+        analytics_mocks.make_canvas_request.return_value = sample_report_response
+
+        tool = analytics_tools["get_report_status"]
+        result = await tool("12345", "grade_export_csv", 12345)
+
+        assert "Status: running" in result
+        assert "still generating" in result
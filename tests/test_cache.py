@@ -0,0 +1,329 @@
+"""Tests for the async TTL response cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from canvas_mcp.core.cache import (
+    async_ttl_cache,
+    clear_ttl_caches,
+    evict_ttl_cache,
+    get_course_students,
+    get_discussion_entries,
+    get_discussion_topics,
+    get_quiz,
+    resolve_course,
+    search_course_assignments,
+)
+
+
+class TestAsyncTtlCache:
+    """Test async_ttl_cache memoization."""
+
+    async def test_reuses_result_within_ttl(self):
+        """A second identical call is served from the cache."""
+        calls = []
+
+        @async_ttl_cache(ttl=60)
+        async def fetch(endpoint, params=None):
+            calls.append(endpoint)
+            return {"endpoint": endpoint}
+
+        first = await fetch("/a", params={"x": [1, 2]})
+        second = await fetch("/a", params={"x": [1, 2]})
+
+        assert first == second
+        assert calls == ["/a"]
+
+    async def test_distinct_params_are_distinct_keys(self):
+        """Different arguments are cached separately."""
+        calls = []
+
+        @async_ttl_cache(ttl=60)
+        async def fetch(endpoint, params=None):
+            calls.append(params)
+            return [params]
+
+        await fetch("/a", params={"page": 1})
+        await fetch("/a", params={"page": 2})
+
+        assert len(calls) == 2
+
+    async def test_expires_after_ttl(self):
+        """Entries older than the TTL are refetched."""
+        calls = []
+
+        @async_ttl_cache(ttl=10)
+        async def fetch(endpoint):
+            calls.append(endpoint)
+            return [endpoint]
+
+        with patch("canvas_mcp.core.cache.time.monotonic", return_value=100.0):
+            await fetch("/a")
+        with patch("canvas_mcp.core.cache.time.monotonic", return_value=111.0):
+            await fetch("/a")
+
+        assert len(calls) == 2
+
+    async def test_error_responses_not_cached(self):
+        """Error dicts are returned but not stored."""
+        calls = []
+
+        @async_ttl_cache(ttl=60)
+        async def fetch(endpoint):
+            calls.append(endpoint)
+            return {"error": "boom"}
+
+        await fetch("/a")
+        await fetch("/a")
+
+        assert len(calls) == 2
+
+    async def test_concurrent_calls_share_one_request(self):
+        """Identical in-flight calls are coalesced."""
+        calls = []
+
+        @async_ttl_cache(ttl=60)
+        async def fetch(endpoint):
+            calls.append(endpoint)
+            await asyncio.sleep(0.01)
+            return [endpoint]
+
+        results = await asyncio.gather(fetch("/a"), fetch("/a"), fetch("/a"))
+
+        assert results == [["/a"]] * 3
+        assert calls == ["/a"]
+
+    async def test_evicts_least_recently_used(self):
+        """The cache holds at most ``maxsize`` entries."""
+        calls = []
+
+        @async_ttl_cache(ttl=60, maxsize=2)
+        async def fetch(endpoint):
+            calls.append(endpoint)
+            return [endpoint]
+
+        await fetch("/a")
+        await fetch("/b")
+        await fetch("/c")
+        await fetch("/a")
+
+        assert calls == ["/a", "/b", "/c", "/a"]
+
+    async def test_clear_ttl_caches(self):
+        """clear_ttl_caches drops stored results."""
+        calls = []
+
+        @async_ttl_cache(ttl=60)
+        async def fetch(endpoint):
+            calls.append(endpoint)
+            return [endpoint]
+
+        await fetch("/a")
+        clear_ttl_caches()
+        await fetch("/a")
+
+        assert len(calls) == 2
+
+    async def test_clear_ttl_caches_for_one_function(self):
+        """Passing functions clears only their caches."""
+        calls = []
+
+        @async_ttl_cache(ttl=60)
+        async def first(endpoint):
+            calls.append(("first", endpoint))
+            return [endpoint]
+
+        @async_ttl_cache(ttl=60)
+        async def second(endpoint):
+            calls.append(("second", endpoint))
+            return [endpoint]
+
+        await first("/a")
+        await second("/a")
+        clear_ttl_caches(first)
+        await first("/a")
+        await second("/a")
+
+        assert calls == [("first", "/a"), ("second", "/a"), ("first", "/a")]
+
+
+class TestResolveCourse:
+    """Test combined course ID/code resolution."""
+
+    async def test_returns_id_and_code_once(self):
+        """Both lookups run once; repeat calls are served from the cache."""
+        with (
+            patch(
+                "canvas_mcp.core.cache.get_course_id",
+                new_callable=AsyncMock,
+                return_value="12345",
+            ) as mock_get_id,
+            patch(
+                "canvas_mcp.core.cache.get_course_code",
+                new_callable=AsyncMock,
+                return_value="CS101",
+            ) as mock_get_code,
+        ):
+            first = await resolve_course("12345")
+            second = await resolve_course("12345")
+
+        assert first == second == ("12345", "CS101")
+        mock_get_id.assert_awaited_once_with("12345")
+        mock_get_code.assert_awaited_once_with("12345")
+
+    async def test_course_code_skips_code_lookup(self):
+        """A course code identifier is displayed as given without a lookup."""
+        with (
+            patch(
+                "canvas_mcp.core.cache.get_course_id",
+                new_callable=AsyncMock,
+                return_value="12345",
+            ),
+            patch(
+                "canvas_mcp.core.cache.get_course_code",
+                new_callable=AsyncMock,
+            ) as mock_get_code,
+        ):
+            assert await resolve_course("CS101") == ("12345", "CS101")
+
+        mock_get_code.assert_not_awaited()
+
+    async def test_falls_back_to_identifier(self):
+        """Without a known course code the identifier is displayed."""
+        with (
+            patch(
+                "canvas_mcp.core.cache.get_course_id",
+                new_callable=AsyncMock,
+                return_value="999",
+            ),
+            patch(
+                "canvas_mcp.core.cache.get_course_code",
+                new_callable=AsyncMock,
+                return_value=None,
+            ),
+        ):
+            assert await resolve_course(999) == ("999", "999")
+
+
+class TestGetCourseStudents:
+    """Test cached roster lookups."""
+
+    async def test_roster_fetched_once_per_course(self):
+        """Repeat lookups reuse the cached roster until cleared."""
+        roster = [{"id": 1, "name": "Alice"}]
+        with patch(
+            "canvas_mcp.core.cache.fetch_all_paginated_results",
+            new_callable=AsyncMock,
+            return_value=roster,
+        ) as mock_fetch:
+            assert await get_course_students("12345") == roster
+            assert await get_course_students("12345") == roster
+            clear_ttl_caches(get_course_students)
+            await get_course_students("12345")
+
+        assert mock_fetch.await_count == 2
+        mock_fetch.assert_awaited_with(
+            "/courses/12345/users",
+            {"enrollment_type[]": "student", "per_page": 100},
+        )
+
+
+class TestGetDiscussionEntries:
+    """Test cached discussion entry lookups."""
+
+    async def test_entries_shared_per_topic(self):
+        """Entries are fetched once per course and topic."""
+        with patch(
+            "canvas_mcp.core.cache.fetch_all_paginated_results",
+            new_callable=AsyncMock,
+            return_value=[{"id": 1}],
+        ) as mock_fetch:
+            await get_discussion_entries("12345", "444")
+            await get_discussion_entries("12345", "444")
+            await get_discussion_entries("12345", "555")
+
+        assert mock_fetch.await_count == 2
+        mock_fetch.assert_any_await(
+            "/courses/12345/discussion_topics/444/entries", {"per_page": 100}
+        )
+
+
+class TestGetDiscussionTopics:
+    """Test cached discussion topic lists."""
+
+    async def test_burst_shares_one_fetch(self):
+        """Concurrent and back-to-back lookups for a course fetch once."""
+        with patch(
+            "canvas_mcp.core.cache.fetch_all_paginated_results",
+            new_callable=AsyncMock,
+            return_value=[{"id": 444, "title": "Week 1"}],
+        ) as mock_fetch:
+            await asyncio.gather(*(get_discussion_topics("12345") for _ in range(3)))
+            await get_discussion_topics("12345")
+
+        mock_fetch.assert_awaited_once_with(
+            "/courses/12345/discussion_topics", {"per_page": 100}
+        )
+
+
+class TestEvictTtlCache:
+    """Test dropping one cached call."""
+
+    async def test_evicts_only_the_given_arguments(self):
+        """Other topics' entries stay cached after one topic is evicted."""
+        with patch(
+            "canvas_mcp.core.cache.fetch_all_paginated_results",
+            new_callable=AsyncMock,
+            return_value=[{"id": 1}],
+        ) as mock_fetch:
+            await get_discussion_entries("12345", 1)
+            await get_discussion_entries("12345", 2)
+            evict_ttl_cache(get_discussion_entries, "12345", 1)
+            await get_discussion_entries("12345", 1)
+            await get_discussion_entries("12345", 2)
+
+        assert [c.args[0] for c in mock_fetch.await_args_list] == [
+            "/courses/12345/discussion_topics/1/entries",
+            "/courses/12345/discussion_topics/2/entries",
+            "/courses/12345/discussion_topics/1/entries",
+        ]
+
+
+class TestSearchCourseAssignments:
+    """Test cached assignment searches."""
+
+    async def test_repeat_search_served_until_cleared(self):
+        """A repeated search reuses Canvas's matches until a change clears them."""
+        with patch(
+            "canvas_mcp.core.cache.fetch_all_paginated_results",
+            new_callable=AsyncMock,
+            return_value=[{"id": 1, "name": "Midterm"}],
+        ) as mock_fetch:
+            await search_course_assignments("12345", "mid")
+            await search_course_assignments("12345", "mid")
+            clear_ttl_caches(search_course_assignments)
+            await search_course_assignments("12345", "mid")
+
+        assert mock_fetch.await_count == 2
+        mock_fetch.assert_awaited_with(
+            "/courses/12345/assignments", {"per_page": 100, "search_term": "mid"}
+        )
+
+
+class TestGetQuiz:
+    """Test cached quiz lookups."""
+
+    async def test_quiz_fetched_once_until_cleared(self):
+        """Repeat reads reuse the quiz until a change clears the cache."""
+        with patch(
+            "canvas_mcp.core.cache.make_canvas_request",
+            new_callable=AsyncMock,
+            return_value={"id": 5, "title": "Midterm"},
+        ) as mock_request:
+            await get_quiz("12345", 5)
+            await get_quiz("12345", 5)
+            clear_ttl_caches(get_quiz)
+            await get_quiz("12345", 5)
+
+        assert mock_request.await_count == 2
+        mock_request.assert_awaited_with("get", "/courses/12345/quizzes/5")
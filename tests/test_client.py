@@ -0,0 +1,475 @@
+"""Tests for the Canvas HTTP client helpers."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from canvas_mcp.core import client as client_module
+from canvas_mcp.core.client import (
+    CanvasAPIError,
+    fetch_all_paginated_results,
+    iter_paginated_results,
+    make_canvas_request,
+    upload_file_multipart,
+)
+
+BASE_URL = "https://canvas.example.com/api/v1"
+
+
+@pytest.fixture
+def serve_pages():
+    """Route the shared HTTP client to an in-memory handler."""
+
+    def install(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return patch.object(client_module, "_get_http_client", return_value=client)
+
+    with patch("canvas_mcp.core.config.get_config") as mock_config:
+        mock_config.return_value.api_base_url = BASE_URL
+        mock_config.return_value.enable_data_anonymization = False
+        mock_config.return_value.max_concurrent_requests = 10
+        yield install
+
+
+def _paged_handler(pages: dict[str, tuple[list, str | None]]):
+    """Serve ``pages`` keyed by URL path, linking each to the next."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body, next_path = pages[request.url.path]
+        headers = {"link": f'<{BASE_URL}{next_path}>; rel="next"'} if next_path else {}
+        return httpx.Response(200, json=body, headers=headers)
+
+    return handler
+
+
+class TestFetchAllPaginatedResults:
+    """Test Link-header pagination."""
+
+    async def test_follows_next_links(self, serve_pages):
+        """All pages are fetched and concatenated in order."""
+        handler = _paged_handler(
+            {
+                "/api/v1/courses": ([{"id": 1}, {"id": 2}], "/page2"),
+                "/api/v1/page2": ([{"id": 3}], "/page3"),
+                "/api/v1/page3": ([{"id": 4}], None),
+            }
+        )
+
+        with serve_pages(handler):
+            result = await fetch_all_paginated_results("/courses")
+
+        assert [item["id"] for item in result] == [1, 2, 3, 4]
+
+    async def test_stops_on_empty_page(self, serve_pages):
+        """An empty page ends pagination even if a next link is present."""
+        handler = _paged_handler(
+            {
+                "/api/v1/courses": ([{"id": 1}], "/page2"),
+                "/api/v1/page2": ([], "/page3"),
+            }
+        )
+
+        with serve_pages(handler):
+            result = await fetch_all_paginated_results("/courses")
+
+        assert result == [{"id": 1}]
+
+    async def test_http_error_returns_error_dict(self, serve_pages):
+        """HTTP errors on a later page are reported as an error dict."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/v1/courses":
+                return httpx.Response(
+                    200,
+                    json=[{"id": 1}],
+                    headers={"link": f'<{BASE_URL}/page2>; rel="next"'},
+                )
+            return httpx.Response(500, json={"errors": "boom"})
+
+        with serve_pages(handler):
+            result = await fetch_all_paginated_results("/courses")
+
+        assert "error" in result
+        assert "500" in result["error"]
+
+    async def test_numbered_pages_fetched_concurrently(self, serve_pages):
+        """With a numbered last link, later pages overlap but stay in order."""
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            page = int(request.url.params.get("page", "1"))
+            if page == 1:
+                last = f"{BASE_URL}/courses?page=4&per_page=100"
+                return httpx.Response(
+                    200,
+                    json=[{"id": 1}],
+                    headers={
+                        "link": f'<{BASE_URL}/courses?page=2&per_page=100>; rel="next", '
+                        f'<{last}>; rel="last"'
+                    },
+                )
+            active += 1
+            peak = max(peak, active)
+            # Later pages finish first to prove results keep page order
+            await asyncio.sleep(0.01 * (5 - page))
+            active -= 1
+            return httpx.Response(200, json=[{"id": page}])
+
+        with serve_pages(handler):
+            result = await fetch_all_paginated_results("/courses")
+
+        assert result == [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}]
+        assert peak == 3
+
+    async def test_result_key_unwraps_object_pages(self, serve_pages):
+        """Pages wrapped in an object are followed and unwrapped."""
+        handler = _paged_handler(
+            {
+                "/api/v1/quizzes": ({"quiz_submissions": [{"id": 1}]}, "/page2"),
+                "/api/v1/page2": ({"quiz_submissions": [{"id": 2}]}, None),
+            }
+        )
+
+        with serve_pages(handler):
+            result = await fetch_all_paginated_results(
+                "/quizzes", result_key="quiz_submissions"
+            )
+
+        assert result == [{"id": 1}, {"id": 2}]
+
+
+class TestIterPaginatedResults:
+    """Test streaming pagination."""
+
+    async def test_yields_items_across_pages(self, serve_pages):
+        """Items from every page are yielded in order."""
+        handler = _paged_handler(
+            {
+                "/api/v1/courses": ([{"id": 1}, {"id": 2}], "/page2"),
+                "/api/v1/page2": ([{"id": 3}], None),
+            }
+        )
+
+        with serve_pages(handler):
+            ids = [item["id"] async for item in iter_paginated_results("/courses")]
+
+        assert ids == [1, 2, 3]
+
+    async def test_error_raises_after_earlier_items(self, serve_pages):
+        """A failing page raises CanvasAPIError carrying the error dict."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/api/v1/courses":
+                return httpx.Response(
+                    200,
+                    json=[{"id": 1}],
+                    headers={"link": f'<{BASE_URL}/page2>; rel="next"'},
+                )
+            return httpx.Response(500, json={"errors": "boom"})
+
+        seen = []
+        with serve_pages(handler), pytest.raises(CanvasAPIError) as excinfo:
+            async for item in iter_paginated_results("/courses"):
+                seen.append(item["id"])
+
+        assert seen == [1]
+        assert "500" in excinfo.value.response["error"]
+
+
+class TestPackageExports:
+    """Test the canvas_mcp.core public names."""
+
+    def test_star_import_resolves_every_name(self):
+        """Every name in __all__ is importable from the package."""
+        namespace: dict = {}
+        exec("from canvas_mcp.core import *", namespace)
+
+        import canvas_mcp.core as core
+
+        assert set(core.__all__) <= namespace.keys()
+        assert namespace["iter_paginated_pages"] is client_module.iter_paginated_pages
+
+
+class TestMakeCanvasRequest:
+    """Test single Canvas API requests."""
+
+    async def test_http_error_includes_status_code(self, serve_pages):
+        """HTTP errors carry the response status for callers to branch on."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(404, json={"errors": "missing"})
+
+        with serve_pages(handler):
+            result = await make_canvas_request("put", "/courses/1/late_policy")
+
+        assert result["status_code"] == 404
+        assert "404" in result["error"]
+
+    async def test_json_body_encoding(self, serve_pages):
+        """Write bodies are sent as JSON, with non-string keys stringified."""
+        received = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            received["type"] = request.headers.get("Content-Type")
+            received["body"] = json.loads(request.content)
+            return httpx.Response(200, json={"ok": True})
+
+        with serve_pages(handler):
+            await make_canvas_request("put", "/courses/1/x", data={1: {"a": "é"}})
+
+        assert received == {"type": "application/json", "body": {"1": {"a": "é"}}}
+
+
+class TestRequestCoalescing:
+    """Test that concurrent identical GETs share one request."""
+
+    async def test_concurrent_gets_share_request(self, serve_pages):
+        """Identical in-flight GETs hit the network once."""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(str(request.url))
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"id": 1})
+
+        with serve_pages(handler):
+            results = await asyncio.gather(
+                make_canvas_request("get", "/courses/1", params={"a": 1}),
+                make_canvas_request("get", "/courses/1", params={"a": 1}),
+                make_canvas_request("get", "/courses/1", params={"a": 2}),
+            )
+
+        assert results == [{"id": 1}] * 3
+        assert len(seen) == 2
+
+    async def test_concurrent_paginated_fetches_share_pages(self, serve_pages):
+        """Identical in-flight paginated fetches walk the pages once."""
+        seen = []
+        pages = _paged_handler(
+            {
+                "/api/v1/courses": ([{"id": 1}], "/page2"),
+                "/api/v1/page2": ([{"id": 2}], None),
+            }
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.path)
+            return pages(request)
+
+        with serve_pages(handler):
+            first, second = await asyncio.gather(
+                fetch_all_paginated_results("/courses"),
+                fetch_all_paginated_results("/courses"),
+            )
+
+        assert first == second == [{"id": 1}, {"id": 2}]
+        assert seen == ["/api/v1/courses", "/api/v1/page2"]
+
+    async def test_coalesced_callers_get_their_own_copy(self, serve_pages):
+        """Mutating a shared result does not leak into the other caller's."""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"id": 1, "tags": ["a"]})
+
+        with serve_pages(handler):
+            first, second = await asyncio.gather(
+                make_canvas_request("get", "/courses/1"),
+                make_canvas_request("get", "/courses/1"),
+            )
+
+        first["tags"].append("b")
+        assert second == {"id": 1, "tags": ["a"]}
+        assert len(seen) == 1
+
+    async def test_conditional_gets_are_not_shared(self, serve_pages):
+        """A conditional GET does not join a plain one for the same URL."""
+        seen = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.url.path)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"id": 1})
+
+        with serve_pages(handler):
+            await asyncio.gather(
+                make_canvas_request("get", "/courses/1"),
+                make_canvas_request("get", "/courses/1", conditional=True),
+            )
+
+        assert len(seen) == 2
+
+    async def test_writes_are_not_coalesced(self, serve_pages):
+        """Non-GET requests are always sent."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.method)
+            return httpx.Response(200, json={"ok": True})
+
+        with serve_pages(handler):
+            await asyncio.gather(
+                make_canvas_request("post", "/courses/1/x", data={"a": 1}),
+                make_canvas_request("post", "/courses/1/x", data={"a": 1}),
+            )
+
+        assert seen == ["POST", "POST"]
+
+
+class TestRequestLimit:
+    """Test the cap on concurrent requests."""
+
+    async def test_requests_wait_for_a_free_slot(self, serve_pages):
+        """No more than MAX_CONCURRENT_REQUESTS requests are on the wire."""
+        from canvas_mcp.core import config as config_module
+
+        config_module.get_config.return_value.max_concurrent_requests = 2
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json={"ok": True})
+
+        with serve_pages(handler):
+            results = await asyncio.gather(
+                *(make_canvas_request("get", f"/courses/{i}") for i in range(5))
+            )
+
+        assert results == [{"ok": True}] * 5
+        assert peak == 2
+
+    async def test_paginated_pages_wait_for_a_free_slot(self, serve_pages):
+        """Page downloads count against the same cap as single requests."""
+        from canvas_mcp.core import config as config_module
+
+        config_module.get_config.return_value.max_concurrent_requests = 2
+        active = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json=[{"id": 1}])
+
+        with serve_pages(handler):
+            results = await asyncio.gather(
+                *(fetch_all_paginated_results(f"/courses/{i}/users") for i in range(3)),
+                make_canvas_request("get", "/courses/9"),
+            )
+
+        assert results[:3] == [[{"id": 1}]] * 3
+        assert peak == 2
+
+
+class TestConditionalRequests:
+    """Test ETag revalidation of conditional GETs."""
+
+    async def test_not_modified_returns_cached_body(self, serve_pages):
+        """A 304 reply reuses the body stored with the matching ETag."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json={"id": 7}, headers={"ETag": '"v1"'})
+
+        with (
+            patch.dict(client_module._etag_cache, clear=True),
+            serve_pages(handler),
+        ):
+            first = await make_canvas_request("get", "/courses/1/x", conditional=True)
+            second = await make_canvas_request("get", "/courses/1/x", conditional=True)
+
+        assert first == second == {"id": 7}
+        assert seen == [None, '"v1"']
+
+    async def test_unconditional_gets_skip_etags(self, serve_pages):
+        """Plain GETs neither send nor store ETags."""
+        seen = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen.append(request.headers.get("If-None-Match"))
+            return httpx.Response(200, json={"id": 7}, headers={"ETag": '"v1"'})
+
+        with (
+            patch.dict(client_module._etag_cache, clear=True),
+            serve_pages(handler),
+        ):
+            await make_canvas_request("get", "/courses/1/x")
+            await make_canvas_request("get", "/courses/1/x")
+            assert client_module._etag_cache == {}
+
+        assert seen == [None, None]
+
+
+class TestGetHttpClient:
+    """Test construction of the shared HTTP client."""
+
+    @pytest.mark.parametrize("http2", [True, False])
+    def test_http2_follows_h2_availability(self, http2):
+        """HTTP/2 is enabled only when h2 is importable; limits are pooled."""
+        with (
+            patch.object(client_module, "http_client", None),
+            patch.object(client_module, "_HTTP2_AVAILABLE", http2),
+            patch.object(client_module.httpx, "AsyncClient") as mock_client,
+            patch("canvas_mcp.core.config.get_config"),
+        ):
+            client_module._get_http_client()
+
+        kwargs = mock_client.call_args.kwargs
+        assert kwargs["http2"] is http2
+        assert kwargs["limits"].max_connections == 20
+        assert kwargs["limits"].max_keepalive_connections == 20
+
+
+class TestUploadFileMultipart:
+    """Test the direct-to-storage upload step."""
+
+    async def test_streams_file_with_upload_params(self, tmp_path):
+        """The file and form fields are posted as one multipart body."""
+        upload = tmp_path / "essay.txt"
+        upload.write_bytes(b"chunk" * 1000)
+        received = {}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            received["body"] = await request.aread()
+            return httpx.Response(201, json={"id": 42})
+
+        real_client = httpx.AsyncClient
+
+        def mock_client(**kwargs):
+            return real_client(transport=httpx.MockTransport(handler), **kwargs)
+
+        with patch.object(client_module.httpx, "AsyncClient", mock_client):
+            result = await upload_file_multipart(
+                "https://uploads.example.com/", {"key": "abc"}, str(upload)
+            )
+
+        assert result == {"id": 42}
+        assert b'name="key"' in received["body"]
+        assert b'filename="essay.txt"' in received["body"]
+        assert b"chunk" * 1000 in received["body"]
+
+    async def test_missing_file_returns_error(self, tmp_path):
+        """A missing file is reported without making a request."""
+        result = await upload_file_multipart(
+            "https://uploads.example.com/", {}, str(tmp_path / "nope.txt")
+        )
+
+        assert "File not found" in result["error"]
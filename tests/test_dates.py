@@ -3,7 +3,11 @@
 import datetime
 from unittest.mock import patch
 
-from canvas_mcp.core.dates import format_date_smart, format_datetime_compact
+from canvas_mcp.core.dates import (
+    format_date,
+    format_date_smart,
+    format_datetime_compact,
+)
 
 
 class TestFormatDateSmartRelative:
@@ -227,3 +231,20 @@ class TestFormatDatetimeCompact:
         """None input should return '-'."""
         result = format_datetime_compact(None)
         assert result == "-"
+
+
+class TestFormatDate:
+    """Test memoized ISO 8601 formatting."""
+
+    def test_formats_and_caches(self):
+        """Repeat inputs are served from the cache with identical output."""
+        format_date.cache_clear()
+
+        assert format_date("2024-01-15T14:30:00.000Z") == "2024-01-15T14:30:00Z"
+        assert format_date("2024-01-15T14:30:00.000Z") == "2024-01-15T14:30:00Z"
+        assert format_date.cache_info().hits == 1
+
+    def test_empty_is_na(self):
+        """None and empty strings format as N/A."""
+        assert format_date(None) == "N/A"
+        assert format_date("") == "N/A"
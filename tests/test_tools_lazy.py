@@ -0,0 +1,166 @@
+"""Tests for the lazy tools package and its registration driver."""
+
+import importlib
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import canvas_mcp
+from canvas_mcp import tools
+
+
+@pytest.fixture
+def fresh_tools(monkeypatch):
+    """Import a fresh, non-eager copy of the tools package."""
+    monkeypatch.delenv("CANVAS_MCP_EAGER_IMPORT", raising=False)
+    monkeypatch.setattr(canvas_mcp, "tools", canvas_mcp.tools)
+    monkeypatch.delitem(sys.modules, "canvas_mcp.tools")
+    return importlib.import_module("canvas_mcp.tools")
+
+
+class TestLazyResolution:
+    """Test that register functions resolve lazily and are cached."""
+
+    def test_not_resolved_at_import(self, fresh_tools):
+        """Names are absent from the module dict right after import."""
+        assert "register_course_tools" not in fresh_tools.__dict__
+
+    def test_first_access_caches_in_globals(self, fresh_tools):
+        """First access stores the function in the module dict."""
+        func = fresh_tools.register_course_tools
+
+        assert fresh_tools.__dict__["register_course_tools"] is func
+
+    def test_second_access_skips_import(self, fresh_tools):
+        """Cached names are not re-imported on later access."""
+        first = fresh_tools.register_course_tools
+
+        with patch("importlib.import_module") as mock_import:
+            second = fresh_tools.register_course_tools
+
+        mock_import.assert_not_called()
+        assert second is first
+
+    def test_compound_group_resolves_together(self, fresh_tools):
+        """Resolving one member of a compound group caches its companion."""
+        assert callable(fresh_tools.register_discussion_tools)
+
+        assert "register_discussion_analytics_tools" in fresh_tools.__dict__
+        assert "register_peer_review_tools" not in fresh_tools.__dict__
+
+    def test_discussion_group_skips_rubric_grading(self, fresh_tools, monkeypatch):
+        """Loading the discussions group does not import the rubric tools."""
+        for name in (
+            "canvas_mcp.tools.discussions",
+            "canvas_mcp.tools.discussion_analytics",
+            "canvas_mcp.tools.rubric_grading",
+        ):
+            monkeypatch.delitem(sys.modules, name, raising=False)
+
+        assert callable(fresh_tools.register_discussion_tools)
+
+        assert "canvas_mcp.tools.discussion_analytics" in sys.modules
+        assert "canvas_mcp.tools.rubric_grading" not in sys.modules
+
+    def test_unknown_name_raises_attribute_error(self, fresh_tools):
+        """Names outside the manifest raise AttributeError."""
+        assert not hasattr(fresh_tools, "register_nothing_tools")
+
+    def test_dir_lists_lazy_names(self, fresh_tools):
+        """dir() includes names that have not been resolved yet."""
+        assert "register_quiz_tools" in dir(fresh_tools)
+
+
+class TestRegisterAllTools:
+    """Test register_all_tools group selection."""
+
+    def test_registers_every_group_in_order(self):
+        """With no filters every group is registered in manifest order."""
+        with patch.object(tools, "__getattr__") as mock_resolve:
+            registered = tools.register_all_tools(MagicMock())
+
+        assert registered == list(tools.TOOL_GROUPS)
+        assert mock_resolve.call_count == len(tools._LAZY)
+
+    def test_only_limits_groups(self):
+        """Only the requested groups are resolved and registered."""
+        with patch.object(tools, "__getattr__") as mock_resolve:
+            registered = tools.register_all_tools(
+                MagicMock(), only=["courses", "quizzes"]
+            )
+
+        assert registered == ["courses", "quizzes"]
+        resolved = [call.args[0] for call in mock_resolve.call_args_list]
+        assert resolved == ["register_course_tools", "register_quiz_tools"]
+
+    def test_skip_excludes_groups(self):
+        """Skipped groups are never resolved."""
+        with patch.object(tools, "__getattr__") as mock_resolve:
+            registered = tools.register_all_tools(
+                MagicMock(), skip=["student_tools", "code_execution"]
+            )
+
+        assert "student_tools" not in registered
+        assert "code_execution" not in registered
+        resolved = [call.args[0] for call in mock_resolve.call_args_list]
+        assert "register_student_tools" not in resolved
+        assert "register_code_execution_tools" not in resolved
+
+    def test_compound_group_registers_both(self):
+        """Selecting a compound group registers every member."""
+        with patch.object(tools, "__getattr__") as mock_resolve:
+            registered = tools.register_all_tools(MagicMock(), only=["peer_reviews"])
+
+        assert registered == ["peer_reviews"]
+        resolved = [call.args[0] for call in mock_resolve.call_args_list]
+        assert resolved == [
+            "register_peer_review_tools",
+            "register_peer_review_comment_tools",
+        ]
+
+    def test_unknown_group_raises(self):
+        """Unknown group names are rejected."""
+        with pytest.raises(ValueError, match="not_a_group"):
+            tools.register_all_tools(MagicMock(), only=["not_a_group"])
+
+
+class TestServerToolSelection:
+    """Test how the server applies CANVAS_MCP_TOOLS."""
+
+    @pytest.mark.parametrize(
+        "tool_groups,expected_only",
+        [
+            pytest.param(["courses", "bogus"], ["courses"], id="drops_unknown"),
+            pytest.param(["bogus", "also_bogus"], None, id="all_unknown"),
+            pytest.param([], None, id="unset"),
+        ],
+    )
+    def test_only_passed_to_register_all_tools(self, tool_groups, expected_only):
+        """Unknown groups are dropped; if none remain every group is registered."""
+        from canvas_mcp import server
+
+        config = SimpleNamespace(user_type="all", tool_groups=tool_groups)
+        with (
+            patch.object(server, "get_config", return_value=config),
+            patch.object(server, "register_resources_and_prompts"),
+            patch.object(tools, "register_all_tools", return_value=[]) as mock_register,
+        ):
+            server.register_all_tools(MagicMock())
+
+        assert mock_register.call_args.kwargs["only"] == expected_only
+
+
+class TestManifest:
+    """Test that __all__ and TOOL_GROUPS stay in sync with the manifest."""
+
+    def test_all_covers_manifest(self):
+        """Every lazy export is listed in __all__."""
+        assert set(tools._LAZY) <= set(tools.__all__)
+
+    def test_every_export_resolves(self):
+        """Every name in __all__ resolves to a callable."""
+        for name in tools.__all__:
+            if name != "TOOL_GROUPS":
+                assert callable(getattr(tools, name)), name
@@ -0,0 +1,104 @@
+"""Shared fixtures for the tool tests."""
+
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from canvas_mcp.core.client import CanvasAPIError
+from canvas_mcp.tools.discussion_analytics import register_discussion_analytics_tools
+from canvas_mcp.tools.gradebook import register_gradebook_tools
+from canvas_mcp.tools.quizzes import register_quiz_tools
+from canvas_mcp.tools.search_helpers import register_search_helper_tools
+
+
+def _capture_tools(register) -> dict:
+    """Register a tool module on a fresh FastMCP and return its functions."""
+    mcp = FastMCP("test")
+    register(mcp)
+    return {name: tool.fn for name, tool in mcp._tool_manager._tools.items()}
+
+
+@pytest.fixture(scope="module")
+def _patched_canvas(request):
+    """Patch a tool module's Canvas calls once per test module.
+
+    The test module names the tool module in ``_TOOL_MODULE`` and maps each
+    patched name to its mock class in ``_PATCHED``.
+    """
+    target = f"canvas_mcp.tools.{request.module._TOOL_MODULE}"
+    with ExitStack() as stack:
+        yield {
+            name: stack.enter_context(patch(f"{target}.{name}", new_callable=mock_type))
+            for name, mock_type in request.module._PATCHED.items()
+        }
+
+
+@pytest.fixture
+def canvas_mocks(_patched_canvas):
+    """The patched Canvas mocks, cleared of the previous test's setup."""
+    for mock in _patched_canvas.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _patched_canvas
+
+
+def _paginated_replay(mock_fetch):
+    """Build an iter_paginated_results stand-in that replays ``mock_fetch``.
+
+    Tests queue full responses (a list, or an error dict) on ``mock_fetch``;
+    the stream awaits it with the endpoint and params, raises CanvasAPIError
+    for an error dict, and yields the items.
+    """
+
+    async def iter_results(endpoint, params=None, *, result_key=None):
+        results = await mock_fetch(endpoint, params)
+        if isinstance(results, dict) and "error" in results:
+            raise CanvasAPIError(results)
+        if result_key is not None:
+            results = results[result_key]
+        for item in results:
+            yield item
+
+    return iter_results
+
+
+@pytest.fixture
+def paginated_replay():
+    """The replay stand-in factory for patched iter_paginated_results."""
+    return _paginated_replay
+
+
+@pytest.fixture(scope="session")
+def registered_tools():
+    """Tool functions by module and name, registered once per test run."""
+    return {
+        "discussion_analytics": _capture_tools(register_discussion_analytics_tools),
+        "gradebook": _capture_tools(register_gradebook_tools),
+        "quizzes": _capture_tools(register_quiz_tools),
+        "search_helpers": _capture_tools(register_search_helper_tools),
+    }
+
+
+@pytest.fixture
+def discussion_tools(registered_tools):
+    """Discussion analytics tool functions by name."""
+    return registered_tools["discussion_analytics"]
+
+
+@pytest.fixture
+def gradebook_tools(registered_tools):
+    """Gradebook tool functions by name."""
+    return registered_tools["gradebook"]
+
+
+@pytest.fixture
+def quiz_tools(registered_tools):
+    """Quiz tool functions by name."""
+    return registered_tools["quizzes"]
+
+
+@pytest.fixture
+def search_tools(registered_tools):
+    """Search helper tool functions by name."""
+    return registered_tools["search_helpers"]
@@ -7,75 +7,163 @@ Includes tests for:
 - export_discussion_data
 """
 
+from unittest.mock import AsyncMock, call, patch
+
 import pytest
-from unittest.mock import AsyncMock, patch
+
+# Roster entries shared by the tests; tools only read them
+ALICE = {"id": 1001, "name": "Alice"}
+BOB = {"id": 1002, "name": "Bob"}
+CHARLIE = {"id": 1003, "name": "Charlie"}
+
+# Columns and values the CSV export must contain
+EXPECTED_CSV_TOKENS = (
+    "entry_id",
+    "user_id",
+    "user_name",
+    "type",
+    "message_preview",
+    "Alice",
+    "Bob",
+    "post",
+    "reply",
+)
+
+
+# Names patched in canvas_mcp.tools.discussion_analytics by the shared
+# _patched_canvas fixture, with the mock each needs
+_TOOL_MODULE = "discussion_analytics"
+_PATCHED = {
+    "resolve_course": AsyncMock,
+    "get_course_students": AsyncMock,
+    "get_discussion_entries": AsyncMock,
+    "make_canvas_request": AsyncMock,
+    "poll_canvas_progress": AsyncMock,
+}
 
 
 @pytest.fixture
-def mock_canvas_api():
+def mock_canvas_api(canvas_mocks):
     """Fixture to mock Canvas API calls for discussion analytics tools."""
-    with (
-        patch("canvas_mcp.tools.discussion_analytics.get_course_id") as mock_get_id,
-        patch("canvas_mcp.tools.discussion_analytics.get_course_code") as mock_get_code,
-        patch(
-            "canvas_mcp.tools.discussion_analytics.fetch_all_paginated_results"
-        ) as mock_fetch,
-        patch(
-            "canvas_mcp.tools.discussion_analytics.make_canvas_request"
-        ) as mock_request,
-    ):
+    mock_resolve = canvas_mocks["resolve_course"]
+    mock_students = canvas_mocks["get_course_students"]
+    mock_entries = canvas_mocks["get_discussion_entries"]
+    mock_request = canvas_mocks["make_canvas_request"]
+    mock_poll = canvas_mocks["poll_canvas_progress"]
+
+    mock_resolve.return_value = ("12345", "CS101")
+
+    # Rosters and entries are served through one paginated fetch mock so
+    # tests can queue students and entries in request order
+    mock_fetch = AsyncMock(return_value=[])
+
+    async def fetch_students(course_id, enrollment_type="student"):
+        return await mock_fetch(
+            f"/courses/{course_id}/users",
+            {"enrollment_type[]": enrollment_type, "per_page": 100},
+        )
 
-        mock_get_id.return_value = "12345"
-        mock_get_code.return_value = "CS101"
+    async def fetch_entries(course_id, topic_id):
+        return await mock_fetch(
+            f"/courses/{course_id}/discussion_topics/{topic_id}/entries",
+            {"per_page": 100},
+        )
 
-        yield {
-            "get_course_id": mock_get_id,
-            "get_course_code": mock_get_code,
-            "fetch_all_paginated_results": mock_fetch,
-            "make_canvas_request": mock_request,
-        }
+    # Topic lookups return this unless a test queues its own responses
+    mock_request.return_value = {"title": "Test Discussion"}
+    mock_students.side_effect = fetch_students
+    mock_entries.side_effect = fetch_entries
+    mock_poll.return_value = {
+        "completed": True,
+        "workflow_state": "completed",
+        "progress_id": 1,
+        "error": None,
+    }
 
+    return {
+        "resolve_course": mock_resolve,
+        "fetch_all_paginated_results": mock_fetch,
+        "make_canvas_request": mock_request,
+        "poll_canvas_progress": mock_poll,
+        "get_discussion_entries": mock_entries,
+    }
 
-def get_tool_function(tool_name: str):
-    """Get a tool function by name from the registered tools."""
-    from mcp.server.fastmcp import FastMCP
-    from canvas_mcp.tools.discussion_analytics import (
-        register_discussion_analytics_tools,
-    )
 
-    mcp = FastMCP("test")
-    captured_functions = {}
+class TestMessagePreview:
+    """Tests for the CSV export message preview helper."""
+
+    def test_strips_tags_and_truncates(self):
+        """Test that tags are removed before truncating to 200 characters."""
+        from canvas_mcp.tools.discussion_analytics import _message_preview
+
+        assert _message_preview("<p>Hello <b>world</b></p>") == "Hello world"
+        assert _message_preview("<p>" + "x" * 500 + "</p>") == "x" * 200
 
-    original_tool = mcp.tool
+    def test_long_message_drops_split_tag(self):
+        """Test that a tag cut by the scan limit does not leak into the preview."""
+        from canvas_mcp.tools.discussion_analytics import _message_preview
 
-    def capturing_tool(*args, **kwargs):
-        decorator = original_tool(*args, **kwargs)
+        message = "<i></i>" * 285 + "ab<span class='x'>" + "tail" * 1000
 
-        def wrapper(fn):
-            captured_functions[fn.__name__] = fn
-            return decorator(fn)
+        assert _message_preview(message) == "ab"
 
-        return wrapper
 
-    mcp.tool = capturing_tool
-    register_discussion_analytics_tools(mcp)
+class TestCountParticipation:
+    """Tests for the participation counting helper."""
 
-    return captured_functions.get(tool_name)
+    def test_counts_replies_at_any_depth(self):
+        """Test that deeply nested replies are all counted once."""
+        from canvas_mcp.tools.discussion_analytics import _count_participation
+
+        view = [
+            {
+                "user_id": 1,
+                "replies": [
+                    {
+                        "user_id": 2,
+                        "replies": [
+                            {"user_id": 3, "replies": [{"user_id": 2}]},
+                        ],
+                    }
+                ],
+            },
+            {"user_id": 4, "parent_id": 1},
+        ]
+
+        assert list(_count_participation(view).items()) == [
+            ("1", 1, 0),
+            ("4", 0, 1),
+            ("2", 0, 2),
+            ("3", 0, 1),
+        ]
+
+    def test_counts_recent_replies(self):
+        """Test that entries-list recent_replies count as replies."""
+        from canvas_mcp.tools.discussion_analytics import _count_participation
+
+        entries = [{"user_id": 1, "recent_replies": [{"user_id": 1}, {"user_id": 2}]}]
+
+        participation = _count_participation(entries)
+
+        assert participation.counts("1") == (1, 1)
+        assert participation.counts("2") == (0, 1)
+        assert participation.counts("3") == (0, 0)
 
 
 class TestGetDiscussionParticipationSummary:
     """Tests for get_discussion_participation_summary tool."""
 
-    @pytest.mark.asyncio
-    async def test_participation_summary_categorizes_students(self, mock_canvas_api):
+    async def test_participation_summary_categorizes_students(
+        self, mock_canvas_api, discussion_tools
+    ):
         """Test that participation summary correctly categorizes students."""
         # Mock students
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
             # Students
             [
-                {"id": 1001, "name": "Alice"},
-                {"id": 1002, "name": "Bob"},
-                {"id": 1003, "name": "Charlie"},
+                ALICE,
+                BOB,
+                CHARLIE,
                 {"id": 1004, "name": "Diana"},
             ],
             # Discussion entries
@@ -96,7 +184,7 @@ class TestGetDiscussionParticipationSummary:
             "title": "Week 1 Discussion"
         }
 
-        get_summary = get_tool_function("get_discussion_participation_summary")
+        get_summary = discussion_tools["get_discussion_participation_summary"]
         result = await get_summary(course_identifier="12345", topic_id="444")
 
         assert "Week 1 Discussion" in result
@@ -105,72 +193,161 @@ class TestGetDiscussionParticipationSummary:
         assert "Diana" in result  # Replied only
         assert "Silent" in result
 
-    @pytest.mark.asyncio
-    async def test_participation_summary_counts(self, mock_canvas_api):
+    async def test_participation_summary_counts(
+        self, mock_canvas_api, discussion_tools
+    ):
         """Test that summary shows correct participation counts."""
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}, {"id": 1002, "name": "Bob"}],
+            [ALICE, BOB],
             [{"user_id": 1001, "recent_replies": [{"user_id": 1001}]}],
         ]
-        mock_canvas_api["make_canvas_request"].return_value = {
-            "title": "Test Discussion"
-        }
 
-        get_summary = get_tool_function("get_discussion_participation_summary")
+        get_summary = discussion_tools["get_discussion_participation_summary"]
         result = await get_summary(course_identifier="12345", topic_id="444")
 
         assert "1/2 students participated" in result or "50%" in result
 
-    @pytest.mark.asyncio
-    async def test_participation_summary_silent_students_ids(self, mock_canvas_api):
+    async def test_participation_summary_silent_students_ids(
+        self, mock_canvas_api, discussion_tools
+    ):
         """Test that silent student IDs are provided for messaging."""
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}, {"id": 1002, "name": "Bob"}],
+            [ALICE, BOB],
             [],  # No entries
         ]
-        mock_canvas_api["make_canvas_request"].return_value = {
-            "title": "Test Discussion"
-        }
 
-        get_summary = get_tool_function("get_discussion_participation_summary")
+        get_summary = discussion_tools["get_discussion_participation_summary"]
         result = await get_summary(course_identifier="12345", topic_id="444")
 
         assert "Silent" in result
         assert "1001,1002" in result or ("1001" in result and "1002" in result)
 
-    @pytest.mark.asyncio
-    async def test_participation_summary_error_students(self, mock_canvas_api):
-        """Test error handling when fetching students fails."""
-        mock_canvas_api["fetch_all_paginated_results"].return_value = {
-            "error": "Unauthorized"
-        }
+    async def test_participation_summary_ignores_non_students(
+        self, mock_canvas_api, discussion_tools
+    ):
+        """Test that posts by users outside the roster are not counted."""
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = [
+            [ALICE, BOB],
+            [
+                {"user_id": 9999, "recent_replies": [{"user_id": 1002}]},
+                {"user_id": 1001, "recent_replies": []},
+            ],
+        ]
 
-        get_summary = get_tool_function("get_discussion_participation_summary")
+        get_summary = discussion_tools["get_discussion_participation_summary"]
         result = await get_summary(course_identifier="12345", topic_id="444")
 
-        assert "Error fetching students" in result
-        assert "Unauthorized" in result
+        assert "2/2 students participated" in result
+        assert "Posted only: 1" in result
+        assert "Replied only: 1" in result
+        assert "9999" not in result
 
-    @pytest.mark.asyncio
-    async def test_participation_summary_error_entries(self, mock_canvas_api):
-        """Test error handling when fetching discussion entries fails."""
+    async def test_participation_summary_uses_threaded_view(
+        self, mock_canvas_api, discussion_tools
+    ):
+        """Test that a complete view replaces the paginated entries fetch."""
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}],  # Students succeed
-            {"error": "Not found"},  # Entries fail
+            [
+                ALICE,
+                BOB,
+                CHARLIE,
+            ],
+        ]
+        mock_canvas_api["make_canvas_request"].side_effect = [
+            {"title": "Threaded Discussion"},
+            {
+                "view": [
+                    {
+                        "id": 1,
+                        "user_id": 1001,
+                        "replies": [{"id": 2, "user_id": 1002}],
+                    }
+                ],
+                "new_entries": [{"id": 3, "user_id": 1003, "parent_id": 1}],
+            },
         ]
 
-        get_summary = get_tool_function("get_discussion_participation_summary")
+        get_summary = discussion_tools["get_discussion_participation_summary"]
         result = await get_summary(course_identifier="12345", topic_id="444")
 
-        assert "Error fetching discussion entries" in result
-        assert "Not found" in result
+        assert "Threaded Discussion" in result
+        assert "3/3 students participated" in result
+        assert "Posted only: 1" in result
+        assert "Replied only: 2" in result
+        mock_canvas_api["get_discussion_entries"].assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        "responses,expected_msg,expected_err",
+        [
+            pytest.param(
+                [{"error": "Unauthorized"}, {"error": "Unauthorized"}],
+                "Error fetching students",
+                "Unauthorized",
+                id="students",
+            ),
+            pytest.param(
+                [[ALICE], {"error": "Not found"}],
+                "Error fetching discussion entries",
+                "Not found",
+                id="entries",
+            ),
+        ],
+    )
+    async def test_participation_summary_error_handling(
+        self, mock_canvas_api, discussion_tools, responses, expected_msg, expected_err
+    ):
+        """Test that a failed fetch is reported with what was being fetched."""
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = responses
+
+        get_summary = discussion_tools["get_discussion_participation_summary"]
+        result = await get_summary(course_identifier="12345", topic_id="444")
+
+        assert expected_msg in result
+        assert expected_err in result
+
+    async def test_participation_summary_view_failure_is_not_fatal(
+        self, mock_canvas_api, discussion_tools
+    ):
+        """Test that a failing view request does not abort the summary."""
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = [
+            [ALICE],
+            [{"user_id": 1001, "recent_replies": []}],
+        ]
+        mock_canvas_api["make_canvas_request"].side_effect = [
+            {"title": "Test Discussion"},
+            RuntimeError("connection reset"),
+        ]
+
+        get_summary = discussion_tools["get_discussion_participation_summary"]
+        result = await get_summary(course_identifier="12345", topic_id="444")
+
+        assert "Test Discussion" in result
+        assert "Posted only: 1" in result
+
+    async def test_participation_summary_force_refresh_evicts_topic_and_roster(
+        self, mock_canvas_api, discussion_tools
+    ):
+        """Test that force_refresh drops the roster and this topic's entries."""
+        from canvas_mcp.tools import discussion_analytics
+
+        get_summary = discussion_tools["get_discussion_participation_summary"]
+        with patch(
+            "canvas_mcp.tools.discussion_analytics.evict_ttl_cache"
+        ) as mock_evict:
+            await get_summary(
+                course_identifier="12345", topic_id="444", force_refresh=True
+            )
+
+        assert mock_evict.call_args_list == [
+            call(discussion_analytics.get_course_students, "12345"),
+            call(mock_canvas_api["get_discussion_entries"], "12345", "444"),
+        ]
 
 
 class TestGradeDiscussionParticipation:
     """Tests for grade_discussion_participation tool."""
 
-    @pytest.mark.asyncio
-    async def test_grade_calculation(self, mock_canvas_api):
+    async def test_grade_calculation(self, mock_canvas_api, discussion_tools):
         """Test that grades are calculated correctly."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 100,
@@ -178,7 +355,7 @@ class TestGradeDiscussionParticipation:
             "points_possible": 10,
         }
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}],
+            [ALICE],
             [
                 {
                     "user_id": 1001,
@@ -187,7 +364,7 @@ class TestGradeDiscussionParticipation:
             ],  # 1 post, 2 replies
         ]
 
-        grade_discussion = get_tool_function("grade_discussion_participation")
+        grade_discussion = discussion_tools["grade_discussion_participation"]
         result = await grade_discussion(
             course_identifier="12345",
             topic_id="444",
@@ -201,8 +378,40 @@ class TestGradeDiscussionParticipation:
         assert "10.0" in result or "10" in result
         assert "Alice" in result
 
-    @pytest.mark.asyncio
-    async def test_grade_dry_run_mode(self, mock_canvas_api):
+    async def test_grade_counts_nested_view_replies(
+        self, mock_canvas_api, discussion_tools
+    ):
+        """Test that grading counts replies at every depth of the view."""
+        mock_canvas_api["make_canvas_request"].side_effect = [
+            {"id": 100, "name": "Discussion Grade", "points_possible": 100},
+            {
+                "view": [
+                    {
+                        "user_id": 1002,
+                        "replies": [{"user_id": 1001, "replies": [{"user_id": 1001}]}],
+                    }
+                ],
+                "new_entries": [{"user_id": 1001, "parent_id": 9}],
+            },
+        ]
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = [
+            [ALICE],
+        ]
+
+        grade_discussion = discussion_tools["grade_discussion_participation"]
+        result = await grade_discussion(
+            course_identifier="12345",
+            topic_id="444",
+            assignment_id="100",
+            points_for_post=5.0,
+            points_for_reply=3.0,
+            dry_run=True,
+        )
+
+        # 0 posts, 3 replies
+        assert "Alice                          0      3        9.0" in result
+
+    async def test_grade_dry_run_mode(self, mock_canvas_api, discussion_tools):
         """Test that dry run mode doesn't submit grades."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 100,
@@ -210,25 +419,25 @@ class TestGradeDiscussionParticipation:
             "points_possible": 10,
         }
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}],
+            [ALICE],
             [],
         ]
 
-        grade_discussion = get_tool_function("grade_discussion_participation")
+        grade_discussion = discussion_tools["grade_discussion_participation"]
         result = await grade_discussion(
             course_identifier="12345", topic_id="444", assignment_id="100", dry_run=True
         )
 
         assert "DRY RUN" in result
         assert "Set dry_run=False to submit" in result
-        # Should only call API for assignment details and fetching data, not for submitting grades
-        assert all(
-            call[0][0] != "put" or "submissions" not in call[0][1]
+        # Only reads: no per-submission PUT and no bulk update_grades POST
+        methods = {
+            call.args[0]
             for call in mock_canvas_api["make_canvas_request"].call_args_list
-        )
+        }
+        assert methods == {"get"}
 
-    @pytest.mark.asyncio
-    async def test_grade_submission_success(self, mock_canvas_api):
+    async def test_grade_submission_success(self, mock_canvas_api, discussion_tools):
         """Test successful grade submission."""
         mock_canvas_api["make_canvas_request"].side_effect = [
             {
@@ -236,14 +445,14 @@ class TestGradeDiscussionParticipation:
                 "name": "Discussion Grade",
                 "points_possible": 10,
             },  # Assignment details
-            {"id": 1, "score": 5.0},  # Grade submission response
+            {"view": [{"id": 1, "user_id": 1001}]},  # Threaded view
+            {"id": 1, "url": "/api/v1/progress/1"},  # Bulk update progress
         ]
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}],
-            [{"user_id": 1001, "recent_replies": []}],
+            [ALICE],
         ]
 
-        grade_discussion = get_tool_function("grade_discussion_participation")
+        grade_discussion = discussion_tools["grade_discussion_participation"]
         result = await grade_discussion(
             course_identifier="12345",
             topic_id="444",
@@ -253,9 +462,92 @@ class TestGradeDiscussionParticipation:
 
         assert "1 submitted" in result
         assert "0 failed" in result
+        method, endpoint = mock_canvas_api["make_canvas_request"].call_args.args
+        assert method == "post"
+        assert endpoint.endswith("/submissions/update_grades")
+        assert ("grade_data[1001][posted_grade]", "5.0") in (
+            mock_canvas_api["make_canvas_request"].call_args.kwargs["data"]
+        )
+        mock_canvas_api["poll_canvas_progress"].assert_awaited_once_with(
+            "/api/v1/progress/1"
+        )
+
+    async def test_grade_submission_counts_failures(
+        self, mock_canvas_api, discussion_tools
+    ):
+        """Test that the per-student fallback tallies errors and exceptions."""
+        assignment = {"id": 100, "name": "Discussion Grade", "points_possible": 10}
+
+        async def fake_request(method, endpoint, **kwargs):
+            if method == "get":
+                return assignment
+            if method == "post":
+                return {"error": "Bulk update unavailable"}
+            if endpoint.endswith("/1002"):
+                return {"error": "Forbidden"}
+            if endpoint.endswith("/1003"):
+                raise RuntimeError("connection reset")
+            return {"id": 1}
+
+        mock_canvas_api["make_canvas_request"].side_effect = fake_request
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = [
+            [
+                ALICE,
+                BOB,
+                CHARLIE,
+            ],
+            [],
+        ]
+
+        grade_discussion = discussion_tools["grade_discussion_participation"]
+        result = await grade_discussion(
+            course_identifier="12345",
+            topic_id="444",
+            assignment_id="100",
+            dry_run=False,
+            max_concurrent=2,
+        )
+
+        assert "Bulk update failed (Bulk update unavailable)" in result
+        assert "1 submitted" in result
+        assert "2 failed" in result
+
+    async def test_grade_bulk_progress_failure_falls_back(
+        self, mock_canvas_api, discussion_tools
+    ):
+        """Test that a failed bulk job is retried per student."""
+        mock_canvas_api["make_canvas_request"].side_effect = [
+            {"id": 100, "name": "Discussion Grade", "points_possible": 10},
+            {"error": "503 Service Unavailable"},  # View not generated yet
+            {"id": 7, "url": "/api/v1/progress/7"},
+            {"id": 1, "score": 5.0},
+        ]
+        mock_canvas_api["poll_canvas_progress"].return_value = {
+            "completed": True,
+            "workflow_state": "failed",
+            "progress_id": 7,
+            "error": "Bulk operation failed: boom",
+        }
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = [
+            [ALICE],
+            [{"user_id": 1001, "recent_replies": []}],
+        ]
+
+        grade_discussion = discussion_tools["grade_discussion_participation"]
+        result = await grade_discussion(
+            course_identifier="12345",
+            topic_id="444",
+            assignment_id="100",
+            dry_run=False,
+        )
+
+        assert "Bulk update failed" in result
+        assert "1 submitted" in result
+        method, endpoint = mock_canvas_api["make_canvas_request"].call_args.args
+        assert method == "put"
+        assert endpoint.endswith("/submissions/1001")
 
-    @pytest.mark.asyncio
-    async def test_grade_max_points_override(self, mock_canvas_api):
+    async def test_grade_max_points_override(self, mock_canvas_api, discussion_tools):
         """Test that max_points parameter overrides assignment points_possible."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 100,
@@ -263,13 +555,13 @@ class TestGradeDiscussionParticipation:
             "points_possible": 10,
         }
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}],
+            [ALICE],
             [
                 {"user_id": 1001, "recent_replies": [{"user_id": 1001}] * 10}
             ],  # 1 post, 10 replies
         ]
 
-        grade_discussion = get_tool_function("grade_discussion_participation")
+        grade_discussion = discussion_tools["grade_discussion_participation"]
         result = await grade_discussion(
             course_identifier="12345",
             topic_id="444",
@@ -287,12 +579,8 @@ class TestGradeDiscussionParticipation:
 class TestExportDiscussionData:
     """Tests for export_discussion_data tool."""
 
-    @pytest.mark.asyncio
-    async def test_export_csv_format(self, mock_canvas_api):
+    async def test_export_csv_format(self, mock_canvas_api, discussion_tools):
         """Test CSV export includes correct columns."""
-        mock_canvas_api["make_canvas_request"].return_value = {
-            "title": "Test Discussion"
-        }
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
                 "id": 1,
@@ -312,27 +600,21 @@ class TestExportDiscussionData:
             }
         ]
 
-        export_data = get_tool_function("export_discussion_data")
+        export_data = discussion_tools["export_discussion_data"]
         result = await export_data(
             course_identifier="12345", topic_id="444", format="csv"
         )
 
-        assert "entry_id" in result
-        assert "user_id" in result
-        assert "user_name" in result
-        assert "type" in result
-        assert "message_preview" in result
-        assert "Alice" in result
-        assert "Bob" in result
-        assert "post" in result
-        assert "reply" in result
+        assert result.startswith(
+            "Discussion Export: 'Test Discussion' in CS101\n\n"
+            "entry_id,user_id,user_name,type,parent_entry_id,created_at,message_preview\r\n"
+            "1,1001,Alice,post,,2024-01-15T09:00:00Z,This is a post\r\n"
+        )
+        missing = [t for t in EXPECTED_CSV_TOKENS if t not in result]
+        assert not missing, missing
 
-    @pytest.mark.asyncio
-    async def test_export_summary_format(self, mock_canvas_api):
+    async def test_export_summary_format(self, mock_canvas_api, discussion_tools):
         """Test summary format returns correct counts."""
-        mock_canvas_api["make_canvas_request"].return_value = {
-            "title": "Test Discussion"
-        }
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
                 "id": 1,
@@ -342,7 +624,7 @@ class TestExportDiscussionData:
             {"id": 2, "user_id": 1002, "recent_replies": []},
         ]
 
-        export_data = get_tool_function("export_discussion_data")
+        export_data = discussion_tools["export_discussion_data"]
         result = await export_data(
             course_identifier="12345", topic_id="444", format="summary"
         )
@@ -352,17 +634,32 @@ class TestExportDiscussionData:
         assert "Total interactions: 4" in result
         assert "Unique participants: 3" in result
 
-    @pytest.mark.asyncio
-    async def test_export_error_handling(self, mock_canvas_api):
+    async def test_export_force_refresh_clears_entry_cache(
+        self, mock_canvas_api, discussion_tools
+    ):
+        """Test that force_refresh drops this topic's cached entries only."""
+        export_data = discussion_tools["export_discussion_data"]
+        with patch(
+            "canvas_mcp.tools.discussion_analytics.evict_ttl_cache"
+        ) as mock_evict:
+            await export_data(
+                course_identifier="12345", topic_id="444", force_refresh=True
+            )
+
+        mock_evict.assert_called_once_with(
+            mock_canvas_api["get_discussion_entries"], "12345", "444"
+        )
+        mock_canvas_api["get_discussion_entries"].assert_awaited_once_with(
+            "12345", "444"
+        )
+
+    async def test_export_error_handling(self, mock_canvas_api, discussion_tools):
         """Test error handling when fetching entries fails."""
-        mock_canvas_api["make_canvas_request"].return_value = {
-            "title": "Test Discussion"
-        }
         mock_canvas_api["fetch_all_paginated_results"].return_value = {
             "error": "Not found"
         }
 
-        export_data = get_tool_function("export_discussion_data")
+        export_data = discussion_tools["export_discussion_data"]
         result = await export_data(course_identifier="12345", topic_id="444")
 
         assert "Error fetching entries" in result
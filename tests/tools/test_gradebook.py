@@ -9,61 +9,60 @@ Includes tests for:
 - configure_late_policy
 """
 
-import pytest
-from unittest.mock import AsyncMock, patch
-
-
-@pytest.fixture
-def mock_canvas_api():
-    """Fixture to mock Canvas API calls for gradebook tools."""
-    with (
-        patch("canvas_mcp.tools.gradebook.get_course_id") as mock_get_id,
-        patch("canvas_mcp.tools.gradebook.get_course_code") as mock_get_code,
-        patch("canvas_mcp.tools.gradebook.fetch_all_paginated_results") as mock_fetch,
-        patch("canvas_mcp.tools.gradebook.make_canvas_request") as mock_request,
-    ):
-
-        mock_get_id.return_value = "12345"
-        mock_get_code.return_value = "CS101"
+from unittest.mock import AsyncMock, MagicMock
 
-        yield {
-            "get_course_id": mock_get_id,
-            "get_course_code": mock_get_code,
-            "fetch_all_paginated_results": mock_fetch,
-            "make_canvas_request": mock_request,
-        }
-
-
-def get_tool_function(tool_name: str):
-    """Get a tool function by name from the registered tools."""
-    from mcp.server.fastmcp import FastMCP
-    from canvas_mcp.tools.gradebook import register_gradebook_tools
+import pytest
 
-    mcp = FastMCP("test")
-    captured_functions = {}
+# Roster entries shared by the tests; tools only read them
+ALICE = {"id": 1001, "name": "Alice"}
 
-    original_tool = mcp.tool
 
-    def capturing_tool(*args, **kwargs):
-        decorator = original_tool(*args, **kwargs)
+# Names patched in canvas_mcp.tools.gradebook by the shared _patched_canvas
+# fixture, with the mock each needs; the paginated stream is an async
+# generator, the rest are coroutines
+_TOOL_MODULE = "gradebook"
+_PATCHED = {
+    "resolve_course": AsyncMock,
+    "fetch_all_paginated_results": AsyncMock,
+    "iter_paginated_results": MagicMock,
+    "get_course_students": AsyncMock,
+    "make_canvas_request": AsyncMock,
+}
 
-        def wrapper(fn):
-            captured_functions[fn.__name__] = fn
-            return decorator(fn)
 
-        return wrapper
+@pytest.fixture
+def mock_canvas_api(canvas_mocks, paginated_replay):
+    """Fixture to mock Canvas API calls for gradebook tools."""
+    mock_resolve = canvas_mocks["resolve_course"]
+    mock_fetch = canvas_mocks["fetch_all_paginated_results"]
+    mock_iter = canvas_mocks["iter_paginated_results"]
+    mock_students = canvas_mocks["get_course_students"]
+    mock_request = canvas_mocks["make_canvas_request"]
+
+    mock_resolve.return_value = ("12345", "CS101")
+
+    async def fetch_students(course_id, enrollment_type="student"):
+        return await mock_fetch(
+            f"/courses/{course_id}/users",
+            {"enrollment_type[]": enrollment_type, "per_page": 100},
+        )
 
-    mcp.tool = capturing_tool
-    register_gradebook_tools(mcp)
+    # Streamed results are served from the same queue as full fetches so
+    # tests can list every paginated response in request order
+    mock_iter.side_effect = paginated_replay(mock_fetch)
+    mock_students.side_effect = fetch_students
 
-    return captured_functions.get(tool_name)
+    return {
+        "resolve_course": mock_resolve,
+        "fetch_all_paginated_results": mock_fetch,
+        "make_canvas_request": mock_request,
+    }
 
 
 class TestExportGrades:
     """Tests for export_grades tool."""
 
-    @pytest.mark.asyncio
-    async def test_export_grades_csv_format(self, mock_canvas_api):
+    async def test_export_grades_csv_format(self, mock_canvas_api, gradebook_tools):
         """Test that CSV export has correct headers and data."""
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
             # Students
@@ -83,13 +82,16 @@ class TestExportGrades:
                     "published": True,
                 },
             ],
-            # Submissions for assignment 100
-            [{"user_id": 1001, "score": 45}, {"user_id": 1002, "score": 48}],
-            # Submissions for assignment 101
-            [{"user_id": 1001, "score": 85}, {"user_id": 1002, "score": 92}],
+            # Submissions across both assignments
+            [
+                {"user_id": 1001, "assignment_id": 100, "score": 45},
+                {"user_id": 1002, "assignment_id": 100, "score": 48},
+                {"user_id": 1001, "assignment_id": 101, "score": 85},
+                {"user_id": 1002, "assignment_id": 101, "score": 92},
+            ],
         ]
 
-        export_grades = get_tool_function("export_grades")
+        export_grades = gradebook_tools["export_grades"]
         result = await export_grades(course_identifier="12345", format="csv")
 
         assert "Student ID,Student Name" in result
@@ -100,61 +102,137 @@ class TestExportGrades:
         assert "45" in result
         assert "85" in result
 
-    @pytest.mark.asyncio
-    async def test_export_grades_summary_format(self, mock_canvas_api):
+    async def test_export_grades_summary_format(self, mock_canvas_api, gradebook_tools):
         """Test that summary shows student count and assignment count."""
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}, {"id": 1002, "name": "Bob"}],
+            [ALICE, {"id": 1002, "name": "Bob"}],
             [
                 {"id": 100, "name": "HW1", "points_possible": 50, "published": True},
                 {"id": 101, "name": "HW2", "points_possible": 50, "published": True},
             ],
-            # Submissions for assignment 100
-            [{"user_id": 1001, "score": 45}],
-            # Submissions for assignment 101
-            [{"user_id": 1001, "score": 48}],
+            # Submissions across both assignments
+            [
+                {"user_id": 1001, "assignment_id": 100, "score": 45},
+                {"user_id": 1001, "assignment_id": 101, "score": 48},
+            ],
         ]
 
-        export_grades = get_tool_function("export_grades")
+        export_grades = gradebook_tools["export_grades"]
         result = await export_grades(course_identifier="12345", format="summary")
 
         assert "Students: 2" in result
         assert "Published Assignments: 2" in result
         assert "Total Points Available: 100" in result
 
-    @pytest.mark.asyncio
-    async def test_export_grades_error_handling_students(self, mock_canvas_api):
-        """Test error handling when fetching students fails."""
-        mock_canvas_api["fetch_all_paginated_results"].return_value = {
-            "error": "Access denied"
-        }
-
-        export_grades = get_tool_function("export_grades")
-        result = await export_grades(course_identifier="12345")
+    async def test_export_grades_fetches_submissions_in_one_request(
+        self, mock_canvas_api, gradebook_tools
+    ):
+        """Test that all published assignments share one submissions fetch."""
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = [
+            [ALICE],
+            [
+                {"id": 100, "name": "HW1", "points_possible": 10, "published": True},
+                {"id": 101, "name": "HW2", "points_possible": 10, "published": False},
+                {"id": 102, "name": "HW3", "points_possible": 10, "published": True},
+            ],
+            [
+                {"user_id": 1001, "assignment_id": 100, "score": 7},
+                {"user_id": 1001, "assignment_id": 102, "score": None},
+                {"user_id": 9999, "assignment_id": 100, "score": 3},
+            ],
+        ]
 
-        assert "Error fetching students" in result
-        assert "Access denied" in result
+        export_grades = gradebook_tools["export_grades"]
+        result = await export_grades(course_identifier="12345", format="csv")
 
-    @pytest.mark.asyncio
-    async def test_export_grades_error_handling_assignments(self, mock_canvas_api):
-        """Test error handling when fetching assignments fails."""
+        calls = mock_canvas_api["fetch_all_paginated_results"].call_args_list
+        assert len(calls) == 3
+        endpoint, params = calls[2].args
+        assert endpoint == "/courses/12345/students/submissions"
+        assert params["student_ids[]"] == "all"
+        assert params["assignment_ids[]"] == ["100", "102"]
+        assert "1001,Alice,7,,7.0" in result
+        assert "9999" not in result
+
+    async def test_export_grades_batches_many_assignments(
+        self, mock_canvas_api, gradebook_tools
+    ):
+        """Test that submissions are requested for at most 50 assignments at once."""
         mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [{"id": 1001, "name": "Alice"}],  # Students succeed
-            {"error": "Not found"},  # Assignments fail
+            [ALICE],
+            [
+                {"id": aid, "name": f"HW{aid}", "points_possible": 1, "published": True}
+                for aid in range(120)
+            ],
+            [{"user_id": 1001, "assignment_id": 0, "score": 1}],
+            [],
+            [{"user_id": 1001, "assignment_id": 119, "score": 1}],
+        ]
+
+        export_grades = gradebook_tools["export_grades"]
+        result = await export_grades(course_identifier="12345", format="csv")
+
+        calls = mock_canvas_api["fetch_all_paginated_results"].call_args_list
+        batches = [call.args[1]["assignment_ids[]"] for call in calls[2:]]
+        assert [len(batch) for batch in batches] == [50, 50, 20]
+        assert [aid for batch in batches for aid in batch] == [
+            str(aid) for aid in range(120)
         ]
+        assert result.rstrip().endswith(",2.0")
+
+    @pytest.mark.parametrize(
+        "responses,expected_msg,expected_err",
+        [
+            pytest.param(
+                [{"error": "Access denied"}, []],
+                "Error fetching students",
+                "Access denied",
+                id="students",
+            ),
+            pytest.param(
+                [[ALICE], {"error": "Not found"}],
+                "Error fetching assignments",
+                "Not found",
+                id="assignments",
+            ),
+            pytest.param(
+                [
+                    [ALICE],
+                    [
+                        {
+                            "id": 100,
+                            "name": "HW1",
+                            "points_possible": 10,
+                            "published": True,
+                        }
+                    ],
+                    {"error": "Forbidden"},
+                ],
+                "Error fetching submissions",
+                "Forbidden",
+                id="submissions",
+            ),
+        ],
+    )
+    async def test_export_grades_error_handling(
+        self, mock_canvas_api, gradebook_tools, responses, expected_msg, expected_err
+    ):
+        """Test that a failed fetch is reported with what was being fetched."""
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = responses
 
-        export_grades = get_tool_function("export_grades")
+        export_grades = gradebook_tools["export_grades"]
         result = await export_grades(course_identifier="12345")
 
-        assert "Error fetching assignments" in result
-        assert "Not found" in result
+        assert expected_msg in result
+        assert expected_err in result
 
 
 class TestGetAssignmentGroups:
     """Tests for get_assignment_groups tool."""
 
-    @pytest.mark.asyncio
-    async def test_assignment_groups_list_shows_weights(self, mock_canvas_api):
+    async def test_assignment_groups_list_shows_weights(
+        self, mock_canvas_api, gradebook_tools
+    ):
         """Test that assignment groups list shows weights and rules."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
@@ -167,7 +245,7 @@ class TestGetAssignmentGroups:
             {"id": 2, "name": "Exams", "group_weight": 50, "position": 2, "rules": {}},
         ]
 
-        get_groups = get_tool_function("get_assignment_groups")
+        get_groups = gradebook_tools["get_assignment_groups"]
         result = await get_groups(course_identifier="12345")
 
         assert "Homework" in result
@@ -176,14 +254,15 @@ class TestGetAssignmentGroups:
         assert "Exams" in result
         assert "Weight: 50%" in result
 
-    @pytest.mark.asyncio
-    async def test_assignment_groups_error_handling(self, mock_canvas_api):
+    async def test_assignment_groups_error_handling(
+        self, mock_canvas_api, gradebook_tools
+    ):
         """Test error handling when fetching assignment groups fails."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = {
             "error": "Unauthorized"
         }
 
-        get_groups = get_tool_function("get_assignment_groups")
+        get_groups = gradebook_tools["get_assignment_groups"]
         result = await get_groups(course_identifier="12345")
 
         assert "Error fetching assignment groups" in result
@@ -193,8 +272,9 @@ class TestGetAssignmentGroups:
 class TestCreateAssignmentGroup:
     """Tests for create_assignment_group tool."""
 
-    @pytest.mark.asyncio
-    async def test_create_assignment_group_sends_correct_data(self, mock_canvas_api):
+    async def test_create_assignment_group_sends_correct_data(
+        self, mock_canvas_api, gradebook_tools
+    ):
         """Test that create_assignment_group sends correct data."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 10,
@@ -202,7 +282,7 @@ class TestCreateAssignmentGroup:
             "group_weight": 20,
         }
 
-        create_group = get_tool_function("create_assignment_group")
+        create_group = gradebook_tools["create_assignment_group"]
         result = await create_group(
             course_identifier="12345", name="Participation", weight=20, drop_lowest=1
         )
@@ -217,12 +297,13 @@ class TestCreateAssignmentGroup:
         assert "Assignment group created" in result
         assert "ID: 10" in result
 
-    @pytest.mark.asyncio
-    async def test_create_assignment_group_error_handling(self, mock_canvas_api):
+    async def test_create_assignment_group_error_handling(
+        self, mock_canvas_api, gradebook_tools
+    ):
         """Test error handling when creation fails."""
         mock_canvas_api["make_canvas_request"].return_value = {"error": "Invalid name"}
 
-        create_group = get_tool_function("create_assignment_group")
+        create_group = gradebook_tools["create_assignment_group"]
         result = await create_group(course_identifier="12345", name="Test")
 
         assert "Error creating assignment group" in result
@@ -232,8 +313,7 @@ class TestCreateAssignmentGroup:
 class TestUpdateAssignmentGroup:
     """Tests for update_assignment_group tool."""
 
-    @pytest.mark.asyncio
-    async def test_update_assignment_group(self, mock_canvas_api):
+    async def test_update_assignment_group(self, mock_canvas_api, gradebook_tools):
         """Test updating assignment group settings."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 1,
@@ -241,7 +321,7 @@ class TestUpdateAssignmentGroup:
             "group_weight": 35,
         }
 
-        update_group = get_tool_function("update_assignment_group")
+        update_group = gradebook_tools["update_assignment_group"]
         result = await update_group(
             course_identifier="12345", group_id="1", name="Updated Homework", weight=35
         )
@@ -254,10 +334,11 @@ class TestUpdateAssignmentGroup:
 
         assert "updated" in result
 
-    @pytest.mark.asyncio
-    async def test_update_assignment_group_no_parameters(self, mock_canvas_api):
+    async def test_update_assignment_group_no_parameters(
+        self, mock_canvas_api, gradebook_tools
+    ):
         """Test that update with no parameters returns error message."""
-        update_group = get_tool_function("update_assignment_group")
+        update_group = gradebook_tools["update_assignment_group"]
         result = await update_group(course_identifier="12345", group_id="1")
 
         assert "No update parameters provided" in result
@@ -267,59 +348,51 @@ class TestUpdateAssignmentGroup:
 class TestConfigureLatePolicy:
     """Tests for configure_late_policy tool."""
 
-    @pytest.mark.asyncio
-    async def test_configure_late_policy_creates_new(self, mock_canvas_api):
-        """Test that late policy is created when none exists."""
-        # First call (get existing) returns error, second call (post) succeeds
-        mock_canvas_api["make_canvas_request"].side_effect = [
-            {"error": "Not found"},  # GET returns error (no existing policy)
-            {"late_policy": {"late_submission_deduction": 10}},  # POST succeeds
-        ]
-
-        configure_policy = get_tool_function("configure_late_policy")
-        result = await configure_policy(
-            course_identifier="12345", late_submission_deduction=10.0
-        )
-
-        # Should have called POST since GET failed
-        calls = mock_canvas_api["make_canvas_request"].call_args_list
-        assert calls[1][0][0] == "post"
-        assert "Late policy configured" in result
-        assert "10% per day" in result or "10.0% per day" in result
-
-    @pytest.mark.asyncio
-    async def test_configure_late_policy_updates_existing(self, mock_canvas_api):
-        """Test that late policy is updated when it exists."""
-        mock_canvas_api["make_canvas_request"].side_effect = [
-            {
-                "late_policy": {"late_submission_deduction": 5}
-            },  # GET returns existing policy
-            {"late_policy": {"late_submission_deduction": 10}},  # PUT succeeds
-        ]
+    @pytest.mark.parametrize(
+        "responses,expected_verbs,expected",
+        [
+            pytest.param(
+                [
+                    {"error": "HTTP error: 404", "status_code": 404},  # PUT: no policy
+                    {"late_policy": {"late_submission_deduction": 10}},
+                ],
+                ("put", "post"),
+                ("Late policy configured", "10.0% per day"),
+                id="creates_new",
+            ),
+            pytest.param(
+                [{"late_policy": {"late_submission_deduction": 10}}],
+                ("put",),
+                ("Late policy configured",),
+                id="updates_existing",
+            ),
+            pytest.param(
+                [
+                    {"error": "HTTP error: 404", "status_code": 404},  # PUT: no policy
+                    {"error": "Invalid parameters"},  # POST also fails
+                ],
+                ("put", "post"),
+                ("Error configuring late policy", "Invalid parameters"),
+                id="error",
+            ),
+        ],
+    )
+    async def test_configure_late_policy(
+        self, mock_canvas_api, gradebook_tools, responses, expected_verbs, expected
+    ):
+        """Test that late policy is updated, created when missing, or reports errors."""
+        # A PUT updates an existing policy; when none exists a POST creates it
+        mock_canvas_api["make_canvas_request"].side_effect = responses
 
-        configure_policy = get_tool_function("configure_late_policy")
+        configure_policy = gradebook_tools["configure_late_policy"]
         result = await configure_policy(
             course_identifier="12345", late_submission_deduction=10.0
         )
 
-        # Should have called PUT since GET succeeded
         calls = mock_canvas_api["make_canvas_request"].call_args_list
-        assert calls[1][0][0] == "put"
-        assert "Late policy configured" in result
-
-    @pytest.mark.asyncio
-    async def test_configure_late_policy_error_handling(self, mock_canvas_api):
-        """Test error handling when configuration fails."""
-        mock_canvas_api["make_canvas_request"].side_effect = [
-            {"error": "Not found"},  # GET fails
-            {"error": "Invalid parameters"},  # POST also fails
-        ]
-
-        configure_policy = get_tool_function("configure_late_policy")
-        result = await configure_policy(course_identifier="12345")
-
-        assert "Error configuring late policy" in result
-        assert "Invalid parameters" in result
+        assert tuple(call.args[0] for call in calls) == expected_verbs
+        for text in expected:
+            assert text in result
 
 
 if __name__ == "__main__":
@@ -128,5 +128,50 @@ class TestAnnouncementTools:
             assert "deleted" in result or "id" in result
 
 
+class TestMessageTemplates:
+    """Test template formatting and its error messages."""
+
+    def test_reports_first_missing_variable_in_template_order(self):
+        """The first unset name in subject-then-body order is reported."""
+        from canvas_mcp.tools.message_templates import MessageTemplates
+
+        template = {"subject": "{zeta} due", "body": "Hi {alpha}, see {beta}"}
+
+        with pytest.raises(ValueError, match="Missing template variable: 'zeta'"):
+            MessageTemplates.format_template(template, {})
+
+        with pytest.raises(ValueError, match="Missing template variable: 'beta'"):
+            MessageTemplates.format_template(template, {"zeta": 1, "alpha": 2})
+
+    def test_attribute_and_index_fields(self):
+        """``{a.b}`` and ``{a[0]}`` check and substitute the base name."""
+        from types import SimpleNamespace
+
+        from canvas_mcp.tools.message_templates import MessageTemplates
+
+        template = {"subject": "{course.name}", "body": "First: {names[0]}"}
+
+        result = MessageTemplates.format_template(
+            template,
+            {"course": SimpleNamespace(name="CS101"), "names": ["Ada", "Bo"]},
+        )
+
+        assert result == {"subject": "CS101", "body": "First: Ada"}
+        with pytest.raises(ValueError, match="Missing template variable: 'names'"):
+            MessageTemplates.format_template(
+                template, {"course": SimpleNamespace(name="CS101")}
+            )
+
+    @pytest.mark.parametrize("body", ["a {", "a }", "{name!z}"])
+    def test_malformed_template(self, body):
+        """Unparseable templates surface as formatting errors."""
+        from canvas_mcp.tools.message_templates import MessageTemplates
+
+        with pytest.raises(ValueError, match="Template formatting error"):
+            MessageTemplates.format_template(
+                {"subject": "s", "body": body}, {"name": "x"}
+            )
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -15,61 +15,123 @@ Includes tests for:
 - list_quiz_submissions
 """
 
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
-from unittest.mock import AsyncMock, patch
+
+# Quiz payload shared by the delete tests; tools only read it
+MIDTERM = {"id": 5, "title": "Midterm"}
+
+# Details list_quizzes must show for a quiz
+EXPECTED_QUIZ_LIST_TOKENS = (
+    "Midterm Quiz",
+    "ID: 1",
+    "Points: 100",
+    "Questions: 20",
+    "Published",
+    "60 min",
+)
+
+# Figures get_quiz_statistics must report
+EXPECTED_QUIZ_STATS_TOKENS = (
+    "Submissions: 25",
+    "Average Score: 82.5",
+    "High Score: 100",
+    "Correct: 20",
+    "Incorrect: 5",
+)
+
+# Details list_quiz_submissions must show for a submission
+EXPECTED_SUBMISSION_TOKENS = (
+    "Total: 1 submissions",
+    "User ID: 1001",
+    "Score: 85",
+)
+
+# Names patched in canvas_mcp.tools.quizzes by the shared _patched_canvas
+# fixture, with the mock each needs; the paginated stream is an async
+# generator, the rest are coroutines
+_TOOL_MODULE = "quizzes"
+_PATCHED = {
+    "get_course_id": AsyncMock,
+    "resolve_course": AsyncMock,
+    "iter_paginated_results": MagicMock,
+    "make_canvas_request": AsyncMock,
+}
+
+
+@pytest.fixture(scope="module")
+def _patched_canvas(_patched_canvas):
+    """Route cached quiz reads through the same request mock."""
+    with patch(
+        "canvas_mcp.core.cache.make_canvas_request",
+        _patched_canvas["make_canvas_request"],
+    ):
+        yield _patched_canvas
 
 
 @pytest.fixture
-def mock_canvas_api():
+def mock_canvas_api(canvas_mocks, paginated_replay):
     """Fixture to mock Canvas API calls for quiz tools."""
-    with (
-        patch("canvas_mcp.tools.quizzes.get_course_id") as mock_get_id,
-        patch("canvas_mcp.tools.quizzes.get_course_code") as mock_get_code,
-        patch("canvas_mcp.tools.quizzes.fetch_all_paginated_results") as mock_fetch,
-        patch("canvas_mcp.tools.quizzes.make_canvas_request") as mock_request,
-    ):
+    mock_resolve = canvas_mocks["resolve_course"]
+    mock_iter = canvas_mocks["iter_paginated_results"]
+    mock_request = canvas_mocks["make_canvas_request"]
 
-        mock_get_id.return_value = "12345"
-        mock_get_code.return_value = "CS101"
+    canvas_mocks["get_course_id"].return_value = "12345"
+    mock_resolve.return_value = ("12345", "CS101")
 
-        yield {
-            "get_course_id": mock_get_id,
-            "get_course_code": mock_get_code,
-            "fetch_all_paginated_results": mock_fetch,
-            "make_canvas_request": mock_request,
-        }
+    # Listings stream their results; tests set the full result (or an
+    # error dict) on mock_fetch and the stream replays it
+    mock_fetch = AsyncMock()
 
+    mock_iter.side_effect = paginated_replay(mock_fetch)
 
-def get_tool_function(tool_name: str):
-    """Get a tool function by name from the registered tools."""
-    from mcp.server.fastmcp import FastMCP
-    from canvas_mcp.tools.quizzes import register_quiz_tools
+    return {
+        "resolve_course": mock_resolve,
+        "fetch_all_paginated_results": mock_fetch,
+        "make_canvas_request": mock_request,
+    }
 
-    mcp = FastMCP("test")
-    captured_functions = {}
 
-    original_tool = mcp.tool
+class TestStripHtml:
+    """Tests for the _strip_html helper."""
 
-    def capturing_tool(*args, **kwargs):
-        decorator = original_tool(*args, **kwargs)
+    def test_removes_tags(self):
+        """Test that tags and surrounding whitespace are removed."""
+        from canvas_mcp.tools.quizzes import _strip_html
 
-        def wrapper(fn):
-            captured_functions[fn.__name__] = fn
-            return decorator(fn)
+        assert _strip_html(" <p>What is <b>2+2</b>?</p> ") == "What is 2+2?"
 
-        return wrapper
+    def test_keeps_unclosed_angle_brackets(self):
+        """Test that "<" with no closing ">" is kept as text."""
+        from canvas_mcp.tools.quizzes import _strip_html
 
-    mcp.tool = capturing_tool
-    register_quiz_tools(mcp)
+        assert _strip_html("<p>x</p> 1 < 2") == "x 1 < 2"
+        assert _strip_html("<" * 5000) == "<" * 5000
 
-    return captured_functions.get(tool_name)
+    def test_strip_truncate_matches_full_strip(self):
+        """Test that truncating first gives the same preview as stripping all."""
+        from canvas_mcp.tools.quizzes import _strip_truncate
+
+        assert _strip_truncate("<p>short</p>", 200) == "short"
+        long_html = "<p>" + "word " * 200 + "</p>"
+        assert _strip_truncate(long_html, 20) == ("word " * 4)[:20] + "..."
+
+    def test_strip_truncate_drops_tag_split_by_scan_limit(self):
+        """Test that a tag cut by the scan limit does not leak into the text."""
+        from canvas_mcp.tools.quizzes import _strip_truncate
+
+        html = "<b>hi</b>" + "x" * 5 + '<span class="' + "a" * 100 + '">'
+        assert _strip_truncate(html, 10) == "hixxxxx..."
 
 
 class TestListQuizzes:
     """Tests for list_quizzes tool."""
 
-    @pytest.mark.asyncio
-    async def test_list_quizzes_returns_formatted_output(self, mock_canvas_api):
+    async def test_list_quizzes_returns_formatted_output(
+        self, mock_canvas_api, quiz_tools
+    ):
         """Test that list_quizzes returns formatted quiz information."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
@@ -84,35 +146,17 @@ class TestListQuizzes:
             }
         ]
 
-        list_quizzes = get_tool_function("list_quizzes")
+        list_quizzes = quiz_tools["list_quizzes"]
         result = await list_quizzes(course_identifier="12345")
 
-        assert "Midterm Quiz" in result
-        assert "ID: 1" in result
-        assert "Points: 100" in result
-        assert "Questions: 20" in result
-        assert "Published" in result
-        assert "60 min" in result
-
-    @pytest.mark.asyncio
-    async def test_list_quizzes_error_handling(self, mock_canvas_api):
-        """Test error handling when API returns error."""
-        mock_canvas_api["fetch_all_paginated_results"].return_value = {
-            "error": "Unauthorized"
-        }
-
-        list_quizzes = get_tool_function("list_quizzes")
-        result = await list_quizzes(course_identifier="12345")
-
-        assert "Error fetching quizzes" in result
-        assert "Unauthorized" in result
+        missing = [t for t in EXPECTED_QUIZ_LIST_TOKENS if t not in result]
+        assert not missing, missing
 
 
 class TestCreateQuiz:
     """Tests for create_quiz tool."""
 
-    @pytest.mark.asyncio
-    async def test_create_quiz_sends_correct_data(self, mock_canvas_api):
+    async def test_create_quiz_sends_correct_data(self, mock_canvas_api, quiz_tools):
         """Test that create_quiz sends correct data to API."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 100,
@@ -121,7 +165,7 @@ class TestCreateQuiz:
             "published": False,
         }
 
-        create_quiz = get_tool_function("create_quiz")
+        create_quiz = quiz_tools["create_quiz"]
         result = await create_quiz(
             course_identifier="12345",
             title="New Quiz",
@@ -140,63 +184,62 @@ class TestCreateQuiz:
         assert "Quiz created successfully" in result
         assert "ID: 100" in result
 
-    @pytest.mark.asyncio
-    async def test_create_quiz_error_handling(self, mock_canvas_api):
-        """Test error handling when quiz creation fails."""
-        mock_canvas_api["make_canvas_request"].return_value = {
-            "error": "Invalid parameters"
-        }
+    async def test_course_code_lookup_overlaps_request(
+        self, mock_canvas_api, quiz_tools
+    ):
+        """The display-code lookup runs while the Canvas request is out."""
+        request_sent = asyncio.Event()
 
-        create_quiz = get_tool_function("create_quiz")
-        result = await create_quiz(course_identifier="12345", title="Test Quiz")
+        async def resolve(course_identifier):
+            await asyncio.wait_for(request_sent.wait(), timeout=1)
+            return "12345", "CS101"
 
-        assert "Error creating quiz" in result
-        assert "Invalid parameters" in result
+        async def request(*args, **kwargs):
+            request_sent.set()
+            return {"id": 100, "title": "New Quiz"}
 
+        mock_canvas_api["resolve_course"].side_effect = resolve
+        mock_canvas_api["make_canvas_request"].side_effect = request
 
-class TestPublishUnpublishQuiz:
-    """Tests for publish_quiz and unpublish_quiz tools."""
+        result = await quiz_tools["create_quiz"](
+            course_identifier="12345", title="New Quiz"
+        )
 
-    @pytest.mark.asyncio
-    async def test_publish_quiz_toggle_works(self, mock_canvas_api):
-        """Test that publish quiz sends correct API call."""
-        mock_canvas_api["make_canvas_request"].return_value = {
-            "id": 1,
-            "title": "Test Quiz",
-            "published": True,
-        }
+        assert "in course CS101" in result
 
-        publish_quiz = get_tool_function("publish_quiz")
-        result = await publish_quiz(course_identifier="12345", quiz_id="1")
 
-        call_args = mock_canvas_api["make_canvas_request"].call_args
-        assert call_args[0][0] == "put"
-        assert call_args[1]["data"]["quiz"]["published"] is True
-        assert "published" in result
+class TestPublishUnpublishQuiz:
+    """Tests for publish_quiz and unpublish_quiz tools."""
 
-    @pytest.mark.asyncio
-    async def test_unpublish_quiz_toggle_works(self, mock_canvas_api):
-        """Test that unpublish quiz sends correct API call."""
+    @pytest.mark.parametrize(
+        "tool_name,published,verb",
+        [
+            pytest.param("publish_quiz", True, "published", id="publish"),
+            pytest.param("unpublish_quiz", False, "unpublished", id="unpublish"),
+        ],
+    )
+    async def test_publish_toggle_works(
+        self, mock_canvas_api, quiz_tools, tool_name, published, verb
+    ):
+        """Test that publish and unpublish send the matching API call."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 1,
             "title": "Test Quiz",
-            "published": False,
+            "published": published,
         }
 
-        unpublish_quiz = get_tool_function("unpublish_quiz")
-        result = await unpublish_quiz(course_identifier="12345", quiz_id="1")
+        result = await quiz_tools[tool_name](course_identifier="12345", quiz_id="1")
 
         call_args = mock_canvas_api["make_canvas_request"].call_args
         assert call_args[0][0] == "put"
-        assert call_args[1]["data"]["quiz"]["published"] is False
-        assert "unpublished" in result
+        assert call_args[1]["data"]["quiz"]["published"] is published
+        assert verb in result
 
 
 class TestAddQuizQuestion:
     """Tests for add_quiz_question tool."""
 
-    @pytest.mark.asyncio
-    async def test_add_question_with_answers(self, mock_canvas_api):
+    async def test_add_question_with_answers(self, mock_canvas_api, quiz_tools):
         """Test adding a question with answers sends correct payload."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 50,
@@ -204,7 +247,7 @@ class TestAddQuizQuestion:
             "points_possible": 5.0,
         }
 
-        add_question = get_tool_function("add_quiz_question")
+        add_question = quiz_tools["add_quiz_question"]
         result = await add_question(
             course_identifier="12345",
             quiz_id="1",
@@ -225,10 +268,9 @@ class TestAddQuizQuestion:
         assert "Question added" in result
         assert "Question ID: 50" in result
 
-    @pytest.mark.asyncio
-    async def test_add_question_invalid_json_answers(self, mock_canvas_api):
+    async def test_add_question_invalid_json_answers(self, mock_canvas_api, quiz_tools):
         """Test error handling for invalid JSON in answers."""
-        add_question = get_tool_function("add_quiz_question")
+        add_question = quiz_tools["add_quiz_question"]
         result = await add_question(
             course_identifier="12345",
             quiz_id="1",
@@ -244,8 +286,9 @@ class TestAddQuizQuestion:
 class TestGetQuizStatistics:
     """Tests for get_quiz_statistics tool."""
 
-    @pytest.mark.asyncio
-    async def test_quiz_statistics_returns_formatted_analytics(self, mock_canvas_api):
+    async def test_quiz_statistics_returns_formatted_analytics(
+        self, mock_canvas_api, quiz_tools
+    ):
         """Test that quiz statistics returns formatted analytics."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "quiz_statistics": [
@@ -270,34 +313,17 @@ class TestGetQuizStatistics:
             ]
         }
 
-        get_stats = get_tool_function("get_quiz_statistics")
+        get_stats = quiz_tools["get_quiz_statistics"]
         result = await get_stats(course_identifier="12345", quiz_id="1")
 
-        assert "Submissions: 25" in result
-        assert "Average Score: 82.5" in result
-        assert "High Score: 100" in result
-        assert "Correct: 20" in result
-        assert "Incorrect: 5" in result
-
-    @pytest.mark.asyncio
-    async def test_quiz_statistics_error_handling(self, mock_canvas_api):
-        """Test error handling for quiz statistics."""
-        mock_canvas_api["make_canvas_request"].return_value = {
-            "error": "Quiz not found"
-        }
-
-        get_stats = get_tool_function("get_quiz_statistics")
-        result = await get_stats(course_identifier="12345", quiz_id="999")
-
-        assert "Error fetching quiz statistics" in result
-        assert "Quiz not found" in result
+        missing = [t for t in EXPECTED_QUIZ_STATS_TOKENS if t not in result]
+        assert not missing, missing
 
 
 class TestUpdateQuiz:
     """Tests for update_quiz tool."""
 
-    @pytest.mark.asyncio
-    async def test_update_quiz_with_parameters(self, mock_canvas_api):
+    async def test_update_quiz_with_parameters(self, mock_canvas_api, quiz_tools):
         """Test updating quiz with various parameters."""
         mock_canvas_api["make_canvas_request"].return_value = {
             "id": 1,
@@ -305,7 +331,7 @@ class TestUpdateQuiz:
             "points_possible": 75,
         }
 
-        update_quiz = get_tool_function("update_quiz")
+        update_quiz = quiz_tools["update_quiz"]
         result = await update_quiz(
             course_identifier="12345",
             quiz_id="1",
@@ -321,23 +347,100 @@ class TestUpdateQuiz:
 
         assert "updated successfully" in result
 
-    @pytest.mark.asyncio
-    async def test_update_quiz_no_parameters(self, mock_canvas_api):
+    async def test_quiz_writes_refresh_assignment_search(
+        self, mock_canvas_api, quiz_tools
+    ):
+        """Creating or updating a quiz drops cached assignment searches."""
+        from canvas_mcp.core.cache import search_course_assignments
+
+        mock_canvas_api["make_canvas_request"].return_value = {"id": 1, "title": "Q"}
+
+        with patch("canvas_mcp.tools.quizzes.clear_ttl_caches") as mock_clear:
+            await quiz_tools["create_quiz"](course_identifier="12345", title="Q")
+            await quiz_tools["update_quiz"](
+                course_identifier="12345", quiz_id="1", title="Q"
+            )
+
+        assert mock_clear.call_count == 2
+        for call in mock_clear.call_args_list:
+            assert search_course_assignments in call.args
+
+    async def test_update_quiz_no_parameters(self, mock_canvas_api, quiz_tools):
         """Test that update with no parameters returns error."""
-        update_quiz = get_tool_function("update_quiz")
+        update_quiz = quiz_tools["update_quiz"]
         result = await update_quiz(course_identifier="12345", quiz_id="1")
 
         assert "No update parameters provided" in result
         mock_canvas_api["make_canvas_request"].assert_not_called()
 
 
+class TestDeleteQuiz:
+    """Tests for delete_quiz tool."""
+
+    async def test_delete_quiz_title_from_delete_response(
+        self, mock_canvas_api, quiz_tools
+    ):
+        """Test that the title comes from the DELETE reply when the GET loses."""
+
+        async def request(method, endpoint, **kwargs):
+            if method == "get":
+                return {"error": "HTTP error: 404", "status_code": 404}
+            return MIDTERM
+
+        mock_canvas_api["make_canvas_request"].side_effect = request
+
+        delete_quiz = quiz_tools["delete_quiz"]
+        result = await delete_quiz(course_identifier="12345", quiz_id=5)
+
+        methods = [
+            c.args[0] for c in mock_canvas_api["make_canvas_request"].call_args_list
+        ]
+        assert sorted(methods) == ["delete", "get"]
+        assert "Quiz 'Midterm' (ID: 5) deleted" in result
+
+    async def test_delete_quiz_reuses_recent_read(self, mock_canvas_api, quiz_tools):
+        """Test that a quiz just read is not fetched again for its title."""
+
+        async def request(method, endpoint, **kwargs):
+            if method == "get":
+                return MIDTERM
+            return {"id": 5}
+
+        mock_canvas_api["make_canvas_request"].side_effect = request
+
+        get_quiz_details = quiz_tools["get_quiz_details"]
+        delete_quiz = quiz_tools["delete_quiz"]
+        await get_quiz_details(course_identifier="12345", quiz_id=5)
+        result = await delete_quiz(course_identifier="12345", quiz_id=5)
+
+        methods = [
+            c.args[0] for c in mock_canvas_api["make_canvas_request"].call_args_list
+        ]
+        assert methods == ["get", "delete"]
+        assert "Quiz 'Midterm' (ID: 5) deleted" in result
+
+    async def test_delete_quiz_error(self, mock_canvas_api, quiz_tools):
+        """Test that a failed DELETE is reported."""
+
+        async def request(method, endpoint, **kwargs):
+            if method == "get":
+                return MIDTERM
+            return {"error": "Forbidden"}
+
+        mock_canvas_api["make_canvas_request"].side_effect = request
+
+        delete_quiz = quiz_tools["delete_quiz"]
+        result = await delete_quiz(course_identifier="12345", quiz_id=5)
+
+        assert "Error deleting quiz: Forbidden" in result
+
+
 class TestListQuizSubmissions:
     """Tests for list_quiz_submissions tool."""
 
-    @pytest.mark.asyncio
-    async def test_list_submissions_formatting(self, mock_canvas_api):
+    async def test_list_submissions_formatting(self, mock_canvas_api, quiz_tools):
         """Test that quiz submissions are formatted correctly."""
-        mock_canvas_api["make_canvas_request"].return_value = {
+        mock_canvas_api["fetch_all_paginated_results"].return_value = {
             "quiz_submissions": [
                 {
                     "user_id": 1001,
@@ -351,24 +454,71 @@ class TestListQuizSubmissions:
             ]
         }
 
-        list_submissions = get_tool_function("list_quiz_submissions")
+        list_submissions = quiz_tools["list_quiz_submissions"]
         result = await list_submissions(course_identifier="12345", quiz_id="1")
 
-        assert "Total: 1 submissions" in result
-        assert "User ID: 1001" in result
-        assert "Score: 85" in result
+        missing = [t for t in EXPECTED_SUBMISSION_TOKENS if t not in result]
+        assert not missing, missing
         assert "30m 0s" in result or "Time: 30m" in result
 
-    @pytest.mark.asyncio
-    async def test_list_submissions_error_handling(self, mock_canvas_api):
-        """Test error handling for quiz submissions."""
-        mock_canvas_api["make_canvas_request"].return_value = {"error": "Access denied"}
 
-        list_submissions = get_tool_function("list_quiz_submissions")
-        result = await list_submissions(course_identifier="12345", quiz_id="1")
+class TestErrorHandling:
+    """Tests that quiz tools report Canvas API errors."""
+
+    @pytest.mark.parametrize(
+        "tool_name,kwargs,mock_key,expected_msg,api_error",
+        [
+            pytest.param(
+                "list_quizzes",
+                {"course_identifier": "12345"},
+                "fetch_all_paginated_results",
+                "Error fetching quizzes",
+                "Unauthorized",
+                id="list_quizzes",
+            ),
+            pytest.param(
+                "create_quiz",
+                {"course_identifier": "12345", "title": "Test Quiz"},
+                "make_canvas_request",
+                "Error creating quiz",
+                "Invalid parameters",
+                id="create_quiz",
+            ),
+            pytest.param(
+                "get_quiz_statistics",
+                {"course_identifier": "12345", "quiz_id": "999"},
+                "make_canvas_request",
+                "Error fetching quiz statistics",
+                "Quiz not found",
+                id="get_quiz_statistics",
+            ),
+            pytest.param(
+                "list_quiz_submissions",
+                {"course_identifier": "12345", "quiz_id": "1"},
+                "fetch_all_paginated_results",
+                "Error fetching quiz submissions",
+                "Access denied",
+                id="list_quiz_submissions",
+            ),
+        ],
+    )
+    async def test_error_handling(
+        self,
+        mock_canvas_api,
+        quiz_tools,
+        tool_name,
+        kwargs,
+        mock_key,
+        expected_msg,
+        api_error,
+    ):
+        """Test that an API error is reported with its message."""
+        mock_canvas_api[mock_key].return_value = {"error": api_error}
+
+        result = await quiz_tools[tool_name](**kwargs)
 
-        assert "Error fetching quiz submissions" in result
-        assert "Access denied" in result
+        assert expected_msg in result
+        assert api_error in result
 
 
 if __name__ == "__main__":
@@ -115,7 +115,7 @@ class TestBulkGradeFormData:
     """Test build_bulk_grade_form_data helper."""
 
     def test_simple_grades(self):
-        from canvas_mcp.tools.rubric_grading import build_bulk_grade_form_data
+        from canvas_mcp.core.grading import build_bulk_grade_form_data
 
         grades = {
             "123": {"grade": 95, "comment": "Great work"},
@@ -127,7 +127,7 @@ class TestBulkGradeFormData:
         assert ("grade_data[456][posted_grade]", "85%") in result
 
     def test_excused(self):
-        from canvas_mcp.tools.rubric_grading import build_bulk_grade_form_data
+        from canvas_mcp.core.grading import build_bulk_grade_form_data
 
         grades = {"123": {"excused": True, "comment": "Absent"}}
         result = build_bulk_grade_form_data(grades)
@@ -135,13 +135,13 @@ class TestBulkGradeFormData:
         assert ("grade_data[123][text_comment]", "Absent") in result
 
     def test_empty_grades(self):
-        from canvas_mcp.tools.rubric_grading import build_bulk_grade_form_data
+        from canvas_mcp.core.grading import build_bulk_grade_form_data
 
         result = build_bulk_grade_form_data({})
         assert result == []
 
     def test_excused_takes_precedence_over_grade(self):
-        from canvas_mcp.tools.rubric_grading import build_bulk_grade_form_data
+        from canvas_mcp.core.grading import build_bulk_grade_form_data
 
         grades = {"123": {"excused": True, "grade": 100}}
         result = build_bulk_grade_form_data(grades)
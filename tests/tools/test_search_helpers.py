@@ -5,63 +5,99 @@ Includes tests for:
 - find_assignment
 - find_student
 - find_discussion
+- find_all
 """
 
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
-from unittest.mock import AsyncMock, patch
+
+# Roster entries shared by the tests; tools only read them
+ALICE = {"id": 1001, "name": "Alice Smith", "email": "alice@example.com"}
+BOB = {"id": 1002, "name": "Bob Smith", "email": "bob@example.com"}
+
+# Details find_assignment must show for a match
+EXPECTED_ASSIGNMENT_TOKENS = (
+    "Midterm Exam",
+    "100 pts",
+    "ID: 1",
+    "Published",
+)
+
+# Details find_discussion must show for a match
+EXPECTED_DISCUSSION_TOKENS = (
+    "Week 1 Discussion",
+    "ID: 444",
+    "15 entries",
+    "Discussion",
+)
+
+# Names patched in canvas_mcp.tools.search_helpers by the shared
+# _patched_canvas fixture, with the mock each needs; the paginated stream is
+# an async generator, the rest are coroutines
+_TOOL_MODULE = "search_helpers"
+_PATCHED = {
+    "resolve_course": AsyncMock,
+    "iter_paginated_results": MagicMock,
+    "get_course_students": AsyncMock,
+    "get_discussion_topics": AsyncMock,
+    "search_course_assignments": AsyncMock,
+}
 
 
 @pytest.fixture
-def mock_canvas_api():
+def mock_canvas_api(canvas_mocks, paginated_replay):
     """Fixture to mock Canvas API calls for search helper tools."""
-    with (
-        patch("canvas_mcp.tools.search_helpers.get_course_id") as mock_get_id,
-        patch("canvas_mcp.tools.search_helpers.get_course_code") as mock_get_code,
-        patch(
-            "canvas_mcp.tools.search_helpers.fetch_all_paginated_results"
-        ) as mock_fetch,
-    ):
-
-        mock_get_id.return_value = "12345"
-        mock_get_code.return_value = "CS101"
-
-        yield {
-            "get_course_id": mock_get_id,
-            "get_course_code": mock_get_code,
-            "fetch_all_paginated_results": mock_fetch,
-        }
-
-
-def get_tool_function(tool_name: str):
-    """Get a tool function by name from the registered tools."""
-    from mcp.server.fastmcp import FastMCP
-    from canvas_mcp.tools.search_helpers import register_search_helper_tools
-
-    mcp = FastMCP("test")
-    captured_functions = {}
+    mock_resolve = canvas_mocks["resolve_course"]
+    mock_iter = canvas_mocks["iter_paginated_results"]
+    mock_students = canvas_mocks["get_course_students"]
+    mock_topics = canvas_mocks["get_discussion_topics"]
+    mock_search = canvas_mocks["search_course_assignments"]
+
+    mock_resolve.return_value = ("12345", "CS101")
+
+    # Tests set the full response (a list, or an error dict) on
+    # mock_fetch; the assignment stream replays it item by item
+    mock_fetch = AsyncMock()
+
+    mock_iter.side_effect = paginated_replay(mock_fetch)
+
+    # The roster, topic and assignment-search caches serve the same
+    # response as a full fetch
+    async def course_students(course_id):
+        return await mock_fetch(
+            f"/courses/{course_id}/users",
+            {"enrollment_type[]": "student", "per_page": 100},
+        )
 
-    original_tool = mcp.tool
+    mock_students.side_effect = course_students
 
-    def capturing_tool(*args, **kwargs):
-        decorator = original_tool(*args, **kwargs)
+    async def discussion_topics(course_id):
+        return await mock_fetch(
+            f"/courses/{course_id}/discussion_topics", {"per_page": 100}
+        )
 
-        def wrapper(fn):
-            captured_functions[fn.__name__] = fn
-            return decorator(fn)
+    mock_topics.side_effect = discussion_topics
 
-        return wrapper
+    async def search_assignments(course_id, search_term):
+        return await mock_fetch(
+            f"/courses/{course_id}/assignments",
+            {"per_page": 100, "search_term": search_term},
+        )
 
-    mcp.tool = capturing_tool
-    register_search_helper_tools(mcp)
+    mock_search.side_effect = search_assignments
 
-    return captured_functions.get(tool_name)
+    return {
+        "resolve_course": mock_resolve,
+        "fetch_all_paginated_results": mock_fetch,
+        "iter_paginated_results": mock_iter,
+    }
 
 
 class TestFindAssignment:
     """Tests for find_assignment tool."""
 
-    @pytest.mark.asyncio
-    async def test_find_assignment_returns_matches(self, mock_canvas_api):
+    async def test_find_assignment_returns_matches(self, mock_canvas_api, search_tools):
         """Test finding assignments by name returns matches."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
@@ -80,35 +116,25 @@ class TestFindAssignment:
             },
         ]
 
-        find_assignment = get_tool_function("find_assignment")
+        find_assignment = search_tools["find_assignment"]
         result = await find_assignment(course_identifier="12345", name_query="midterm")
 
-        assert "Midterm Exam" in result
-        assert "100 pts" in result
-        assert "ID: 1" in result
-        assert "Published" in result
-        mock_canvas_api["get_course_id"].assert_called_once_with("12345")
+        missing = [t for t in EXPECTED_ASSIGNMENT_TOKENS if t not in result]
+        assert not missing, missing
+        mock_canvas_api["resolve_course"].assert_called_once_with("12345")
 
-    @pytest.mark.asyncio
-    async def test_find_assignment_no_matches(self, mock_canvas_api):
+    async def test_find_assignment_no_matches(self, mock_canvas_api, search_tools):
         """Test finding assignments with no matches."""
-        mock_canvas_api["fetch_all_paginated_results"].return_value = [
-            {
-                "id": 1,
-                "name": "Homework 1",
-                "due_at": "2024-03-01T23:59:00Z",
-                "points_possible": 50,
-                "published": True,
-            }
-        ]
+        mock_canvas_api["fetch_all_paginated_results"].return_value = []
 
-        find_assignment = get_tool_function("find_assignment")
+        find_assignment = search_tools["find_assignment"]
         result = await find_assignment(course_identifier="12345", name_query="exam")
 
         assert "No assignments matching 'exam' found" in result
 
-    @pytest.mark.asyncio
-    async def test_find_assignment_case_insensitive(self, mock_canvas_api):
+    async def test_find_assignment_case_insensitive(
+        self, mock_canvas_api, search_tools
+    ):
         """Test that search is case-insensitive."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
@@ -120,61 +146,75 @@ class TestFindAssignment:
             }
         ]
 
-        find_assignment = get_tool_function("find_assignment")
+        find_assignment = search_tools["find_assignment"]
         result = await find_assignment(course_identifier="12345", name_query="final")
 
         assert "FINAL EXAM" in result
         assert "ID: 1" in result
 
-    @pytest.mark.asyncio
-    async def test_find_assignment_error_handling(self, mock_canvas_api):
-        """Test error handling when API returns error."""
-        mock_canvas_api["fetch_all_paginated_results"].return_value = {
-            "error": "Unauthorized"
-        }
+    async def test_find_assignment_searches_server_side(
+        self, mock_canvas_api, search_tools
+    ):
+        """Test that Canvas does the matching in a single request."""
+        mock_canvas_api["fetch_all_paginated_results"].return_value = []
 
-        find_assignment = get_tool_function("find_assignment")
-        result = await find_assignment(course_identifier="12345", name_query="test")
-
-        assert "Error searching assignments" in result
-        assert "Unauthorized" in result
-
-    @pytest.mark.asyncio
-    async def test_find_assignment_fallback_filtering(self, mock_canvas_api):
-        """Test client-side fallback when server-side search doesn't match."""
-        # First call returns empty, second call returns all assignments
-        mock_canvas_api["fetch_all_paginated_results"].side_effect = [
-            [],  # First call with search_term returns nothing
-            [
-                {
-                    "id": 1,
-                    "name": "Quiz 1",
-                    "due_at": "2024-03-01T23:59:00Z",
-                    "points_possible": 20,
-                    "published": True,
-                }
-            ],
+        find_assignment = search_tools["find_assignment"]
+        result = await find_assignment(course_identifier="12345", name_query="exam")
+
+        assert "No assignments matching 'exam' found" in result
+        mock_canvas_api["fetch_all_paginated_results"].assert_called_once_with(
+            "/courses/12345/assignments", {"per_page": 100, "search_term": "exam"}
+        )
+
+    async def test_find_assignment_short_query_filters_locally(
+        self, mock_canvas_api, search_tools
+    ):
+        """Test that a query too short for Canvas is matched client-side."""
+        mock_canvas_api["fetch_all_paginated_results"].return_value = [
+            {"id": 1, "name": "Quiz 1", "points_possible": 20, "published": True},
+            {"id": 2, "name": "Essay", "points_possible": 50, "published": True},
         ]
 
-        find_assignment = get_tool_function("find_assignment")
-        result = await find_assignment(course_identifier="12345", name_query="quiz")
+        find_assignment = search_tools["find_assignment"]
+        result = await find_assignment(course_identifier="12345", name_query="1")
 
         assert "Quiz 1" in result
-        assert mock_canvas_api["fetch_all_paginated_results"].call_count == 2
+        assert "Essay" not in result
+        mock_canvas_api["fetch_all_paginated_results"].assert_called_once_with(
+            "/courses/12345/assignments", {"per_page": 100}
+        )
+
+    async def test_find_assignment_stops_after_page(
+        self, mock_canvas_api, search_tools
+    ):
+        """Test that a short query leaves the stream once the page is filled."""
+        consumed = []
+
+        async def iter_results(endpoint, params=None):
+            for i in range(10):
+                consumed.append(i)
+                yield {"id": i, "name": f"Lab {i}" if i % 2 else f"Quiz {i}"}
+
+        mock_canvas_api["iter_paginated_results"].side_effect = iter_results
+
+        find_assignment = search_tools["find_assignment"]
+        result = await find_assignment(
+            course_identifier="12345", name_query="l", limit=2
+        )
+
+        assert "Lab 3" in result
+        assert "call again with offset=2" in result
+        assert consumed == [0, 1, 2, 3, 4, 5]
 
 
 class TestFindStudent:
     """Tests for find_student tool."""
 
-    @pytest.mark.asyncio
-    async def test_find_student_returns_matches(self, mock_canvas_api):
+    async def test_find_student_returns_matches(self, mock_canvas_api, search_tools):
         """Test finding students by name returns matches."""
-        mock_canvas_api["fetch_all_paginated_results"].return_value = [
-            {"id": 1001, "name": "Alice Smith", "email": "alice@example.com"},
-            {"id": 1002, "name": "Bob Smith", "email": "bob@example.com"},
-        ]
+        mock_canvas_api["fetch_all_paginated_results"].return_value = [ALICE, BOB]
 
-        find_student = get_tool_function("find_student")
+        find_student = search_tools["find_student"]
         result = await find_student(course_identifier="12345", name_query="alice")
 
         assert "Alice Smith" in result
@@ -182,49 +222,66 @@ class TestFindStudent:
         assert "ID: 1001" in result
         assert "Bob Smith" not in result
 
-    @pytest.mark.asyncio
-    async def test_find_student_no_matches(self, mock_canvas_api):
+    async def test_find_student_no_matches(self, mock_canvas_api, search_tools):
         """Test finding students with no matches."""
-        mock_canvas_api["fetch_all_paginated_results"].return_value = [
-            {"id": 1001, "name": "Alice Smith", "email": "alice@example.com"}
-        ]
+        mock_canvas_api["fetch_all_paginated_results"].return_value = [ALICE]
 
-        find_student = get_tool_function("find_student")
+        find_student = search_tools["find_student"]
         result = await find_student(course_identifier="12345", name_query="charlie")
 
         assert "No students matching 'charlie' found" in result
 
-    @pytest.mark.asyncio
-    async def test_find_student_case_insensitive(self, mock_canvas_api):
+    async def test_find_student_case_insensitive(self, mock_canvas_api, search_tools):
         """Test that student search is case-insensitive."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {"id": 1001, "name": "ALICE SMITH", "email": "alice@example.com"}
         ]
 
-        find_student = get_tool_function("find_student")
+        find_student = search_tools["find_student"]
         result = await find_student(course_identifier="12345", name_query="alice")
 
         assert "ALICE SMITH" in result
 
-    @pytest.mark.asyncio
-    async def test_find_student_error_handling(self, mock_canvas_api):
-        """Test error handling when API returns error."""
-        mock_canvas_api["fetch_all_paginated_results"].return_value = {
-            "error": "Course not found"
-        }
+    async def test_find_student_matches_casefolded(self, mock_canvas_api, search_tools):
+        """Test that matching folds case beyond ASCII."""
+        mock_canvas_api["fetch_all_paginated_results"].return_value = [
+            {"id": 1001, "name": "Jonas Straße"},
+            {"id": 1002, "name": "Jonas Strand"},
+        ]
+
+        find_student = search_tools["find_student"]
+        result = await find_student(course_identifier="12345", name_query="STRASSE")
+
+        assert "Jonas Straße" in result
+        assert "Jonas Strand" not in result
+
+    async def test_find_student_pages_through_matches(
+        self, mock_canvas_api, search_tools
+    ):
+        """Test that limit and offset page through a long match list."""
+        mock_canvas_api["fetch_all_paginated_results"].return_value = [
+            {"id": 1000 + i, "name": f"Student {i}"} for i in range(5)
+        ]
 
-        find_student = get_tool_function("find_student")
-        result = await find_student(course_identifier="99999", name_query="test")
+        find_student = search_tools["find_student"]
+        first = await find_student(
+            course_identifier="12345", name_query="student", limit=2
+        )
+        last = await find_student(
+            course_identifier="12345", name_query="student", limit=2, offset=4
+        )
 
-        assert "Error searching students" in result
-        assert "Course not found" in result
+        assert "ID: 1001" in first
+        assert "ID: 1002" not in first
+        assert "call again with offset=2" in first
+        assert "ID: 1004" in last
+        assert "offset=" not in last
 
 
 class TestFindDiscussion:
     """Tests for find_discussion tool."""
 
-    @pytest.mark.asyncio
-    async def test_find_discussion_returns_matches(self, mock_canvas_api):
+    async def test_find_discussion_returns_matches(self, mock_canvas_api, search_tools):
         """Test finding discussions by title returns matches."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
@@ -243,17 +300,14 @@ class TestFindDiscussion:
             },
         ]
 
-        find_discussion = get_tool_function("find_discussion")
+        find_discussion = search_tools["find_discussion"]
         result = await find_discussion(course_identifier="12345", name_query="week 1")
 
-        assert "Week 1 Discussion" in result
-        assert "ID: 444" in result
-        assert "15 entries" in result
-        assert "Discussion" in result
+        missing = [t for t in EXPECTED_DISCUSSION_TOKENS if t not in result]
+        assert not missing, missing
         assert "Week 2 Discussion" not in result
 
-    @pytest.mark.asyncio
-    async def test_find_discussion_no_matches(self, mock_canvas_api):
+    async def test_find_discussion_no_matches(self, mock_canvas_api, search_tools):
         """Test finding discussions with no matches."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
@@ -264,13 +318,12 @@ class TestFindDiscussion:
             }
         ]
 
-        find_discussion = get_tool_function("find_discussion")
+        find_discussion = search_tools["find_discussion"]
         result = await find_discussion(course_identifier="12345", name_query="final")
 
         assert "No discussions matching 'final' found" in result
 
-    @pytest.mark.asyncio
-    async def test_find_discussion_announcements(self, mock_canvas_api):
+    async def test_find_discussion_announcements(self, mock_canvas_api, search_tools):
         """Test finding announcements (special type of discussion)."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = [
             {
@@ -282,7 +335,7 @@ class TestFindDiscussion:
             }
         ]
 
-        find_discussion = get_tool_function("find_discussion")
+        find_discussion = search_tools["find_discussion"]
         result = await find_discussion(
             course_identifier="12345", name_query="announcement"
         )
@@ -291,18 +344,115 @@ class TestFindDiscussion:
         assert "Announcement" in result
         assert "ID: 555" in result
 
-    @pytest.mark.asyncio
-    async def test_find_discussion_error_handling(self, mock_canvas_api):
-        """Test error handling when API returns error."""
+
+class TestFindAll:
+    """Tests for find_all tool."""
+
+    async def test_find_all_searches_every_type(self, mock_canvas_api, search_tools):
+        """Test that one call returns assignments, students and discussions."""
+        responses = {
+            "/courses/12345/assignments": [
+                {"id": 1, "name": "Week 1 Essay", "points_possible": 10}
+            ],
+            "/courses/12345/users": [ALICE],
+            "/courses/12345/discussion_topics": [
+                {"id": 444, "title": "Week 1 Discussion"},
+                {"id": 445, "title": "Week 2 Discussion"},
+            ],
+        }
+
+        async def fetch(endpoint, params):
+            return responses[endpoint]
+
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = fetch
+
+        find_all = search_tools["find_all"]
+        result = await find_all(course_identifier="12345", query="week 1")
+
+        assert "Matches for 'week 1' in CS101" in result
+        assert "Week 1 Essay" in result
+        assert "Week 1 Discussion" in result
+        assert "Week 2 Discussion" not in result
+        assert "Students:\n  None found" in result
+        mock_canvas_api["resolve_course"].assert_called_once_with("12345")
+        assert mock_canvas_api["fetch_all_paginated_results"].call_count == 3
+
+    async def test_find_all_reports_errors_per_section(
+        self, mock_canvas_api, search_tools
+    ):
+        """Test that a failed search does not hide the other results."""
+
+        async def fetch(endpoint, params):
+            if endpoint.endswith("/users"):
+                return {"error": "Access denied"}
+            return [{"id": 7, "name": "Exam review", "title": "Exam review"}]
+
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = fetch
+
+        find_all = search_tools["find_all"]
+        result = await find_all(course_identifier="12345", query="exam")
+
+        assert "Students:\n  Error: Access denied" in result
+        assert result.count("ID: 7") == 2
+
+    async def test_find_all_caps_each_section(self, mock_canvas_api, search_tools):
+        """Test that limit caps each section and points to the full search."""
+
+        async def fetch(endpoint, params):
+            if endpoint.endswith("/assignments"):
+                return [{"id": i, "name": f"Lab {i}"} for i in range(3)]
+            return []
+
+        mock_canvas_api["fetch_all_paginated_results"].side_effect = fetch
+
+        find_all = search_tools["find_all"]
+        result = await find_all(course_identifier="12345", query="lab", limit=2)
+
+        assert "Lab 1" in result
+        assert "Lab 2" not in result
+        assert "use find_assignment with offset=2" in result
+
+
+class TestErrorHandling:
+    """Tests that the find_* tools report Canvas API errors."""
+
+    @pytest.mark.parametrize(
+        "tool_name,expected_msg,api_error",
+        [
+            pytest.param(
+                "find_assignment",
+                "Error searching assignments",
+                "Unauthorized",
+                id="find_assignment",
+            ),
+            pytest.param(
+                "find_student",
+                "Error searching students",
+                "Course not found",
+                id="find_student",
+            ),
+            pytest.param(
+                "find_discussion",
+                "Error searching discussions",
+                "Access denied",
+                id="find_discussion",
+            ),
+        ],
+    )
+    async def test_error_handling(
+        self, mock_canvas_api, search_tools, tool_name, expected_msg, api_error
+    ):
+        """Test that an API error is reported with its message."""
         mock_canvas_api["fetch_all_paginated_results"].return_value = {
-            "error": "Access denied"
+            "error": api_error
         }
 
-        find_discussion = get_tool_function("find_discussion")
-        result = await find_discussion(course_identifier="12345", name_query="test")
+        result = await search_tools[tool_name](
+            course_identifier="12345", name_query="test"
+        )
 
-        assert "Error searching discussions" in result
-        assert "Access denied" in result
+        assert expected_msg in result
+        assert api_error in result
 
 
 if __name__ == "__main__":